@@ -0,0 +1,84 @@
+"""Concurrent /query throughput: blocking pipeline calls vs the async execution path.
+
+The "blocking" mode reproduces the old handlers, which called ``RAGPipeline.query``
+directly inside ``async def`` routes. The "async" mode awaits ``RAGPipeline.aquery``.
+A heartbeat coroutine ticking every 10ms stands in for ``/health``: its worst-case
+lag is how long the event loop was unable to serve anything else.
+
+Requires the configured Qdrant and LLM backends to be running:
+
+    python -m benchmarks.bench_concurrent_queries --requests 40 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from src.api.dependencies import get_rag_pipeline
+from src.models import QueryRequest
+from src.pipeline.rag_pipeline import RAGPipeline
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _run(pipeline: RAGPipeline, mode: str, total: int, concurrency: int, question: str) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def one_request(i: int) -> None:
+        request = QueryRequest(question=f"{question} ({i})", top_k=3)
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "blocking":
+                pipeline.query(request)
+            else:
+                await pipeline.aquery(request)
+            latencies.append(time.perf_counter() - started)
+
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{mode:>8}: {total / elapsed:7.2f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:8.1f} ms | p95 {p95 * 1000:8.1f} ms | "
+        f"max loop stall {max(lags, default=0.0) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--question", default="What is in the documents?")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "async"], choices=["blocking", "async"])
+    args = parser.parse_args()
+
+    pipeline = get_rag_pipeline()
+    asyncio.run(_run_all(pipeline, args))
+
+
+async def _run_all(pipeline: RAGPipeline, args: argparse.Namespace) -> None:
+    # One event loop for every mode: the async Qdrant/LLM clients bind to the loop they first run on.
+    for mode in args.modes:
+        await _run(pipeline, mode, args.requests, args.concurrency, args.question)
+
+
+if __name__ == "__main__":
+    main()
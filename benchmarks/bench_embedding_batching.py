@@ -0,0 +1,70 @@
+"""Query-embedding throughput with and without cross-request micro-batching.
+
+Fires ``--requests`` concurrent ``EmbeddingService.aencode_single`` calls and reports
+queries per second, caller latency and the batcher's batch-size / queue-wait metrics:
+
+    python -m benchmarks.bench_embedding_batching --requests 512 --concurrency 64
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+from src.config import settings
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_service import EmbeddingService
+
+
+async def _run(
+    service: EmbeddingService, batcher: Optional[EmbeddingBatcher], total: int, concurrency: int
+) -> None:
+    service.batcher = batcher
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await service.aencode_single(f"benchmark question number {i} about the documents")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    label = "batched" if batcher else "unbatched"
+    print(
+        f"{label:>9}: {total / elapsed:8.1f} q/s | p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f" | p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:7.1f} ms"
+    )
+    if batcher:
+        stats = batcher.stats()
+        print(f"           batch size: {stats['batch_size']}")
+        print(f"           queue wait ms: {stats['queue_wait_ms']}")
+
+
+async def _run_all(args: argparse.Namespace) -> None:
+    service = EmbeddingService(batching_enabled=False)
+    batcher = EmbeddingBatcher(
+        service.aencode,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_concurrent_batches=settings.embedding_max_workers,
+    )
+    await _run(service, None, args.requests, args.concurrency)
+    await _run(service, batcher, args.requests, args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    asyncio.run(_run_all(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Ingestion embedding throughput: one in-process ``encode`` vs ``EmbeddingEngine`` workers.
+
+Generates ``--texts`` chunks of mixed length (mostly short, some near the model's
+sequence limit) and reports vectors per second for the model's own ``encode`` in this
+process, then for the length-bucketed engine with each worker count in ``--workers``.
+Each engine is warmed up before timing, and its vectors are checked against the
+in-process ones, in input order:
+
+    python -m benchmarks.bench_embedding_engine --texts 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+from typing import List
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from src.config import settings
+from src.services.embedding_engine import EmbeddingEngine
+
+_WORDS = "retrieval vector index query chunk embedding token latency cache batch shard page".split()
+
+
+def _texts(rng: random.Random, count: int) -> List[str]:
+    texts = []
+    for _ in range(count):
+        # Chunk sizes are skewed: most chunks are short, a few fill the chunk size.
+        words = min(int(rng.paretovariate(1.2) * 12), 400)
+        texts.append(" ".join(rng.choice(_WORDS) for _ in range(words)))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--model", default=settings.embedding_model_name)
+    parser.add_argument("--max-batch-tokens", type=int, default=settings.embedding_max_batch_tokens)
+    parser.add_argument("--batch-size", type=int, default=32, help="in-process encode batch size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = _texts(random.Random(args.seed), args.texts)
+    model = SentenceTransformer(args.model)
+    model.encode(texts[:args.batch_size], batch_size=args.batch_size, show_progress_bar=False)
+
+    started = time.perf_counter()
+    expected = model.encode(
+        texts, batch_size=args.batch_size, show_progress_bar=False, convert_to_numpy=True
+    )
+    baseline = len(texts) / (time.perf_counter() - started)
+    print(f"{'in-process':>12}: {baseline:8.0f} vectors/s")
+
+    for workers in args.workers:
+        engine = EmbeddingEngine(
+            model_name=args.model,
+            workers=workers,
+            max_batch_tokens=args.max_batch_tokens,
+            tokenizer=getattr(model, "tokenizer", None),
+            max_seq_length=getattr(model, "max_seq_length", None),
+        )
+        try:
+            # Loads the model in every worker before timing.
+            engine.encode(texts[:workers * 64])
+            started = time.perf_counter()
+            embeddings = engine.encode(texts)
+            elapsed = time.perf_counter() - started
+            stats = engine.stats()
+        finally:
+            engine.close()
+        matches = np.allclose(embeddings, expected, atol=1e-4)
+        print(
+            f"{f'engine x{workers}':>12}: {len(texts) / elapsed:8.0f} vectors/s | "
+            f"{len(texts) / elapsed / baseline:5.2f}x | "
+            f"padding efficiency {stats['padding_efficiency']:.2f} | "
+            f"order {'ok' if matches else 'MISMATCH'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""HTML extraction throughput: BeautifulSoup ``get_text`` vs lxml section extraction.
+
+Writes ``--pages`` synthetic pages (navigation, scripts, footer and a few heading
+sections each) to a temporary directory and reports pages per second for the previous
+whole-page BeautifulSoup path, for ``HTMLIngester`` in-process, and for ``HTMLIngester``
+across ``--workers`` processes:
+
+    python -m benchmarks.bench_html_extraction --pages 2000 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Iterator, List
+
+from bs4 import BeautifulSoup
+
+from src.ingestion.html_ingester import HTMLIngester
+from src.models import Document
+
+_WORDS = "retrieval vector index query chunk embedding token latency cache batch shard page".split()
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 120))) + "."
+
+
+def _page(rng: random.Random, index: int) -> str:
+    sections = []
+    for section in range(rng.randint(3, 8)):
+        paragraphs = "".join(f"<p>{_paragraph(rng)}</p>" for _ in range(rng.randint(1, 4)))
+        items = "".join(f"<li>{rng.choice(_WORDS)} <a href='#'>{rng.choice(_WORDS)}</a></li>" for _ in range(5))
+        sections.append(f"<h2>Section {section}</h2>{paragraphs}<h3>Details</h3><ul>{items}</ul>")
+    links = "".join(f"<li><a href='/p{i}'>Link {i}</a></li>" for i in range(30))
+    return (
+        f"<!DOCTYPE html><html><head><title>Page {index}</title>"
+        f"<style>body {{ font-family: sans-serif; }}</style>"
+        f"<script>var analytics = {{id: {index}}};</script></head><body>"
+        f"<header><nav><ul>{links}</ul></nav></header>"
+        f"<main><article><h1>Page {index}</h1>{''.join(sections)}</article></main>"
+        f"<aside>{_paragraph(rng)}</aside><footer><ul>{links}</ul><p>Copyright</p></footer>"
+        f"<script>document.write('{index}');</script></body></html>"
+    )
+
+
+def _beautifulsoup(paths: List[str]) -> Iterator[Document]:
+    """The previous implementation: one whole-page document from ``get_text``."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "lxml")
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text = soup.get_text(separator="\n", strip=True)
+        lines = (line.strip() for line in text.splitlines())
+        yield Document(
+            content="\n".join(line for line in lines if line),
+            metadata={"file_type": "html"},
+            source=path,
+        )
+
+
+def _measure(label: str, pages: int, documents: Callable[[], Iterator[Document]]) -> None:
+    started = time.perf_counter()
+    count = 0
+    characters = 0
+    for document in documents():
+        count += 1
+        characters += len(document.content)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:>16}: {pages / elapsed:8.0f} pages/s | {elapsed:6.2f} s | "
+        f"{count} documents, {characters / 1e6:.1f}M chars"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench-html-") as directory:
+        paths = []
+        for index in range(args.pages):
+            path = os.path.join(directory, f"page-{index:06d}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_page(rng, index))
+            paths.append(path)
+
+        _measure("beautifulsoup", args.pages, lambda: _beautifulsoup(paths))
+        _measure("lxml", args.pages, lambda: HTMLIngester(workers=0).iter_documents(source_path=directory))
+        if args.workers > 1:
+            _measure(
+                f"lxml x{args.workers}",
+                args.pages,
+                lambda: HTMLIngester(workers=args.workers).iter_documents(source_path=directory),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Recall and latency of each vector quantization mode, with and without rescoring.
+
+Builds a clustered synthetic corpus (closer to real embeddings than isotropic noise),
+loads it into the local vector store once per mode and measures search latency and
+recall@k against exact float32 search for several oversampling factors. ``--qdrant``
+runs the same modes against the configured Qdrant server:
+
+    python -m benchmarks.bench_quantization --points 100000 --dimension 384
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.models import Document
+from src.services.base_vector_store import BaseVectorStore
+from src.services.local_vector_store import LocalVectorStore
+from src.services.vector_store import VectorStore
+
+MODES = [None, "float16", "int8", "binary"]
+
+
+def _corpus(points: int, centers: np.ndarray, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = centers[rng.integers(len(centers), size=points)]
+    vectors += 0.5 * rng.standard_normal((points, centers.shape[1]), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _measure(
+    store: BaseVectorStore, queries: np.ndarray, truth: List[set], top_k: int
+) -> tuple:
+    latencies: List[float] = []
+    recalls: List[float] = []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = store.search(query.tolist(), top_k=top_k)
+        latencies.append(time.perf_counter() - started)
+        recalls.append(len({int(chunk.content) for chunk in results} & expected) / top_k)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(0.95 * (len(latencies) - 1))] * 1000, statistics.mean(recalls)
+
+
+def _report(label: str, mode: Optional[str], oversampling: float, rescore: bool, bytes_per_vector: Optional[int], result: tuple) -> None:
+    p50, p95, recall = result
+    size = f"{bytes_per_vector:5d} B/vec" if bytes_per_vector else "          "
+    print(
+        f"{label:>6} {mode or 'none':>8} x{oversampling:<4g} rescore={'on ' if rescore else 'off'}"
+        f" | {size} | p50 {p50:7.2f} ms | p95 {p95:7.2f} ms | recall {recall:.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, nargs="+", default=[1.0, 3.0, 10.0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--qdrant", action="store_true")
+    args = parser.parse_args()
+
+    centers = np.random.default_rng(args.seed).standard_normal(
+        (args.clusters, args.dimension), dtype=np.float32
+    )
+    corpus = _corpus(args.points, centers, args.seed + 1)
+    queries = _corpus(args.queries, centers, args.seed + 2)
+    documents = [
+        Document(content=str(i), source="bench", metadata={"chunk_index": i})
+        for i in range(args.points)
+    ]
+    truth = [set(np.argsort(-row)[:args.top_k].tolist()) for row in queries @ corpus.T]
+
+    directory = tempfile.mkdtemp(prefix="bench-quantization-")
+    try:
+        for mode in MODES:
+            store = LocalVectorStore(
+                path=directory, collection_name="bench", hnsw_enabled=False, quantization=mode
+            )
+            store.initialize_collection(args.dimension)
+            if mode is None:
+                store.store_documents(documents, corpus)
+            bytes_per_vector = store.stats()["scan_bytes_per_vector"]
+            for oversampling in args.oversampling if mode else [1.0]:
+                for rescore in (True, False) if mode else (False,):
+                    store.oversampling, store.rescore = oversampling, rescore
+                    result = _measure(store, queries, truth, args.top_k)
+                    _report("local", mode, oversampling, rescore, bytes_per_vector, result)
+            store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.qdrant:
+        for mode in MODES:
+            store = VectorStore(collection_name=f"bench_quantization_{mode or 'none'}", quantization=mode)
+            store.delete_collection()
+            try:
+                store.initialize_collection(args.dimension)
+                store.store_documents(documents, corpus)
+                for oversampling in args.oversampling if mode in ("int8", "binary") else [1.0]:
+                    store.oversampling = oversampling
+                    _report("qdrant", mode, oversampling, store.rescore, None, _measure(store, queries, truth, args.top_k))
+            finally:
+                store.delete_collection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Upsert throughput, search latency and recall: Qdrant vs the embedded local backend.
+
+Writes ``--points`` random unit vectors to each store, then runs ``--queries`` searches
+(unfiltered and with a metadata filter). Recall@k is measured against an exact NumPy
+search over the same vectors. The local store is benchmarked with exact search and,
+when hnswlib is installed, with its HNSW index. Qdrant must be running unless
+``--skip-qdrant`` is given:
+
+    python -m benchmarks.bench_vector_stores --points 100000 --dimension 384
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models import Document
+from src.services.base_vector_store import BaseVectorStore
+from src.services.local_vector_store import LocalVectorStore
+from src.services.vector_store import VectorStore
+
+COLLECTION = "bench_vector_stores"
+SOURCES = 20
+
+
+def _corpus(points: int, dimension: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((points, dimension), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _documents(points: int) -> List[Document]:
+    return [
+        Document(content=str(i), source=f"source-{i % SOURCES}", metadata={"chunk_index": i})
+        for i in range(points)
+    ]
+
+
+def _exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> List[set]:
+    scores = queries @ corpus.T
+    if mask is not None:
+        scores[:, ~mask] = -np.inf
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+
+def _run(
+    label: str,
+    store: BaseVectorStore,
+    corpus: np.ndarray,
+    documents: List[Document],
+    queries: np.ndarray,
+    truth: Dict[str, List[set]],
+    top_k: int,
+) -> None:
+    store.initialize_collection(corpus.shape[1])
+    started = time.perf_counter()
+    store.store_documents(documents, corpus)
+    store.flush()
+    upsert_rate = len(documents) / (time.perf_counter() - started)
+    # Keeps one-off work such as building the HNSW graph out of the search timings.
+    store.search(queries[0].tolist(), top_k=top_k)
+
+    filters = {"unfiltered": None, "filtered": {"source": "source-0"}}
+    for mode, query_filter in filters.items():
+        latencies: List[float] = []
+        recalls: List[float] = []
+        for query, expected in zip(queries, truth[mode]):
+            started = time.perf_counter()
+            results = store.search(query.tolist(), top_k=top_k, filters=query_filter)
+            latencies.append(time.perf_counter() - started)
+            found = {int(chunk.content) for chunk in results}
+            recalls.append(len(found & expected) / len(expected))
+
+        latencies.sort()
+        print(
+            f"{label:>12} {mode:>10}: upsert {upsert_rate:9.0f} pts/s"
+            f" | search p50 {statistics.median(latencies) * 1000:7.2f} ms"
+            f" | p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:7.2f} ms"
+            f" | {len(latencies) / sum(latencies):7.0f} q/s"
+            f" | recall@{top_k} {statistics.mean(recalls):.3f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-qdrant", action="store_true")
+    args = parser.parse_args()
+
+    corpus = _corpus(args.points, args.dimension, args.seed)
+    queries = _corpus(args.queries, args.dimension, args.seed + 1)
+    documents = _documents(args.points)
+    source_mask = np.arange(args.points) % SOURCES == 0
+    truth = {
+        "unfiltered": _exact_top_k(corpus, queries, args.top_k),
+        "filtered": _exact_top_k(corpus, queries, args.top_k, source_mask),
+    }
+
+    directory = tempfile.mkdtemp(prefix="bench-local-store-")
+    try:
+        for label, hnsw in (("local-exact", False), ("local-hnsw", True)):
+            store = LocalVectorStore(
+                path=directory, collection_name=label, hnsw_enabled=hnsw, hnsw_min_points=0
+            )
+            _run(label, store, corpus, documents, queries, truth, args.top_k)
+            if hnsw and store.stats()["index"] != "hnsw":
+                print("  (hnswlib not installed; local-hnsw ran exact search)")
+            store.delete_collection()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if not args.skip_qdrant:
+        store = VectorStore(collection_name=COLLECTION)
+        store.delete_collection()
+        try:
+            _run("qdrant", store, corpus, documents, queries, truth, args.top_k)
+        finally:
+            store.delete_collection()
+
+
+if __name__ == "__main__":
+    main()
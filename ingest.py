@@ -0,0 +1,261 @@
+"""Bulk-ingest files from directories or glob patterns without going through the API.
+
+Files are parsed across a process pool with the ingesters from ``IngestionFactory``;
+their documents feed one ingestion run, so chunking, embedding and batched upserts see a
+single stream of large batches. Live throughput goes to stderr, and a per-stage timing
+summary is printed at the end:
+
+    python ingest.py data/ "exports/**/*.jsonl" --workers 4 --batch-size 1024
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from src.config import settings
+from src.ingestion.ingestion_factory import IngestionFactory
+from src.models import Document, IngestRequest
+from src.pipeline.progress import IngestionProgress
+from src.utils import detect_file_type
+
+logger = logging.getLogger("ingest")
+
+# Files submitted to the pool ahead of the one being consumed, per worker.
+_FILES_IN_FLIGHT_PER_WORKER = 2
+_REPORT_INTERVAL_SECONDS = 1.0
+
+
+def find_files(patterns: List[str]) -> List[str]:
+    """Supported files under each directory, matching each glob, or named directly."""
+    found: Dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [str(path) for path in sorted(Path(pattern).rglob("*")) if path.is_file()]
+        elif glob.has_magic(pattern):
+            candidates = [path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path)]
+        else:
+            # Named explicitly: an unsupported type is reported rather than skipped.
+            found[pattern] = None
+            continue
+        found.update((path, None) for path in candidates if _is_supported(path))
+    return list(found)
+
+
+def parse_file(path: str, options: Dict[str, Any]) -> Tuple[List[Document], float]:
+    """Every document of one file and the seconds spent parsing it (runs in a worker)."""
+    started = time.perf_counter()
+    request = IngestRequest(source_type=detect_file_type(path), source_path=path, **options)
+    ingester = IngestionFactory.create_for_request(request)
+    documents = list(ingester.iter_documents(source_path=path, metadata=request.metadata))
+    return documents, time.perf_counter() - started
+
+
+class BulkIngestion:
+    """Feeds the documents of many files into one ``IngestionPipeline`` run.
+
+    Files up to ``max_pool_bytes`` are parsed whole in ``workers`` processes, a bounded
+    window ahead of the consumer; larger files are streamed in this process, so their
+    documents never have to exist all at once.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        options: Dict[str, Any],
+        workers: int,
+        max_pool_bytes: int,
+        progress: IngestionProgress,
+    ) -> None:
+        self.paths = paths
+        self.options = options
+        self.workers = workers
+        self.max_pool_bytes = max_pool_bytes
+        self.progress = progress
+        self.failed: List[Tuple[str, str]] = []
+
+    def documents(self) -> Iterator[Document]:
+        if self.workers <= 1:
+            for path in self.paths:
+                yield from self._stream(path)
+            return
+
+        # spawn: forking a process that already runs threads can deadlock the child.
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            pending: "deque[Tuple[str, Optional[Future]]]" = deque()
+            window = self.workers * _FILES_IN_FLIGHT_PER_WORKER
+            try:
+                for path in self.paths:
+                    future = None
+                    if os.path.getsize(path) <= self.max_pool_bytes:
+                        future = executor.submit(parse_file, path, self.options)
+                    pending.append((path, future))
+                    while len(pending) > window or (pending and pending[0][1] is None):
+                        yield from self._take(*pending.popleft())
+                while pending:
+                    yield from self._take(*pending.popleft())
+            finally:
+                for _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+    def _take(self, path: str, future: Optional[Future]) -> Iterator[Document]:
+        if future is None:
+            yield from self._stream(path)
+            return
+        try:
+            documents, seconds = future.result()
+        except Exception as e:
+            self._fail(path, e)
+            return
+        # Worker seconds, summed over processes: may exceed the wall time.
+        self.progress.add_stage_time("parse_workers", seconds)
+        self.progress.add(files_parsed=1)
+        yield from documents
+
+    def _stream(self, path: str) -> Iterator[Document]:
+        try:
+            request = IngestRequest(source_type=detect_file_type(path), source_path=path, **self.options)
+            ingester = IngestionFactory.create_for_request(request)
+            yield from ingester.iter_documents(source_path=path, metadata=request.metadata)
+        except Exception as e:
+            self._fail(path, e)
+            return
+        self.progress.add(files_parsed=1)
+
+    def _fail(self, path: str, error: Exception) -> None:
+        logger.error(f"Skipping {path}: {error}")
+        self.failed.append((path, str(error)))
+
+
+def _report(progress: IngestionProgress, total_files: int, stop: threading.Event) -> None:
+    while not stop.wait(_REPORT_INTERVAL_SECONDS):
+        snapshot = progress.snapshot()
+        elapsed = max(snapshot["elapsed_seconds"], 1e-9)
+        sys.stderr.write(
+            f"\r{snapshot['files_parsed']}/{total_files} files "
+            f"({snapshot['files_parsed'] / elapsed:.1f}/s) | "
+            f"{snapshot['chunks_created']} chunks ({snapshot['chunks_created'] / elapsed:.0f}/s) | "
+            f"{snapshot['points_written']} vectors ({snapshot['points_written'] / elapsed:.0f}/s)   "
+        )
+        sys.stderr.flush()
+    sys.stderr.write("\n")
+
+
+def _summary(progress: IngestionProgress, total_files: int, failed: List[Tuple[str, str]]) -> str:
+    snapshot = progress.snapshot()
+    elapsed = max(snapshot["elapsed_seconds"], 1e-9)
+    lines = [
+        f"Ingested {snapshot['files_parsed']}/{total_files} files in {elapsed:.1f}s "
+        f"({snapshot['files_parsed'] / elapsed:.1f} files/s)",
+        f"  documents: {snapshot['documents_parsed']}",
+        f"  chunks:    {snapshot['chunks_created']} ({snapshot['chunks_created'] / elapsed:.0f}/s), "
+        f"{snapshot['chunks_skipped']} unchanged",
+        f"  vectors:   {snapshot['points_written']} ({snapshot['points_written'] / elapsed:.0f}/s)",
+        "Busy seconds per stage (stages overlap):",
+    ]
+    for stage, seconds in snapshot["stage_seconds"].items():
+        lines.append(f"  {stage:<14}{seconds:8.2f}s  {100 * seconds / elapsed:5.1f}% of wall time")
+    if failed:
+        lines.append(f"{len(failed)} files failed:")
+        lines.extend(f"  {path}: {error}" for path, error in failed)
+    return "\n".join(lines)
+
+
+def _is_supported(path: str) -> bool:
+    try:
+        detect_file_type(path)
+    except ValueError:
+        return False
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="directories, glob patterns or files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size * 4,
+                        help="documents and chunks per chunking/embedding batch")
+    parser.add_argument("--max-pool-mb", type=float, default=64.0,
+                        help="larger files are streamed in-process instead of parsed in a worker")
+    parser.add_argument("--source-id", help="names the run so re-ingesting it is incremental")
+    parser.add_argument("--metadata", help="JSON object added to every document's metadata")
+    parser.add_argument("--json-mode", choices=["records", "leaves"])
+    parser.add_argument("--record-path")
+    parser.add_argument("--content-columns", nargs="+")
+    parser.add_argument("--metadata-columns", nargs="+")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    paths = find_files(args.paths)
+    if not paths:
+        print("No supported files found", file=sys.stderr)
+        return 1
+    options = {
+        "metadata": json.loads(args.metadata) if args.metadata else {},
+        "json_mode": args.json_mode,
+        "record_path": args.record_path,
+        "content_columns": args.content_columns,
+        "metadata_columns": args.metadata_columns,
+    }
+
+    # Imported here so --help does not load the embedding model's dependencies.
+    from src.api.dependencies import (
+        get_answer_cache,
+        get_chunking_service,
+        get_embedding_cache,
+        get_embedding_service,
+        get_ingestion_manifest,
+        get_lexical_index,
+        get_vector_store,
+    )
+    from src.pipeline.ingestion_pipeline import IngestionPipeline
+
+    pipeline = IngestionPipeline(
+        chunking_service=get_chunking_service(),
+        embedding_service=get_embedding_service(),
+        vector_store=get_vector_store(),
+        embedding_cache=get_embedding_cache(),
+        manifest=get_ingestion_manifest(),
+        answer_cache=get_answer_cache(),
+        lexical_index=get_lexical_index(),
+        batch_size=args.batch_size,
+    )
+    progress = IngestionProgress()
+    bulk = BulkIngestion(
+        paths, options, args.workers, int(args.max_pool_mb * 1024 * 1024), progress
+    )
+
+    stop = threading.Event()
+    reporter = threading.Thread(target=_report, args=(progress, len(paths), stop), daemon=True)
+    progress.start(total_documents=None)
+    reporter.start()
+    try:
+        pipeline.ingest_documents(
+            bulk.documents(),
+            source_key=f"id:{args.source_id}" if args.source_id else None,
+            progress=progress,
+        )
+    finally:
+        stop.set()
+        reporter.join()
+        get_chunking_service().close()
+    print(_summary(progress, len(paths), bulk.failed))
+    return 1 if bulk.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,23 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
 from src.api.routes import router
+from src.api.dependencies import get_job_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    job_manager = get_job_manager()
+    job_manager.start()
+    yield
+    job_manager.stop(timeout=30)
+
 
 app = FastAPI(
     title="RAG Pipeline API",
     description="Retrieval-Augmented Generation Pipeline with multi-source data ingestion",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(router, prefix="/api/v1", tags=["rag"])
@@ -17,7 +30,9 @@ async def root() -> dict:
         "version": "1.0.0",
         "endpoints": {
             "ingest": "/api/v1/ingest",
+            "jobs": "/api/v1/jobs",
             "query": "/api/v1/query",
+            "stats": "/api/v1/stats",
             "health": "/api/v1/health",
         },
     }
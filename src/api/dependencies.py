@@ -1,21 +1,38 @@
+from pathlib import Path
 import logging
 from src.services.embedding_service import EmbeddingService
-from src.services.vector_store import VectorStore
+from src.services.base_vector_store import BaseVectorStore
+from src.services.vector_store import create_vector_store
 from src.services.llm_service import LLMService
 from src.services.chunking_service import ChunkingService
+from src.services.persistent_embedding_cache import PersistentEmbeddingCache
+from src.services.ingestion_manifest import IngestionManifest
+from src.services.semantic_cache import SemanticAnswerCache
+from src.services.lexical_index import LexicalIndex
+from src.services.document_store import DocumentStore
+from src.services.reranker import RerankerService
 from src.pipeline.rag_pipeline import RAGPipeline
 from src.pipeline.ingestion_pipeline import IngestionPipeline
+from src.jobs.job_store import JobStore
+from src.jobs.job_manager import IngestionJobManager
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 _embedding_service: EmbeddingService | None = None
-_vector_store: VectorStore | None = None
+_vector_store: BaseVectorStore | None = None
 _llm_service: LLMService | None = None
 _chunking_service: ChunkingService | None = None
 _rag_pipeline: RAGPipeline | None = None
 _ingestion_pipeline: IngestionPipeline | None = None
+_embedding_cache: PersistentEmbeddingCache | None = None
+_ingestion_manifest: IngestionManifest | None = None
+_answer_cache: SemanticAnswerCache | None = None
+_lexical_index: LexicalIndex | None = None
+_document_store: DocumentStore | None = None
+_reranker: RerankerService | None = None
+_job_manager: IngestionJobManager | None = None
 
 
 def get_embedding_service() -> EmbeddingService:
@@ -25,10 +42,12 @@ def get_embedding_service() -> EmbeddingService:
     return _embedding_service
 
 
-def get_vector_store() -> VectorStore:
+def get_vector_store() -> BaseVectorStore:
     global _vector_store
     if _vector_store is None:
-        _vector_store = VectorStore()
+        _vector_store = create_vector_store(
+            settings.vector_store_backend, document_store=get_document_store()
+        )
         embedding_service = get_embedding_service()
         if not embedding_service:
             return _vector_store
@@ -36,6 +55,15 @@ def get_vector_store() -> VectorStore:
     return _vector_store
 
 
+def get_document_store() -> DocumentStore | None:
+    global _document_store
+    if _document_store is None and settings.document_store_enabled:
+        _document_store = DocumentStore(
+            str(Path(settings.document_store_path) / f"{settings.qdrant_collection_name}.sqlite3")
+        )
+    return _document_store
+
+
 def get_llm_service() -> LLMService:
     global _llm_service
     if _llm_service is None:
@@ -46,10 +74,68 @@ def get_llm_service() -> LLMService:
 def get_chunking_service() -> ChunkingService:
     global _chunking_service
     if _chunking_service is None:
-        _chunking_service = ChunkingService()
+        if settings.chunking_mode == "tokens":
+            model = get_embedding_service().model
+            # The model's limit includes the special tokens its tokenizer adds.
+            max_tokens = model.max_seq_length - model.tokenizer.num_special_tokens_to_add()
+            if settings.chunk_max_tokens:
+                max_tokens = min(max_tokens, settings.chunk_max_tokens)
+            _chunking_service = ChunkingService(
+                mode="tokens", tokenizer=model.tokenizer, max_tokens=max_tokens
+            )
+        else:
+            _chunking_service = ChunkingService()
     return _chunking_service
 
 
+def get_embedding_cache() -> PersistentEmbeddingCache | None:
+    global _embedding_cache
+    if _embedding_cache is None and settings.embedding_cache_dir:
+        embedding_service = get_embedding_service()
+        _embedding_cache = PersistentEmbeddingCache(
+            cache_dir=settings.embedding_cache_dir,
+            model_name=embedding_service.model_name,
+            dimension=embedding_service.get_dimension(),
+            max_entries=settings.embedding_cache_max_entries,
+        )
+    return _embedding_cache
+
+
+def get_ingestion_manifest() -> IngestionManifest | None:
+    global _ingestion_manifest
+    if _ingestion_manifest is None and settings.ingestion_manifest_path:
+        _ingestion_manifest = IngestionManifest(settings.ingestion_manifest_path)
+    return _ingestion_manifest
+
+
+def get_answer_cache() -> SemanticAnswerCache | None:
+    global _answer_cache
+    if _answer_cache is None and settings.semantic_cache_enabled:
+        _answer_cache = SemanticAnswerCache(
+            max_entries=settings.semantic_cache_max_entries,
+            threshold=settings.semantic_cache_threshold,
+            manifest=get_ingestion_manifest(),
+            collection=settings.qdrant_collection_name,
+        )
+    return _answer_cache
+
+
+def get_lexical_index() -> LexicalIndex | None:
+    global _lexical_index
+    if _lexical_index is None and settings.lexical_index_enabled:
+        _lexical_index = LexicalIndex(
+            str(Path(settings.lexical_index_path) / f"{settings.qdrant_collection_name}.sqlite3")
+        )
+    return _lexical_index
+
+
+def get_reranker() -> RerankerService | None:
+    global _reranker
+    if _reranker is None and settings.reranker_enabled:
+        _reranker = RerankerService()
+    return _reranker
+
+
 def get_rag_pipeline() -> RAGPipeline:
     global _rag_pipeline
     if _rag_pipeline is None:
@@ -57,6 +143,9 @@ def get_rag_pipeline() -> RAGPipeline:
             embedding_service=get_embedding_service(),
             vector_store=get_vector_store(),
             llm_service=get_llm_service(),
+            answer_cache=get_answer_cache(),
+            lexical_index=get_lexical_index(),
+            reranker=get_reranker(),
         )
     return _rag_pipeline
 
@@ -69,7 +158,21 @@ def get_ingestion_pipeline() -> IngestionPipeline:
             chunking_service=get_chunking_service(),
             embedding_service=get_embedding_service(),
             vector_store=get_vector_store(),
+            embedding_cache=get_embedding_cache(),
+            manifest=get_ingestion_manifest(),
+            answer_cache=get_answer_cache(),
+            lexical_index=get_lexical_index(),
         )
         logger.info("Ingestion pipeline initialized successfully")
     return _ingestion_pipeline
 
+
+def get_job_manager() -> IngestionJobManager:
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = IngestionJobManager(
+            store=JobStore(settings.ingestion_job_db_path, upload_dir=settings.upload_dir),
+            pipeline_factory=get_ingestion_pipeline,
+            workers=settings.ingestion_job_workers,
+        )
+    return _job_manager
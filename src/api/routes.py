@@ -1,46 +1,73 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, List, Optional
+from pathlib import Path
+import asyncio
 import json
-from src.models import IngestRequest, IngestResponse, QueryRequest, QueryResponse
+import logging
+import shutil
+import time
+import uuid
+from src.models import (
+    DataSourceType,
+    IngestJob,
+    IngestJobResponse,
+    IngestRequest,
+    JobStatus,
+    QueryRequest,
+    QueryResponse,
+)
 from src.pipeline.rag_pipeline import RAGPipeline
-from src.pipeline.ingestion_pipeline import IngestionPipeline
-from src.api.dependencies import get_rag_pipeline, get_ingestion_pipeline
+from src.jobs.job_manager import IngestionJobManager
+from src.ingestion.multi_file_ingester import is_archive, spool_upload
+from src.services.embedding_service import EmbeddingService
+from src.services.persistent_embedding_cache import PersistentEmbeddingCache
+from src.services.base_vector_store import BaseVectorStore
+from src.services.chunking_service import ChunkingService
+from src.api.dependencies import (
+    get_rag_pipeline,
+    get_job_manager,
+    get_embedding_service,
+    get_embedding_cache,
+    get_vector_store,
+    get_chunking_service,
+)
 from src.utils import detect_file_type
+from src.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.post("/ingest", response_model=IngestResponse)
+@router.post("/ingest", response_model=IngestJobResponse, status_code=202)
 async def ingest_data(
     request: IngestRequest,
-    ingestion_pipeline: IngestionPipeline = Depends(get_ingestion_pipeline),
-) -> IngestResponse:
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> IngestJobResponse:
     try:
-        documents_count = ingestion_pipeline.ingest(request)
-        return IngestResponse(
-            success=True,
-            documents_ingested=documents_count,
-            message=f"Successfully ingested {documents_count} document chunks",
+        job = await asyncio.to_thread(job_manager.submit, request)
+        return IngestJobResponse(
+            job_id=job.job_id,
+            status=job.status,
+            message=f"Ingestion job queued for {request.source_type.value} source",
         )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=404, detail=f"File not found: {str(e)}")
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error during ingestion: {str(e)}"
+            status_code=500, detail=f"Error queueing ingestion: {str(e)}"
         )
 
 
-@router.post("/upload", response_model=IngestResponse)
+@router.post("/upload", response_model=IngestJobResponse, status_code=202)
 async def upload_file(
     file: UploadFile = File(...),
     metadata: Optional[str] = Form(None),
-    ingestion_pipeline: IngestionPipeline = Depends(get_ingestion_pipeline),
-) -> IngestResponse:
+    source_id: Optional[str] = Form(None),
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> IngestJobResponse:
     try:
         file_type = detect_file_type(file.filename)
-        print("Detected file type :", file_type)
+        logger.debug(f"Detected file type: {file_type}")
         content_bytes = await file.read()
         content = content_bytes.decode('utf-8')
         metadata_dict = {}
@@ -55,15 +82,18 @@ async def upload_file(
         request = IngestRequest(
             source_type=file_type,
             content=content,
+            source_id=source_id,
             metadata=metadata_dict
         )
-        documents_count = ingestion_pipeline.ingest(request)
-        return IngestResponse(
-            success=True,
-            documents_ingested=documents_count,
-            message=f"Successfully uploaded and ingested {documents_count} document chunks from {file.filename}",
+        job = await asyncio.to_thread(job_manager.submit, request)
+        return IngestJobResponse(
+            job_id=job.job_id,
+            status=job.status,
+            message=f"Upload of {file.filename} queued for ingestion",
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except UnicodeDecodeError:
@@ -72,6 +102,109 @@ async def upload_file(
         raise HTTPException(status_code=500, detail=f"Error during file upload: {str(e)}")
 
 
+@router.post("/upload/batch", response_model=IngestJobResponse, status_code=202)
+async def upload_files(
+    files: List[UploadFile] = File(...),
+    metadata: Optional[str] = Form(None),
+    source_id: Optional[str] = Form(None),
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> IngestJobResponse:
+    """Queue many files, or zip/tar archives of them, as one ingestion job."""
+    upload_dir = Path(settings.upload_dir) / uuid.uuid4().hex
+    try:
+        metadata_dict = {}
+        if metadata:
+            try:
+                metadata_dict = json.loads(metadata)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid metadata JSON format")
+        for file in files:
+            if not file.filename:
+                raise HTTPException(status_code=400, detail="Every uploaded file must have a filename")
+            if not is_archive(file.filename):
+                detect_file_type(file.filename)
+
+        # Copy each spooled part into the job's directory block by block, off the event loop.
+        upload_dir.mkdir(parents=True)
+        source_paths = []
+        for file in files:
+            source_paths.append(
+                await asyncio.to_thread(spool_upload, file.file, str(upload_dir), file.filename)
+            )
+            await file.close()
+
+        if len(files) == 1:
+            metadata_dict["uploaded_filename"] = files[0].filename
+        metadata_dict["upload_method"] = "batch_upload"
+        request = IngestRequest(
+            source_type=DataSourceType.FILES,
+            source_paths=source_paths,
+            upload_dir=str(upload_dir),
+            source_id=source_id,
+            metadata=metadata_dict,
+        )
+        job = await asyncio.to_thread(job_manager.submit, request)
+        return IngestJobResponse(
+            job_id=job.job_id,
+            status=job.status,
+            message=f"Upload of {len(files)} files queued for ingestion",
+        )
+
+    except HTTPException:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise
+    except ValueError as e:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=f"Error during file upload: {str(e)}")
+
+
+@router.get("/jobs", response_model=List[IngestJob])
+async def list_jobs(
+    limit: int = 50,
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> List[IngestJob]:
+    return await asyncio.to_thread(job_manager.list, limit)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJob)
+async def get_job(
+    job_id: str,
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> IngestJob:
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=IngestJobResponse)
+async def cancel_job(
+    job_id: str,
+    job_manager: IngestionJobManager = Depends(get_job_manager),
+) -> IngestJobResponse:
+    cancelled = await asyncio.to_thread(job_manager.cancel, job_id)
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if not cancelled:
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} is {job.status.value} and cannot be cancelled"
+        )
+    # A running job keeps its status until the worker stops it at the next batch boundary.
+    return IngestJobResponse(
+        job_id=job_id,
+        status=job.status,
+        message=(
+            "Job cancelled"
+            if job.status == JobStatus.CANCELLED
+            else "Cancellation requested; the job stops after its current batch"
+        ),
+    )
+
+
 @router.post("/query", response_model=QueryResponse)
 async def query(
     request: QueryRequest,
@@ -81,12 +214,57 @@ async def query(
         if not request.question.strip():
             raise HTTPException(status_code=400, detail="Question cannot be empty")
 
-        response = rag_pipeline.query(request)
+        response = await rag_pipeline.aquery(request)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during query: {str(e)}")
 
 
+@router.post("/query/stream")
+async def query_stream(
+    request: QueryRequest,
+    rag_pipeline: RAGPipeline = Depends(get_rag_pipeline),
+) -> StreamingResponse:
+    """Server-Sent Events: ``sources`` first, then ``token`` events as the LLM emits them, then ``done``."""
+    started = time.perf_counter()
+    if not request.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in rag_pipeline.astream_query(request, started=started):
+                yield _format_sse(event["event"], event["data"])
+        except Exception as e:
+            yield _format_sse("error", {"detail": f"Error during query: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/stats")
+async def stats(
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    embedding_cache: Optional[PersistentEmbeddingCache] = Depends(get_embedding_cache),
+    vector_store: BaseVectorStore = Depends(get_vector_store),
+    rag_pipeline: RAGPipeline = Depends(get_rag_pipeline),
+    chunking_service: ChunkingService = Depends(get_chunking_service),
+) -> dict:
+    return {
+        "query": rag_pipeline.stats(),
+        "embedding": embedding_service.stats(),
+        "vector_store": vector_store.stats(),
+        "ingestion_embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "chunking": chunking_service.stats(),
+    }
+
+
 @router.get("/health")
 async def health_check() -> dict:
     return {"status": "healthy", "service": "rag-pipeline"}
@@ -1,12 +1,50 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
+    vector_store_backend: str = "qdrant"
+    local_vector_store_path: str = ".cache/vector_store"
+    local_vector_store_hnsw: bool = True
+    local_vector_store_hnsw_min_points: int = 20000
+    local_vector_store_hnsw_m: int = 16
+    local_vector_store_hnsw_ef_construction: int = 200
+    local_vector_store_hnsw_ef_search: int = 64
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
     qdrant_collection_name: str = "documents"
+    upsert_batch_size: int = 256
+    upsert_workers: int = 4
+    upsert_wait: bool = True
+    payload_indexes: Dict[str, str] = {
+        "source": "keyword",
+        "file_type": "keyword",
+        "table_name": "keyword",
+    }
+    document_store_enabled: bool = False
+    document_store_path: str = ".cache/document_store"
+    vector_quantization: Optional[str] = None
+    quantization_oversampling: float = 3.0
+    quantization_rescore: bool = True
     embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_max_workers: int = 2
+    embedding_batching_enabled: bool = True
+    embedding_batch_max_size: int = 32
+    embedding_batch_wait_ms: float = 5.0
+    embedding_workers: int = 0
+    embedding_max_batch_tokens: int = 16384
+    embedding_engine_max_batch_size: int = 256
+    embedding_engine_min_texts: int = 64
+    query_embedding_cache_enabled: bool = True
+    query_embedding_cache_max_entries: int = 10000
+    query_embedding_cache_ttl_seconds: Optional[float] = None
+    embedding_cache_dir: Optional[str] = None
+    embedding_cache_max_entries: int = 1_000_000
+    ingestion_manifest_path: Optional[str] = ".cache/ingestion_manifest.sqlite3"
+    ingestion_job_db_path: str = ".cache/ingestion_jobs.sqlite3"
+    ingestion_job_workers: int = 2
+    upload_dir: str = ".cache/uploads"
+    upload_max_extracted_bytes: int = 10 * 1024 ** 3
 
     llm_provider: str = "ollama"
     llm_model_name: str = "llama3.2"
@@ -19,9 +57,41 @@ class Settings(BaseSettings):
     anthropic_api_key: Optional[str] = None
 
     retrieval_top_k: int = 5
+    lexical_index_enabled: bool = False
+    lexical_index_path: str = ".cache/lexical_index"
+    hybrid_dense_weight: float = 1.0
+    hybrid_lexical_weight: float = 1.0
+    hybrid_rrf_k: int = 60
+    hybrid_candidates: int = 4
+    reranker_enabled: bool = False
+    reranker_model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    reranker_candidates: int = 20
+    reranker_budget_ms: float = 200.0
+    reranker_batch_size: int = 32
+    reranker_max_pending: int = 2
+    semantic_cache_enabled: bool = False
+    semantic_cache_max_entries: int = 1024
+    semantic_cache_threshold: float = 0.95
     database_url: Optional[str] = None
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunking_mode: str = "characters"
+    chunk_max_tokens: Optional[int] = None
+    chunk_overlap_tokens: int = 32
+    chunking_workers: int = 0
+    chunking_parallel_min_chars: int = 1000000
+
+    ingest_batch_size: int = 256
+    ingest_queue_size: int = 4
+    csv_chunk_rows: int = 10000
+    json_mode: str = "records"
+    html_parse_workers: int = 0
+    database_fetch_size: int = 1000
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_read_partitions: int = 1
+    database_partition_min_rows: int = 100000
+    database_count_queries: bool = False
 
     class Config:
         env_file = ".env"
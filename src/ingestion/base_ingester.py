@@ -1,26 +1,42 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from src.models import Document
 
 
 class BaseIngester(ABC):
     @abstractmethod
-    def ingest(
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         """
-        Ingest data from either a file path or direct content.
+        Lazily ingest data from either a file path or direct content.
 
         Args:
             source_path: Path to the file to ingest (optional if content is provided)
             content: Direct content to ingest (optional if source_path is provided)
             metadata: Additional metadata to attach to documents
 
-        Returns:
-            List of Document objects
+        Yields:
+            Document objects, one at a time, so callers can bound memory use
         """
         pass
 
+    def ingest(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Ingest everything at once. Prefer iter_documents for large sources."""
+        return list(self.iter_documents(source_path=source_path, content=content, metadata=metadata))
+
+    def count_documents(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> Optional[int]:
+        """Cheap estimate of how many documents iter_documents will yield, if known up front."""
+        return None
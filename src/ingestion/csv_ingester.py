@@ -1,48 +1,101 @@
-from typing import List, Dict, Any, Optional
+from typing import Iterator, Dict, Any, List, Optional
 from io import StringIO
 import pandas as pd
 from src.ingestion.base_ingester import BaseIngester
 from src.models import Document
+from src.config import settings
 
 
 class CSVIngester(BaseIngester):
-    def ingest(
+    """Streams a CSV in ``csv_chunk_rows``-row chunks and builds one document per row.
+
+    Row text is ``"column: value"`` lines over ``content_columns`` (every column by
+    default), formatted column-wise per chunk; ``metadata_columns`` are copied into each
+    row's metadata with their parsed types. Only the selected columns are parsed.
+    """
+
+    def __init__(self, chunk_rows: int = settings.csv_chunk_rows) -> None:
+        self.chunk_rows = chunk_rows
+        self.content_columns: Optional[List[str]] = None
+        self.metadata_columns: List[str] = []
+
+    def set_ingestion_params(
+        self,
+        content_columns: Optional[List[str]] = None,
+        metadata_columns: Optional[List[str]] = None,
+    ) -> None:
+        self.content_columns = content_columns or None
+        self.metadata_columns = metadata_columns or []
+
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         """Ingest CSV from either a file path or direct content."""
+        for batch in self.iter_batches(source_path=source_path, content=content, metadata=metadata):
+            yield from batch
+
+    def iter_batches(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[List[Document]]:
+        """Yield the documents of each row chunk as one list."""
         if metadata is None:
             metadata = {}
 
-        # Load CSV data from either source
+        usecols = None
+        if self.content_columns is not None:
+            usecols = list(dict.fromkeys(self.content_columns + self.metadata_columns))
+
+        # Stream CSV data from either source in bounded row chunks
         if content is not None:
-            df = pd.read_csv(StringIO(content))
+            reader = pd.read_csv(StringIO(content), chunksize=self.chunk_rows, usecols=usecols)
             source = "direct_csv_input"
         elif source_path is not None:
-            df = pd.read_csv(source_path)
+            reader = pd.read_csv(source_path, chunksize=self.chunk_rows, usecols=usecols)
             source = source_path
         else:
             raise ValueError("Either source_path or content must be provided")
-        documents = []
 
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            content_parts = [f"{col}: {val}" for col, val in row_dict.items()]
-            content = "\n".join(content_parts)
+        with reader:
+            for df in reader:
+                yield self._documents(df, source, metadata)
 
-            doc_metadata = metadata.copy()
-            doc_metadata["row_index"] = idx
-            doc_metadata["columns"] = list(df.columns)
+    def _documents(self, df: pd.DataFrame, source: str, metadata: Dict[str, Any]) -> List[Document]:
+        content_columns = self.content_columns if self.content_columns is not None else list(df.columns)
+        missing = [column for column in self.metadata_columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Metadata columns not found in CSV: {missing}")
+
+        # One str.format per row over whole-column string conversions instead of a
+        # Python-level f-string per cell.
+        template = "\n".join(
+            f"{str(column).replace('{', '{{').replace('}', '}}')}: {{}}" for column in content_columns
+        )
+        values = [df[column].astype(str).tolist() for column in content_columns]
+        contents = [template.format(*row) for row in zip(*values)]
+
+        metadata_values = [
+            df[column].astype(object).where(df[column].notna(), None).tolist()
+            for column in self.metadata_columns
+        ]
+        base_metadata = {**metadata, "columns": [str(column) for column in content_columns]}
 
+        documents = []
+        for position, (idx, row_content) in enumerate(zip(df.index.tolist(), contents)):
+            doc_metadata = base_metadata.copy()
+            doc_metadata["row_index"] = idx
+            for column, column_values in zip(self.metadata_columns, metadata_values):
+                doc_metadata[column] = column_values[position]
             documents.append(
                 Document(
-                    content=content,
+                    content=row_content,
                     metadata=doc_metadata,
                     source=f"{source}:row_{idx}",
                 )
             )
-
         return documents
-
@@ -1,13 +1,58 @@
-from typing import List, Dict, Any, Optional
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.engine import Engine
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from sqlalchemy import Column, MetaData, Table, create_engine, func, inspect, select, text
+from sqlalchemy.engine import Engine, make_url
 from src.ingestion.base_ingester import BaseIngester
 from src.models import Document
+from src.config import settings
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+_DONE = object()
+
+
+def get_engine(database_url: str) -> Engine:
+    """One pooled engine per database URL for the whole process."""
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            options: Dict[str, Any] = {"pool_pre_ping": True}
+            if make_url(database_url).get_backend_name() != "sqlite":
+                options["pool_size"] = settings.database_pool_size
+                options["max_overflow"] = settings.database_max_overflow
+            engine = create_engine(database_url, **options)
+            _engines[database_url] = engine
+        return engine
 
 
 class DatabaseIngester(BaseIngester):
-    def __init__(self, database_url: str) -> None:
-        self.engine = create_engine(database_url)
+    """Streams rows of a query or table, one document per row.
+
+    Query results are read through a server-side cursor in ``database_fetch_size``-row
+    batches where the driver supports one. Tables with a single-column primary key are
+    read in key order: through a server-side cursor, or by keyset pagination when the
+    driver has no such cursors. Tables with an integer key and at least
+    ``database_partition_min_rows`` rows are split into ``database_read_partitions``
+    key ranges read concurrently; ``row_index`` stays the row's position in key order.
+    Progress totals count table rows; counting a query's rows runs the whole query an
+    extra time, so it only happens with ``count_queries``.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        fetch_size: int = settings.database_fetch_size,
+        read_partitions: int = settings.database_read_partitions,
+        partition_min_rows: int = settings.database_partition_min_rows,
+        count_queries: bool = settings.database_count_queries,
+    ) -> None:
+        self.engine = get_engine(database_url)
+        self.fetch_size = fetch_size
+        self.read_partitions = read_partitions
+        self.partition_min_rows = partition_min_rows
+        self.count_queries = count_queries
         self.table_name: Optional[str] = None
         self.query: Optional[str] = None
 
@@ -17,31 +62,45 @@ class DatabaseIngester(BaseIngester):
         self.table_name = table_name
         self.query = query
 
-    def ingest(
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         """Ingest data from database. source_path and content parameters are not used."""
         if metadata is None:
             metadata = {}
 
         if self.query:
-            return self._ingest_from_query(self.query, metadata)
+            yield from self._ingest_from_query(self.query, metadata)
         elif self.table_name:
-            return self._ingest_from_table(self.table_name, metadata)
+            yield from self._ingest_from_table(self.table_name, metadata)
         else:
             raise ValueError("Either table_name or query must be provided via set_ingestion_params")
 
-    def _ingest_from_query(self, query: str, metadata: Dict[str, Any]) -> List[Document]:
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            rows = result.fetchall()
-            columns = result.keys()
+    def count_documents(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> Optional[int]:
+        if self.query:
+            if not self.count_queries:
+                return None
+            count_query = f"SELECT COUNT(*) FROM ({self.query}) AS counted"
+        elif self.table_name and inspect(self.engine).has_table(self.table_name):
+            count_query = f"SELECT COUNT(*) FROM {self.table_name}"
+        else:
+            return None
+
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(text(count_query)).scalar()
+        except Exception:
+            return None
 
-        documents = []
-        for idx, row in enumerate(rows):
+    def _ingest_from_query(self, query: str, metadata: Dict[str, Any]) -> Iterator[Document]:
+        for idx, (columns, row) in enumerate(self._stream_rows(text(query))):
             row_dict = dict(zip(columns, row))
             content_parts = [f"{col}: {val}" for col, val in row_dict.items()]
             content = "\n".join(content_parts)
@@ -50,30 +109,22 @@ class DatabaseIngester(BaseIngester):
             doc_metadata["query_index"] = idx
             doc_metadata["query"] = query
 
-            documents.append(
-                Document(
-                    content=content,
-                    metadata=doc_metadata,
-                    source=f"database:query_result_{idx}",
-                )
+            yield Document(
+                content=content,
+                metadata=doc_metadata,
+                source=f"database:query_result_{idx}",
             )
 
-        return documents
-
-    def _ingest_from_table(self, table_name: str, metadata: Dict[str, Any]) -> List[Document]:
+    def _ingest_from_table(self, table_name: str, metadata: Dict[str, Any]) -> Iterator[Document]:
         inspector = inspect(self.engine)
         if not inspector.has_table(table_name):
             raise ValueError(f"Table {table_name} does not exist")
 
-        columns = [col["name"] for col in inspector.get_columns(table_name)]
-        query = f"SELECT * FROM {table_name}"
-
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            rows = result.fetchall()
+        table = Table(table_name, MetaData(), autoload_with=self.engine)
+        columns = [col.name for col in table.columns]
+        key = self._key_column(table)
 
-        documents = []
-        for idx, row in enumerate(rows):
+        for idx, row in self._table_rows(table, key):
             row_dict = dict(zip(columns, row))
             content_parts = [f"{col}: {val}" for col, val in row_dict.items()]
             content = "\n".join(content_parts)
@@ -82,13 +133,149 @@ class DatabaseIngester(BaseIngester):
             doc_metadata["table_name"] = table_name
             doc_metadata["row_index"] = idx
 
-            documents.append(
-                Document(
-                    content=content,
-                    metadata=doc_metadata,
-                    source=f"database:{table_name}:row_{idx}",
-                )
+            yield Document(
+                content=content,
+                metadata=doc_metadata,
+                source=f"database:{table_name}:row_{idx}",
             )
 
-        return documents
+    def _table_rows(self, table: Table, key: Optional[Column]) -> Iterator[Tuple[int, Any]]:
+        """``(row_index, row)`` for every row, in key order when there is a key."""
+        if key is None:
+            for idx, (_, row) in enumerate(self._stream_rows(select(table))):
+                yield idx, row
+            return
+
+        ranges = self._partition_ranges(table, key)
+        if len(ranges) > 1:
+            yield from self._parallel_rows(table, key, ranges)
+        elif self.engine.dialect.supports_server_side_cursors:
+            for idx, (_, row) in enumerate(self._stream_rows(select(table).order_by(key))):
+                yield idx, row
+        else:
+            for idx, row in enumerate(row for page in self._keyset_pages(table, key) for row in page):
+                yield idx, row
+
+    def _stream_rows(self, statement: Any) -> Iterator[Tuple[List[str], Any]]:
+        with self.engine.connect() as conn:
+            # yield_per: a server-side cursor where the driver has one, fetched in batches.
+            result = conn.execution_options(yield_per=self.fetch_size).execute(statement)
+            columns = list(result.keys())
+            for rows in result.partitions():
+                for row in rows:
+                    yield columns, row
+
+    def _keyset_pages(
+        self, table: Table, key: Column, low: Any = None, high: Any = None
+    ) -> Iterator[List[Any]]:
+        """Rows with ``low < key <= high`` in key order, one short query per page.
+
+        Each page is its own statement, so no cursor or transaction stays open between
+        pages and every page is an index range scan on the key.
+        """
+        key_position = list(table.columns).index(key)
+        after = low
+        with self.engine.connect() as conn:
+            while True:
+                statement = select(table).order_by(key).limit(self.fetch_size)
+                if after is not None:
+                    statement = statement.where(key > after)
+                if high is not None:
+                    statement = statement.where(key <= high)
+                rows = conn.execute(statement).fetchall()
+                # End the read transaction between pages.
+                conn.rollback()
+                if not rows:
+                    return
+                yield rows
+                if len(rows) < self.fetch_size:
+                    return
+                after = rows[-1][key_position]
+
+    def _partition_ranges(self, table: Table, key: Column) -> List[Tuple[Any, Any, int]]:
+        """``(low, high, rows before low)`` per key range, or one unbounded range."""
+        unbounded = [(None, None, 0)]
+        if self.read_partitions <= 1 or not _is_integer(key):
+            return unbounded
+
+        with self.engine.connect() as conn:
+            lowest, highest, count = conn.execute(
+                select(func.min(key), func.max(key), func.count()).select_from(table)
+            ).one()
+            if not count or count < self.partition_min_rows:
+                return unbounded
+
+            # Equal-width key ranges; the row count below each boundary gives every
+            # range its first row_index.
+            width = -(-(highest - lowest + 1) // self.read_partitions)
+            bounds = [lowest - 1 + width * i for i in range(self.read_partitions)] + [highest]
+            bounds = sorted(set(bounds))
+            ranges = []
+            for low, high in zip(bounds, bounds[1:]):
+                before = conn.execute(
+                    select(func.count()).select_from(table).where(key <= low)
+                ).scalar()
+                ranges.append((low, high, before))
+        return ranges
+
+    def _parallel_rows(
+        self, table: Table, key: Column, ranges: List[Tuple[Any, Any, int]]
+    ) -> Iterator[Tuple[int, Any]]:
+        """Rows of all ranges, read concurrently and yielded as pages arrive.
+
+        The readers share a bounded queue of pages, so memory stays at a few pages per
+        reader however far ahead of the consumer they are.
+        """
+        pages: "queue.Queue" = queue.Queue(maxsize=2 * len(ranges))
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read(low: Any, high: Any, before: int) -> None:
+            try:
+                idx = before
+                for page in self._keyset_pages(table, key, low, high):
+                    if not put((idx, page)):
+                        return
+                    idx += len(page)
+            except BaseException as e:
+                put(e)
+            finally:
+                put(_DONE)
+
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="db-read") as executor:
+            for low, high, before in ranges:
+                executor.submit(read, low, high, before)
+            try:
+                remaining = len(ranges)
+                while remaining:
+                    item = pages.get()
+                    if item is _DONE:
+                        remaining -= 1
+                    elif isinstance(item, BaseException):
+                        raise item
+                    else:
+                        first, page = item
+                        for offset, row in enumerate(page):
+                            yield first + offset, row
+            finally:
+                stop.set()
+
+    @staticmethod
+    def _key_column(table: Table) -> Optional[Column]:
+        key_columns = list(table.primary_key.columns)
+        return key_columns[0] if len(key_columns) == 1 else None
+
 
+def _is_integer(column: Column) -> bool:
+    try:
+        return column.type.python_type is int
+    except NotImplementedError:
+        return False
@@ -1,45 +1,197 @@
-from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+from typing import Iterator, Dict, Any, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from pathlib import Path
+import multiprocessing
+import threading
+from lxml import etree, html as lxml_html
 from src.ingestion.base_ingester import BaseIngester
 from src.models import Document
+from src.config import settings
+
+HTML_EXTENSIONS = (".html", ".htm")
+
+# Page furniture rather than content.
+_BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "nav", "footer", "aside", "iframe", "svg", "button",
+)
+_BOILERPLATE_XPATH = (
+    '//*[@role="navigation" or @role="banner" or @role="contentinfo" or @role="complementary"'
+    ' or @hidden or @aria-hidden="true"]'
+)
+_HEADINGS = {f"h{level}": level for level in range(1, 7)}
+# Elements whose start and end break the text into separate lines.
+_BLOCK_TAGS = frozenset((
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "form", "header", "hr", "li", "main", "ol", "p", "pre", "section", "table", "tbody", "td",
+    "tfoot", "th", "thead", "tr", "ul", "caption", "details", "summary",
+))
+# lxml parsers must not be shared between threads.
+_parsers = threading.local()
+# Pages submitted to the pool ahead of the one being consumed, per worker.
+_PAGES_IN_FLIGHT_PER_WORKER = 4
+
+Section = Tuple[List[str], str]
 
 
 class HTMLIngester(BaseIngester):
-    def ingest(
+    """Extracts the text of HTML pages as one document per heading section.
+
+    Pages are parsed with lxml directly. Navigation, footers, scripts, styles and
+    hidden elements are dropped, and the body is split at ``h1``-``h6``: each section
+    becomes a document whose metadata carries its ``section_path``, the enclosing
+    headings from the outermost down. A ``source_path`` that is a directory ingests
+    every ``.html``/``.htm`` file under it, parsed across ``workers`` processes when
+    above 1.
+    """
+
+    def __init__(self, workers: int = settings.html_parse_workers) -> None:
+        self.workers = workers
+
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         if metadata is None:
             metadata = {}
 
         if content is not None:
-            html_content = content
-            source = "direct_html_input"
+            pages = [("direct_html_input", extract_sections(content.encode("utf-8")))]
         elif source_path is not None:
-            with open(source_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            source = source_path
+            if Path(source_path).is_dir():
+                pages = self.iter_pages(_html_files(source_path))
+            else:
+                pages = [(source_path, _extract_file(source_path))]
         else:
             raise ValueError("Either source_path or content must be provided")
 
-        soup = BeautifulSoup(html_content, 'lxml')
+        for source, (title, sections) in pages:
+            yield from self._documents(source, title, sections, metadata)
 
-        for script in soup(["script", "style"]):
-            script.decompose()
+    def iter_pages(self, paths: List[str]) -> Iterator[Tuple[str, Tuple[Optional[str], List[Section]]]]:
+        """``(path, (title, sections))`` per file, in order, parsed in parallel when enabled."""
+        if self.workers <= 1 or len(paths) <= 1:
+            for path in paths:
+                yield path, _extract_file(path)
+            return
 
-        text = soup.get_text(separator='\n', strip=True)
-        lines = (line.strip() for line in text.splitlines())
-        text = '\n'.join(line for line in lines if line)
+        # spawn: forking a process that already runs threads can deadlock the child.
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            # A bounded window of pending pages keeps memory flat on large crawls.
+            pending: "deque[Tuple[str, Future]]" = deque()
+            window = self.workers * _PAGES_IN_FLIGHT_PER_WORKER
+            try:
+                for path in paths:
+                    pending.append((path, executor.submit(_extract_file, path)))
+                    if len(pending) >= window:
+                        path, future = pending.popleft()
+                        yield path, future.result()
+                while pending:
+                    path, future = pending.popleft()
+                    yield path, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
 
-        doc_metadata = metadata.copy()
-        doc_metadata["file_type"] = "html"
-
-        return [
-            Document(
-                content=text,
+    @staticmethod
+    def _documents(
+        source: str, title: Optional[str], sections: List[Section], metadata: Dict[str, Any]
+    ) -> Iterator[Document]:
+        for index, (section_path, text) in enumerate(sections):
+            doc_metadata = metadata.copy()
+            doc_metadata["file_type"] = "html"
+            doc_metadata["section_index"] = index
+            doc_metadata["section_path"] = section_path
+            if title:
+                doc_metadata["title"] = title
+            content = f"{section_path[-1]}\n{text}" if section_path else text
+            yield Document(
+                content=content,
                 metadata=doc_metadata,
                 source=source,
             )
-        ]
+
+
+def extract_sections(data: bytes) -> Tuple[Optional[str], List[Section]]:
+    """The page title and ``(section_path, text)`` per non-empty heading section."""
+    try:
+        root = lxml_html.document_fromstring(data, parser=_parser())
+    except etree.ParserError:
+        return None, []
+
+    title_element = root.find(".//title")
+    title = _normalize(title_element.text_content()) if title_element is not None else None
+
+    for element in root.xpath(_BOILERPLATE_XPATH) + list(root.iter(*_BOILERPLATE_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()
+    body = root.find("body")
+    if body is None:
+        return title, []
+
+    sections: List[Section] = []
+    path: List[str] = []
+    levels: List[int] = []
+    parts: List[str] = []
+
+    def flush() -> None:
+        text = _normalize("".join(parts))
+        if text:
+            sections.append((list(path), text))
+        parts.clear()
+
+    walker = etree.iterwalk(body, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag
+        if event == "start":
+            level = _HEADINGS.get(tag)
+            if level is not None:
+                flush()
+                while levels and levels[-1] >= level:
+                    levels.pop()
+                    path.pop()
+                levels.append(level)
+                path.append(" ".join(element.text_content().split()))
+                walker.skip_subtree()
+                continue
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if element.text:
+                parts.append(element.text)
+        else:
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if element.tail and element is not body:
+                parts.append(element.tail)
+    flush()
+    return title, sections
+
+
+def _parser() -> lxml_html.HTMLParser:
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        parser = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+        _parsers.parser = parser
+    return parser
+
+
+def _extract_file(path: str) -> Tuple[Optional[str], List[Section]]:
+    with open(path, "rb") as f:
+        return extract_sections(f.read())
+
+
+def _html_files(directory: str) -> List[str]:
+    return sorted(
+        str(path) for path in Path(directory).rglob("*")
+        if path.suffix.lower() in HTML_EXTENSIONS and path.is_file()
+    )
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace within lines and drop empty lines."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
@@ -5,7 +5,9 @@ from src.ingestion.json_ingester import JSONIngester
 from src.ingestion.text_ingester import TextIngester
 from src.ingestion.html_ingester import HTMLIngester
 from src.ingestion.database_ingester import DatabaseIngester
-from src.models import DataSourceType
+from src.ingestion.multi_file_ingester import MultiFileIngester
+from src.models import DataSourceType, IngestRequest
+from src.config import settings
 
 
 class IngestionFactory:
@@ -32,3 +34,43 @@ class IngestionFactory:
 
         return ingester_class()
 
+    @classmethod
+    def create_for_request(cls, request: IngestRequest) -> BaseIngester:
+        """An ingester for the request's source type, configured with its parameters."""
+        if request.source_type == DataSourceType.FILES:
+            # Every file goes through the ingester of its own type, configured from the request.
+            ingester = MultiFileIngester(
+                lambda source_type: cls.create_for_request(
+                    request.model_copy(update={"source_type": source_type})
+                )
+            )
+            ingester.set_ingestion_params(source_paths=request.source_paths, root=request.upload_dir)
+            return ingester
+
+        ingester = cls.create_ingester(
+            source_type=request.source_type,
+            database_url=request.database_url or settings.database_url,
+        )
+
+        if request.source_type.value == "database":
+            if not isinstance(ingester, DatabaseIngester):
+                raise ValueError("Database ingester type mismatch")
+            ingester.set_ingestion_params(
+                table_name=request.table_name,
+                query=request.query,
+            )
+        elif request.source_type.value == "csv":
+            if not isinstance(ingester, CSVIngester):
+                raise ValueError("CSV ingester type mismatch")
+            ingester.set_ingestion_params(
+                content_columns=request.content_columns,
+                metadata_columns=request.metadata_columns,
+            )
+        elif request.source_type.value in ("json", "json_schema"):
+            if not isinstance(ingester, JSONIngester):
+                raise ValueError("JSON ingester type mismatch")
+            ingester.set_ingestion_params(
+                mode=request.json_mode,
+                record_path=request.record_path,
+            )
+        return ingester
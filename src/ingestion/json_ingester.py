@@ -1,77 +1,307 @@
-from typing import List, Dict, Any, Optional
+from typing import Iterator, Dict, Any, List, Optional, TextIO, Tuple
+from io import StringIO
 import json
+import re
 from src.ingestion.base_ingester import BaseIngester
 from src.models import Document
+from src.config import settings
+
+JSON_MODES = ("records", "leaves")
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+_READ_CHARS = 1 << 16
+# How much of the first line to look at when telling JSON Lines from a JSON document.
+_SNIFF_CHARS = 1 << 20
+_NON_WHITESPACE = re.compile(r"[^ \t\r\n]")
 
 
 class JSONIngester(BaseIngester):
-    def ingest(
+    """Streams JSON documents and JSON Lines without loading the whole input.
+
+    In ``records`` mode each record becomes one document rendered as ``path: value``
+    lines: the elements of the top-level array (or of the array at ``record_path``,
+    a dotted key path such as ``data.items``), the subtrees under the keys of a
+    top-level object, or each line of a JSON Lines input. ``leaves`` mode emits one
+    document per scalar value instead. Only one record is held in memory at a time.
+    """
+
+    def __init__(self, mode: str = settings.json_mode) -> None:
+        self.mode = mode
+        self.record_path: Optional[str] = None
+
+    def set_ingestion_params(self, mode: Optional[str] = None, record_path: Optional[str] = None) -> None:
+        mode = mode or settings.json_mode
+        if mode not in JSON_MODES:
+            raise ValueError(f"Unknown JSON mode: {mode}. Supported: {list(JSON_MODES)}")
+        self.mode = mode
+        self.record_path = record_path or None
+
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         """Ingest JSON from either a file path or direct content."""
         if metadata is None:
             metadata = {}
 
-        # Load JSON data from either source
+        # Stream JSON data from either source
         if content is not None:
-            data = json.loads(content)
-            source = "direct_json_input"
+            yield from self._iter_stream(StringIO(content), "direct_json_input", metadata, None)
         elif source_path is not None:
             with open(source_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            source = source_path
+                json_lines = True if source_path.lower().endswith(JSON_LINES_EXTENSIONS) else None
+                yield from self._iter_stream(f, source_path, metadata, json_lines)
         else:
             raise ValueError("Either source_path or content must be provided")
 
-        documents = []
-        self._process_json_data(data, source, metadata, documents, "")
-        return documents
+    def _iter_stream(
+        self, f: TextIO, source: str, metadata: Dict[str, Any], json_lines: Optional[bool]
+    ) -> Iterator[Document]:
+        stream = _JSONStream(f)
+        if json_lines is None:
+            json_lines = stream.looks_like_json_lines()
+        path = self.record_path.split(".") if self.record_path else []
+
+        for record_index, (json_path, value) in enumerate(_records(stream, path, json_lines)):
+            if self.mode == "leaves":
+                yield from self._process_json_data(value, source, metadata, json_path)
+                continue
+            # Object records list their own keys; other values keep the record's path.
+            content = "\n".join(_render(value, "" if isinstance(value, dict) else json_path, []))
+            if not content:
+                continue
+            doc_metadata = metadata.copy()
+            doc_metadata["json_path"] = json_path
+            doc_metadata["record_index"] = record_index
+            yield Document(
+                content=content,
+                metadata=doc_metadata,
+                source=f"{source}:{json_path}",
+            )
 
     def _process_json_data(
         self,
         data: Any,
         source_path: str,
         base_metadata: Dict[str, Any],
-        documents: List[Document],
         path_prefix: str,
-    ) -> None:
+    ) -> Iterator[Document]:
         if isinstance(data, dict):
             for key, value in data.items():
                 current_path = f"{path_prefix}.{key}" if path_prefix else key
                 if isinstance(value, (dict, list)):
-                    self._process_json_data(
-                        value, source_path, base_metadata, documents, current_path
+                    yield from self._process_json_data(
+                        value, source_path, base_metadata, current_path
                     )
                 else:
                     content = f"{key}: {value}"
                     doc_metadata = base_metadata.copy()
                     doc_metadata["json_path"] = current_path
-                    documents.append(
-                        Document(
-                            content=content,
-                            metadata=doc_metadata,
-                            source=f"{source_path}:{current_path}",
-                        )
+                    yield Document(
+                        content=content,
+                        metadata=doc_metadata,
+                        source=f"{source_path}:{current_path}",
                     )
         elif isinstance(data, list):
             for idx, item in enumerate(data):
                 current_path = f"{path_prefix}[{idx}]" if path_prefix else f"[{idx}]"
                 if isinstance(item, (dict, list)):
-                    self._process_json_data(
-                        item, source_path, base_metadata, documents, current_path
+                    yield from self._process_json_data(
+                        item, source_path, base_metadata, current_path
                     )
                 else:
                     content = f"{current_path}: {item}"
                     doc_metadata = base_metadata.copy()
                     doc_metadata["json_path"] = current_path
-                    documents.append(
-                        Document(
-                            content=content,
-                            metadata=doc_metadata,
-                            source=f"{source_path}:{current_path}",
-                        )
+                    yield Document(
+                        content=content,
+                        metadata=doc_metadata,
+                        source=f"{source_path}:{current_path}",
                     )
+        elif path_prefix:
+            doc_metadata = base_metadata.copy()
+            doc_metadata["json_path"] = path_prefix
+            yield Document(
+                content=f"{path_prefix}: {data}",
+                metadata=doc_metadata,
+                source=f"{source_path}:{path_prefix}",
+            )
+
+
+def _records(stream: "_JSONStream", path: List[str], json_lines: bool) -> Iterator[Tuple[str, Any]]:
+    """``(json_path, value)`` per record, reading one record at a time."""
+    if not json_lines:
+        yield from _split(stream, path, "")
+        if stream.peek() is not None:
+            raise ValueError("Extra data after the JSON document; use a .jsonl file for JSON Lines")
+        return
+
+    line = 0
+    while stream.peek() is not None:
+        prefix = f"[{line}]"
+        if path:
+            yield from _split(stream, path, prefix)
+        else:
+            yield prefix, stream.value()
+        line += 1
+
+
+def _split(stream: "_JSONStream", path: List[str], prefix: str) -> Iterator[Tuple[str, Any]]:
+    """Descend along ``path``, then yield the array elements or object subtrees found there."""
+    char = stream.peek()
+    if path:
+        if char != "{":
+            raise ValueError(f"record_path: no object at {prefix or 'the root'} to find {path[0]!r} in")
+        found = False
+        for key in stream.object_keys():
+            if key == path[0] and not found:
+                found = True
+                yield from _split(stream, path[1:], f"{prefix}.{key}" if prefix else key)
+            else:
+                stream.value()
+        if not found:
+            raise ValueError(f"record_path: key {path[0]!r} not found at {prefix or 'the root'}")
+    elif char == "[":
+        for idx in stream.array_items():
+            yield f"{prefix}[{idx}]", stream.value()
+    elif char == "{":
+        for key in stream.object_keys():
+            yield f"{prefix}.{key}" if prefix else key, stream.value()
+    else:
+        yield prefix, stream.value()
+
+
+def _render(value: Any, path: str, lines: List[str]) -> List[str]:
+    """Append ``path: value`` lines for the scalars under ``value``; scalar lists stay on one line."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            item_path = f"{path}.{key}" if path else str(key)
+            if isinstance(item, (dict, list)):
+                _render(item, item_path, lines)
+            else:
+                lines.append(f"{item_path}: {item}")
+    elif isinstance(value, list):
+        if not any(isinstance(item, (dict, list)) for item in value):
+            if value:
+                lines.append(f"{path}: {', '.join(map(str, value))}")
+        else:
+            for idx, item in enumerate(value):
+                _render(item, f"{path}[{idx}]", lines)
+    else:
+        lines.append(f"{path}: {value}" if path else str(value))
+    return lines
+
+
+class _JSONStream:
+    """Incremental reader over a text stream of JSON, built on ``json.JSONDecoder.raw_decode``.
+
+    Containers are walked token by token (``array_items``, ``object_keys``) and the values
+    inside them decoded whole, so memory holds one value plus a read buffer.
+    """
+
+    def __init__(self, f: TextIO) -> None:
+        self._file = f
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> Optional[str]:
+        """The next non-whitespace character without consuming it, None at the end."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+            if match:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return None
+
+    def looks_like_json_lines(self) -> bool:
+        """Whether the first line holds a complete JSON value and more input follows it."""
+        if self.peek() is None:
+            return False
+        while "\n" not in self._buffer[self._pos:] and len(self._buffer) - self._pos < _SNIFF_CHARS:
+            if not self._fill():
+                return False
+        line_end = self._buffer.find("\n", self._pos)
+        if line_end < 0:
+            return False
+        try:
+            json.loads(self._buffer[self._pos:line_end])
+        except ValueError:
+            return False
+        line_length = line_end - self._pos
+        while not self._buffer[self._pos + line_length:].strip():
+            if not self._fill():
+                return False
+        return True
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue past the buffer; read on until it is complete.
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise
+                continue
+            # A number or literal ending with the buffer may still be cut short.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array_items(self) -> Iterator[int]:
+        """Consume ``[``, then yield each element's index with the stream at the element."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        idx = 0
+        while True:
+            yield idx
+            idx += 1
+            if self._expect(",]") == "]":
+                return
+
+    def object_keys(self) -> Iterator[str]:
+        """Consume ``{``, then yield each key with the stream at its value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def _expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            raise self._error(f"Expecting {' or '.join(repr(c) for c in chars)}")
+        self._pos += 1
+        return char
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
 
+    def _fill(self, at_least: int = 0) -> bool:
+        if self._eof:
+            return False
+        if self._pos > _READ_CHARS:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(max(_READ_CHARS, at_least))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
@@ -0,0 +1,144 @@
+from typing import Callable, Iterator, Dict, Any, List, Optional, Tuple
+from contextlib import closing
+from pathlib import Path, PurePosixPath
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from src.ingestion.base_ingester import BaseIngester
+from src.models import DataSourceType, Document
+from src.config import settings
+from src.utils import detect_file_type
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_COPY_BUFFER_BYTES = 1 << 20
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class MultiFileIngester(BaseIngester):
+    """Ingests a list of files, and the members of zip/tar archives among them, as one source.
+
+    Each file's type comes from ``detect_file_type`` and its documents from the ingester
+    ``ingester_for`` returns for that type; unsupported archive members are skipped.
+    Archive members are extracted one at a time to a temporary file, ingested and
+    removed, so disk use stays at one member. Document sources name the file as given
+    (relative to ``root`` for spooled uploads) or ``archive/member``.
+    """
+
+    def __init__(
+        self,
+        ingester_for: Callable[[DataSourceType], BaseIngester],
+        max_extracted_bytes: int = settings.upload_max_extracted_bytes,
+    ) -> None:
+        self.ingester_for = ingester_for
+        self.max_extracted_bytes = max_extracted_bytes
+        self.source_paths: List[str] = []
+        self.root: Optional[str] = None
+
+    def set_ingestion_params(self, source_paths: List[str], root: Optional[str] = None) -> None:
+        self.source_paths = source_paths
+        self.root = root
+
+    def iter_documents(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Document]:
+        """Ingest every file in source_paths. source_path and content parameters are not used."""
+        if metadata is None:
+            metadata = {}
+
+        for path in self.source_paths:
+            name = os.path.relpath(path, self.root) if self.root else path
+            members = self._archive_members(path, name) if is_archive(path) else _file(path, name)
+            # closing: a failed member still removes the archive's temporary directory.
+            with closing(members):
+                for member_name, member_path, source_type in members:
+                    yield from self._member_documents(member_name, member_path, source_type, metadata)
+
+    def _member_documents(
+        self, name: str, path: str, source_type: DataSourceType, metadata: Dict[str, Any]
+    ) -> Iterator[Document]:
+        member_metadata = metadata.copy()
+        member_metadata["filename"] = name
+        ingester = self.ingester_for(source_type)
+        for document in ingester.iter_documents(source_path=path, metadata=member_metadata):
+            # Name documents after the file, not the temporary path it was read from.
+            if document.source.startswith(path):
+                document.source = name + document.source[len(path):]
+            yield document
+
+    def _archive_members(self, path: str, name: str) -> Iterator[Tuple[str, str, DataSourceType]]:
+        extracted = 0
+        with tempfile.TemporaryDirectory(prefix="ingest-archive-") as directory:
+            for member, open_member, size in _members(path):
+                member_name = _safe_member_name(member)
+                if member_name is None:
+                    logger.warning(f"Skipping unsafe archive member {member!r} in {name}")
+                    continue
+                try:
+                    source_type = detect_file_type(member_name)
+                except ValueError:
+                    logger.info(f"Skipping unsupported archive member {member_name} in {name}")
+                    continue
+
+                extracted += size
+                if extracted > self.max_extracted_bytes:
+                    raise ValueError(
+                        f"Archive {name} expands beyond {self.max_extracted_bytes} bytes"
+                    )
+                member_path = os.path.join(directory, PurePosixPath(member_name).name)
+                with open_member() as source, open(member_path, "wb") as target:
+                    shutil.copyfileobj(source, target, _COPY_BUFFER_BYTES)
+                try:
+                    yield f"{name}/{member_name}", member_path, source_type
+                finally:
+                    os.remove(member_path)
+
+
+def _file(path: str, name: str) -> Iterator[Tuple[str, str, DataSourceType]]:
+    yield name, path, detect_file_type(path)
+
+
+def _members(path: str) -> Iterator[Tuple[str, Callable[[], Any], int]]:
+    """``(name, opener, uncompressed size)`` per regular file, in archive order."""
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.filename, (lambda info=info: archive.open(info)), info.file_size
+    else:
+        # Streamed: compressed tars are read once, front to back.
+        with tarfile.open(path, "r|*") as archive:
+            for info in archive:
+                if info.isfile():
+                    yield info.name, (lambda info=info: archive.extractfile(info)), info.size
+
+
+def _safe_member_name(member: str) -> Optional[str]:
+    """The member's relative path, or None for absolute paths and ``..`` components."""
+    parts = PurePosixPath(member.replace("\\", "/")).parts
+    if not parts or parts[0] == "/" or ".." in parts or ":" in parts[0]:
+        return None
+    return str(PurePosixPath(*parts))
+
+
+def spool_upload(source: Any, directory: str, filename: str) -> str:
+    """Copy an uploaded file object into ``directory`` in fixed-size blocks; returns its path."""
+    name = Path(filename.replace("\\", "/")).name
+    if not name or name in (".", ".."):
+        raise ValueError(f"Invalid upload filename: {filename!r}")
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        raise ValueError(f"Duplicate upload filename: {name}")
+    with open(path, "wb") as target:
+        shutil.copyfileobj(source, target, _COPY_BUFFER_BYTES)
+    return path
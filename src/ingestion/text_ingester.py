@@ -1,38 +1,90 @@
-from typing import List, Dict, Any, Optional
+from typing import Iterator, Dict, Any, Optional, TextIO
+from io import StringIO
+import os
 from src.ingestion.base_ingester import BaseIngester
 from src.models import Document
 
+_READ_CHARS = 1 << 16
+_BLOCK_CHARS = 1 << 20
+
 
 class TextIngester(BaseIngester):
-    def ingest(
+    """Streams plain text in blocks of about ``_BLOCK_CHARS`` characters.
+
+    The input is read in fixed-size pieces and each block ends at the last paragraph
+    break before the limit, or at a line break when a paragraph runs longer, so only
+    one block is held in memory. Inputs smaller than a block stay a single document.
+    """
+
+    def iter_documents(
         self,
         source_path: Optional[str] = None,
         content: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Document]:
+    ) -> Iterator[Document]:
         """Ingest text from either a file path or direct content."""
         if metadata is None:
             metadata = {}
 
-        # Get text content from either source
+        # Stream text content from either source
         if content is not None:
-            text_content = content
-            source = "direct_text_input"
+            yield from self._iter_stream(StringIO(content), "direct_text_input", metadata)
         elif source_path is not None:
             with open(source_path, "r", encoding="utf-8") as f:
-                text_content = f.read()
-            source = source_path
+                yield from self._iter_stream(f, source_path, metadata)
         else:
             raise ValueError("Either source_path or content must be provided")
 
-        doc_metadata = metadata.copy()
-        doc_metadata["file_type"] = "text"
+    def count_documents(
+        self,
+        source_path: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> Optional[int]:
+        if content is not None:
+            size = len(content)
+        elif source_path is not None and os.path.exists(source_path):
+            size = os.path.getsize(source_path)
+        else:
+            return 1
+        return max(1, -(-size // _BLOCK_CHARS))
+
+    @staticmethod
+    def _iter_stream(f: TextIO, source: str, metadata: Dict[str, Any]) -> Iterator[Document]:
+        for block_index, text_content in enumerate(_blocks(f)):
+            doc_metadata = metadata.copy()
+            doc_metadata["file_type"] = "text"
+            doc_metadata["block_index"] = block_index
 
-        return [
-            Document(
+            yield Document(
                 content=text_content,
                 metadata=doc_metadata,
                 source=source,
             )
-        ]
 
+
+def _blocks(f: TextIO) -> Iterator[str]:
+    """Blocks of at most ``_BLOCK_CHARS`` characters, cut after a paragraph or line break."""
+    buffer = ""
+    emitted = False
+    while True:
+        piece = f.read(_READ_CHARS)
+        if not piece:
+            break
+        buffer += piece
+        while len(buffer) >= _BLOCK_CHARS:
+            end = _cut(buffer)
+            yield buffer[:end]
+            emitted = True
+            buffer = buffer[end:]
+    # An empty input still yields one empty document.
+    if buffer or not emitted:
+        yield buffer
+
+
+def _cut(buffer: str) -> int:
+    """End of the first block of ``buffer``: after its last paragraph, line or word break."""
+    for separator in ("\n\n", "\n", " "):
+        position = buffer.rfind(separator, 0, _BLOCK_CHARS)
+        if position > 0:
+            return position + len(separator)
+    return _BLOCK_CHARS
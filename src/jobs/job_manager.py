@@ -0,0 +1,152 @@
+from typing import Callable, Dict, List, Optional
+from pathlib import Path
+import logging
+import shutil
+import threading
+from src.config import settings
+from src.jobs.job_store import JobStore
+from src.models import IngestJob, IngestJobProgress, IngestRequest, JobStatus
+from src.pipeline.ingestion_pipeline import IngestionPipeline
+from src.pipeline.progress import IngestionCancelled, IngestionProgress
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_SECONDS = 1.0
+
+
+class IngestionJobManager:
+    """Runs queued ingestion jobs on a fixed pool of worker threads.
+
+    The pipeline is resolved lazily on the first job, so starting the manager does not
+    load the embedding model or contact the vector store. Workers also poll the store,
+    which lets several API processes share one queue.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        pipeline_factory: Callable[[], IngestionPipeline],
+        workers: int = 2,
+    ) -> None:
+        self.store = store
+        self.pipeline_factory = pipeline_factory
+        self.workers = workers
+        self._running: Dict[str, IngestionProgress] = {}
+        self._running_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        requeued = self.store.requeue_orphaned()
+        if requeued:
+            logger.info(f"Re-queued {requeued} ingestion jobs interrupted by a restart")
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"ingest-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        with self._running_lock:
+            for progress in self._running.values():
+                progress.cancel()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def submit(self, request: IngestRequest) -> IngestJob:
+        job = self.store.create(request)
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        with self._running_lock:
+            progress = self._running.get(job_id)
+        if progress is not None and job.status == JobStatus.RUNNING:
+            job.progress = IngestJobProgress(**progress.snapshot())
+            job.cancel_requested = progress.cancelled
+        return job
+
+    def list(self, limit: int = 50) -> List[IngestJob]:
+        return [self.get(job.job_id) or job for job in self.store.list(limit)]
+
+    def cancel(self, job_id: str) -> bool:
+        if self.store.cancel_queued(job_id):
+            request = self.store.get_request(job_id)
+            if request is not None:
+                _discard_upload(request)
+            return True
+        with self._running_lock:
+            progress = self._running.get(job_id)
+        if progress is None:
+            return False
+        progress.cancel()
+        return True
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            claimed = self.store.claim_next()
+            if claimed is None:
+                self._wakeup.wait(_POLL_INTERVAL_SECONDS)
+                self._wakeup.clear()
+                continue
+            self._run(*claimed)
+
+    def _run(self, job_id: str, request: IngestRequest) -> None:
+        progress = IngestionProgress()
+        with self._running_lock:
+            self._running[job_id] = progress
+
+        logger.info(f"Ingestion job {job_id} started ({request.source_type.value})")
+        try:
+            count = self.pipeline_factory().ingest(request, progress=progress)
+        except IngestionCancelled:
+            if self._stopping.is_set():
+                logger.info(f"Ingestion job {job_id} interrupted by shutdown, re-queued")
+                self.store.requeue(job_id)
+                with self._running_lock:
+                    self._running.pop(job_id, None)
+                return
+            logger.info(f"Ingestion job {job_id} cancelled")
+            self._finish(job_id, JobStatus.CANCELLED, progress)
+        except Exception as e:
+            logger.exception(f"Ingestion job {job_id} failed")
+            self._finish(job_id, JobStatus.FAILED, progress, error=str(e))
+        else:
+            logger.info(f"Ingestion job {job_id} completed: {count} chunks")
+            self._finish(job_id, JobStatus.COMPLETED, progress, documents_ingested=count)
+        # Requeued jobs returned above and still need their spooled files.
+        _discard_upload(request)
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        progress: IngestionProgress,
+        documents_ingested: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.store.finish(
+            job_id,
+            status,
+            IngestJobProgress(**progress.snapshot()),
+            documents_ingested=documents_ingested,
+            error=error,
+        )
+        with self._running_lock:
+            self._running.pop(job_id, None)
+
+
+def _discard_upload(request: IngestRequest) -> None:
+    """Remove the spooled files of an upload once its job can no longer run."""
+    if not request.upload_dir:
+        return
+    upload_dir = Path(request.upload_dir).resolve()
+    # Only directories the upload endpoint created, never a path sent to /ingest.
+    if upload_dir.parent == Path(settings.upload_dir).resolve():
+        shutil.rmtree(upload_dir, ignore_errors=True)
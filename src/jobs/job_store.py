@@ -0,0 +1,260 @@
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from sqlalchemy.engine import make_url
+from src.models import IngestJob, IngestJobProgress, IngestRequest, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Inline content above this size is kept in a file under upload_dir, not in the job row.
+_INLINE_CONTENT_MAX_CHARS = 64 * 1024
+
+
+class JobStore:
+    """SQLite-backed queue of ingestion jobs.
+
+    Requests are stored with the job, so queued work survives a restart. Each running
+    job records its owning host and PID; on startup, running jobs whose owner process
+    is gone are put back in the queue.
+
+    Database passwords never reach the table: the row keeps the URL with the password
+    hidden and the submitting process holds the real one in memory, so only it can
+    claim the job. Jobs whose submitter exited fail on the next startup. Large inline
+    content is written to a file under ``upload_dir`` and read back when claimed.
+    """
+
+    def __init__(self, path: str, upload_dir: Optional[str] = None) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.upload_dir = upload_dir
+        self._database_urls: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                source_type TEXT NOT NULL,
+                request TEXT NOT NULL,
+                owner TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                documents_ingested INTEGER,
+                error TEXT,
+                progress TEXT,
+                submitter TEXT,
+                content_path TEXT
+            )
+            """
+        )
+        # Job tables created before submitter and content_path existed.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column in ("submitter", "content_path"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at)")
+
+    def create(self, request: IngestRequest) -> IngestJob:
+        job_id = uuid.uuid4().hex
+        stored = request
+        submitter = None
+        if request.database_url and make_url(request.database_url).password is not None:
+            redacted = make_url(request.database_url).render_as_string(hide_password=True)
+            stored = stored.model_copy(update={"database_url": redacted})
+            submitter = self.owner
+        content_path = None
+        if (
+            self.upload_dir
+            and request.content is not None
+            and len(request.content) > _INLINE_CONTENT_MAX_CHARS
+        ):
+            # The job's upload directory is removed with its other spooled files.
+            directory = stored.upload_dir or os.path.join(self.upload_dir, job_id)
+            os.makedirs(directory, exist_ok=True)
+            content_path = os.path.join(directory, f"{job_id}.content")
+            with open(content_path, "w", encoding="utf-8") as f:
+                f.write(request.content)
+            stored = stored.model_copy(update={"content": None, "upload_dir": directory})
+
+        with self._lock:
+            if submitter is not None:
+                self._database_urls[job_id] = request.database_url
+            self._db.execute(
+                "INSERT INTO jobs (job_id, status, source_type, request, created_at, submitter, "
+                "content_path) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, request.source_type.value,
+                 stored.model_dump_json(), time.time(), submitter, content_path),
+            )
+        return self.get(job_id)
+
+    def claim_next(self) -> Optional[Tuple[str, IngestRequest]]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT job_id, request, content_path FROM jobs "
+                    "WHERE status = ? AND (submitter IS NULL OR submitter = ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED.value, self.owner),
+                ).fetchone()
+                if row:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, owner = ?, started_at = ? WHERE job_id = ?",
+                        (JobStatus.RUNNING.value, self.owner, time.time(), row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        return row[0], self._load_request(*row)
+
+    def finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        progress: IngestJobProgress,
+        documents_ingested: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._database_urls.pop(job_id, None)
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, documents_ingested = ?, error = ?, "
+                "progress = ? WHERE job_id = ?",
+                (status.value, time.time(), documents_ingested, error,
+                 progress.model_dump_json(), job_id),
+            )
+
+    def cancel_queued(self, job_id: str) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                (JobStatus.CANCELLED.value, time.time(), job_id, JobStatus.QUEUED.value),
+            )
+            if cursor.rowcount > 0:
+                self._database_urls.pop(job_id, None)
+        return cursor.rowcount > 0
+
+    def requeue(self, job_id: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE job_id = ?",
+                (JobStatus.QUEUED.value, job_id),
+            )
+
+    def requeue_orphaned(self) -> int:
+        """Put back running jobs whose owning process on this host no longer exists.
+
+        Jobs whose database credentials died with their submitting process fail instead.
+        """
+        host = socket.gethostname()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT job_id, submitter FROM jobs WHERE status IN (?, ?) AND submitter IS NOT NULL",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchall()
+            lost = [job_id for job_id, submitter in rows if _is_orphaned(submitter, host)]
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE job_id = ?",
+                [
+                    (JobStatus.FAILED.value, time.time(),
+                     "Database credentials were lost in a restart; submit the job again", job_id)
+                    for job_id in lost
+                ],
+            )
+            if lost:
+                logger.warning(f"Failed {len(lost)} ingestion jobs whose database credentials were lost")
+            rows = self._db.execute(
+                "SELECT job_id, owner FROM jobs WHERE status = ?", (JobStatus.RUNNING.value,)
+            ).fetchall()
+            orphaned = [job_id for job_id, owner in rows if _is_orphaned(owner, host)]
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE job_id = ?",
+                [(JobStatus.QUEUED.value, job_id) for job_id in orphaned],
+            )
+        return len(orphaned)
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _to_job(row) if row else None
+
+    def get_request(self, job_id: str) -> Optional[IngestRequest]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_id, request, content_path FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._load_request(*row) if row else None
+
+    def list(self, limit: int = 50) -> List[IngestJob]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_to_job(row) for row in rows]
+
+    def _load_request(
+        self, job_id: str, request: str, content_path: Optional[str]
+    ) -> IngestRequest:
+        data: Dict[str, Any] = json.loads(request)
+        if content_path and os.path.exists(content_path):
+            with open(content_path, "r", encoding="utf-8") as f:
+                data["content"] = f.read()
+        with self._lock:
+            database_url = self._database_urls.get(job_id)
+        if database_url is not None:
+            data["database_url"] = database_url
+        return IngestRequest.model_validate(data)
+
+
+_COLUMNS = (
+    "job_id, status, source_type, created_at, started_at, finished_at, "
+    "documents_ingested, error, progress"
+)
+
+
+def _to_job(row: tuple) -> IngestJob:
+    (job_id, status, source_type, created_at, started_at, finished_at,
+     documents_ingested, error, progress) = row
+    return IngestJob(
+        job_id=job_id,
+        status=JobStatus(status),
+        source_type=source_type,
+        created_at=created_at,
+        started_at=started_at,
+        finished_at=finished_at,
+        documents_ingested=documents_ingested,
+        error=error,
+        progress=IngestJobProgress(**json.loads(progress)) if progress else IngestJobProgress(),
+    )
+
+
+def _is_orphaned(owner: Optional[str], host: str) -> bool:
+    if not owner:
+        return True
+    owner_host, _, pid = owner.rpartition(":")
+    if owner_host != host:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, ValueError):
+        return False
+    return int(pid) == os.getpid()
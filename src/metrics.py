@@ -0,0 +1,49 @@
+from typing import Any, Dict, Sequence
+from collections import deque
+import bisect
+import threading
+
+
+class Histogram:
+    """Thread-safe distribution of observed values.
+
+    Counts go into fixed upper-bound buckets for the whole process lifetime; percentiles
+    are computed over a sliding window of the most recent observations.
+    """
+
+    def __init__(self, buckets: Sequence[float], window: int = 2048) -> None:
+        self.buckets = sorted(buckets)
+        self._bucket_counts = [0] * (len(self.buckets) + 1)
+        self._recent: deque = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._recent.append(value)
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            counts = list(self._bucket_counts)
+            count, total, maximum = self._count, self._sum, self._max
+
+        def percentile(q: float) -> float:
+            return recent[int(q * (len(recent) - 1))] if recent else 0.0
+
+        labels = [f"<={b:g}" for b in self.buckets] + [f">{self.buckets[-1]:g}"]
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "buckets": dict(zip(labels, counts)),
+        }
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
+from src.services.filters import parse_filters
 
 
 class DataSourceType(str, Enum):
@@ -10,6 +11,7 @@ class DataSourceType(str, Enum):
     TEXT = "text"
     JSON_SCHEMA = "json_schema"
     HTML = "html"
+    FILES = "files"
 
 
 class Document(BaseModel):
@@ -22,15 +24,25 @@ class IngestRequest(BaseModel):
     source_type: DataSourceType
     source_path: Optional[str] = None
     content: Optional[str] = None
+    source_paths: Optional[List[str]] = None
+    upload_dir: Optional[str] = None
     database_url: Optional[str] = None
     table_name: Optional[str] = None
     query: Optional[str] = None
+    source_id: Optional[str] = None
+    content_columns: Optional[List[str]] = None
+    metadata_columns: Optional[List[str]] = None
+    json_mode: Optional[str] = None
+    record_path: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
     @model_validator(mode='after')
     def validate_source(self):
         """Ensure either source_path or content is provided for non-database sources."""
-        if self.source_type != DataSourceType.DATABASE:
+        if self.source_type == DataSourceType.FILES:
+            if not self.source_paths:
+                raise ValueError("source_paths must be provided for files sources")
+        elif self.source_type != DataSourceType.DATABASE:
             if not self.source_path and not self.content:
                 raise ValueError("Either source_path or content must be provided")
         return self
@@ -46,6 +58,18 @@ class QueryRequest(BaseModel):
     question: str
     top_k: Optional[int] = None
     filters: Optional[Dict[str, Any]] = None
+    dense_weight: Optional[float] = Field(default=None, ge=0.0)
+    lexical_weight: Optional[float] = Field(default=None, ge=0.0)
+    rerank: Optional[bool] = None
+    rerank_candidates: Optional[int] = Field(default=None, ge=1)
+    rerank_budget_ms: Optional[float] = Field(default=None, gt=0.0)
+
+    @field_validator('filters')
+    @classmethod
+    def validate_filters(cls, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Reject unknown operators and malformed operands before they reach a backend."""
+        parse_filters(filters)
+        return filters
 
 
 class SourceChunk(BaseModel):
@@ -60,3 +84,43 @@ class QueryResponse(BaseModel):
     sources: List[SourceChunk]
     query: str
 
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    message: str
+
+
+class IngestJobProgress(BaseModel):
+    documents_parsed: int = 0
+    total_documents: Optional[int] = None
+    chunks_created: int = 0
+    chunks_embedded: int = 0
+    chunks_skipped: int = 0
+    points_written: int = 0
+    files_parsed: int = 0
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    points_per_second: float = 0.0
+    eta_seconds: Optional[float] = None
+
+
+class IngestJob(BaseModel):
+    job_id: str
+    status: JobStatus
+    source_type: DataSourceType
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    documents_ingested: Optional[int] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    progress: IngestJobProgress = Field(default_factory=IngestJobProgress)
@@ -1,64 +1,270 @@
-from typing import List
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import Future
+import asyncio
 import logging
+import time
+import numpy as np
+from sqlalchemy.engine import make_url
 from src.models import Document, IngestRequest
 from src.ingestion.ingestion_factory import IngestionFactory
-from src.ingestion.database_ingester import DatabaseIngester
 from src.services.chunking_service import ChunkingService
 from src.services.embedding_service import EmbeddingService
-from src.services.vector_store import VectorStore
+from src.services.base_vector_store import BaseVectorStore, point_id_for
+from src.services.ingestion_manifest import IngestionManifest
+from src.services.lexical_index import LexicalIndex
+from src.services.semantic_cache import SemanticAnswerCache
+from src.services.persistent_embedding_cache import PersistentEmbeddingCache
+from src.pipeline.stages import run_in_background, batched
+from src.pipeline.progress import IngestionProgress
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _IngestionRun:
+    def __init__(
+        self, source_key: Optional[str], previous_ids: Set[str], progress: IngestionProgress
+    ) -> None:
+        self.source_key = source_key
+        self.previous_ids = previous_ids
+        self.progress = progress
+        self.seen_ids: Set[str] = set()
+
+
 class IngestionPipeline:
+    """Streams a source through chunk -> embed -> upsert stages.
+
+    Each stage runs on its own thread and hands fixed-size batches to the next through
+    a bounded queue, so parsing, embedding and network writes overlap and peak memory
+    is set by ``batch_size`` and ``queue_size`` rather than by the size of the source.
+
+    With a manifest, re-ingesting a named source only embeds and writes chunks whose
+    content-addressed point IDs are new, then deletes the points that disappeared.
+    """
+
     def __init__(
         self,
         chunking_service: ChunkingService,
         embedding_service: EmbeddingService,
-        vector_store: VectorStore,
+        vector_store: BaseVectorStore,
+        embedding_cache: Optional[PersistentEmbeddingCache] = None,
+        manifest: Optional[IngestionManifest] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        lexical_index: Optional[LexicalIndex] = None,
+        batch_size: int = settings.ingest_batch_size,
+        queue_size: int = settings.ingest_queue_size,
     ) -> None:
         self.chunking_service = chunking_service
         self.embedding_service = embedding_service
         self.vector_store = vector_store
+        self.embedding_cache = embedding_cache
+        self.manifest = manifest
+        self.answer_cache = answer_cache
+        self.lexical_index = lexical_index
+        self.batch_size = batch_size
+        self.queue_size = queue_size
 
-    def ingest(self, request: IngestRequest) -> int:
+    def ingest(self, request: IngestRequest, progress: Optional[IngestionProgress] = None) -> int:
         logger.info(f"Starting ingestion for source type: {request.source_type.value}")
+        ingester = IngestionFactory.create_for_request(request)
+        source_key = self._source_key(request) if self.manifest else None
+        progress = progress or IngestionProgress()
+        progress.start(total_documents=ingester.count_documents(
+            source_path=request.source_path, content=request.content
+        ))
+        documents = ingester.iter_documents(
+            source_path=request.source_path,
+            content=request.content,
+            metadata=request.metadata,
+        )
+        return self.ingest_documents(documents, source_key=source_key, progress=progress)
+
+    def ingest_documents(
+        self,
+        documents: Iterable[Document],
+        source_key: Optional[str] = None,
+        progress: Optional[IngestionProgress] = None,
+    ) -> int:
+        """Chunk, embed and write already parsed documents as one run; returns the chunk count.
+
+        ``source_key`` names the run in the manifest, as ``ingest`` does for a request.
+        """
+        run = self._start_run(source_key if self.manifest else None, progress or IngestionProgress())
+        if run.progress.started_at is None:
+            run.progress.start()
+
+        chunk_batches = run_in_background(
+            self._chunk_batches(iter(documents), run), maxsize=self.queue_size, name="ingest-chunk"
+        )
+        embedded_batches = run_in_background(
+            self._embed_batches(chunk_batches, run), maxsize=self.queue_size, name="ingest-embed"
+        )
+
+        written = 0
+        stale = 0
+        # Each batch's chunks ride on its last upsert future and reach the lexical index
+        # only once every upsert of the batch has succeeded.
+        in_flight: Deque[Tuple[Future, Optional[List[Document]], Optional[List[str]]]] = deque()
+        started = time.perf_counter()
+        try:
+            try:
+                for chunks, point_ids, embeddings in embedded_batches:
+                    run.progress.raise_if_cancelled()
+                    waited = time.perf_counter()
+                    futures = self.vector_store.submit_documents(
+                        chunks, embeddings, point_ids=point_ids
+                    )
+                    for future in futures:
+                        future.add_done_callback(self._count_written(run.progress))
+                        if future is futures[-1]:
+                            in_flight.append((future, chunks, point_ids))
+                        else:
+                            in_flight.append((future, None, None))
+                    written += len(chunks)
+                    # Cap outstanding upserts so a slow vector store pushes back on embedding.
+                    while len(in_flight) > self.vector_store.upsert_workers * 2:
+                        self._wait_written(*in_flight.popleft())
+                    run.progress.add_stage_time("upsert", time.perf_counter() - waited)
+                waited = time.perf_counter()
+                while in_flight:
+                    self._wait_written(*in_flight.popleft())
+                run.progress.add_stage_time("upsert", time.perf_counter() - waited)
+            finally:
+                for future, _, _ in in_flight:
+                    future.cancel()
+
+            chunks = run.progress.chunks_created
+            if chunks == 0:
+                logger.warning("No chunks created from documents")
+
+            if written and not self.vector_store.upsert_wait:
+                self.vector_store.flush()
+            stale = self._finish_run(run)
+        finally:
+            # A failed or cancelled run may still have changed the collection. The manifest
+            # version tells answer caches in other processes.
+            if written or stale:
+                if self.manifest is not None:
+                    self.manifest.bump_version(self.vector_store.collection_name)
+                if self.answer_cache is not None:
+                    self.answer_cache.invalidate()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Successfully ingested {chunks} document chunks in {elapsed:.2f}s: "
+            f"{written} written ({written / max(elapsed, 1e-9):.0f} points/s), "
+            f"{run.progress.chunks_skipped} unchanged, {stale} stale deleted"
+        )
+        return chunks
+
+    async def aingest(self, request: IngestRequest) -> int:
+        # The staged pipeline drives its own threads; run its coordinator off the event loop.
+        return await asyncio.to_thread(self.ingest, request)
 
-        ingester = IngestionFactory.create_ingester(
-            source_type=request.source_type,
-            database_url=request.database_url or settings.database_url,
+    def _start_run(self, source_key: Optional[str], progress: IngestionProgress) -> _IngestionRun:
+        previous_ids = (
+            self.manifest.get_point_ids(self.vector_store.collection_name, source_key)
+            if source_key
+            else set()
         )
+        return _IngestionRun(source_key, previous_ids, progress)
 
+    def _finish_run(self, run: _IngestionRun) -> int:
+        stale = []
+        if run.source_key:
+            stale = list(run.previous_ids - run.seen_ids)
+            if stale:
+                self.vector_store.delete_points(stale)
+            self.manifest.replace(self.vector_store.collection_name, run.source_key, run.seen_ids)
+        if self.lexical_index is not None:
+            self.lexical_index.delete(stale)
+            self.lexical_index.commit()
+        return len(stale)
+
+    @staticmethod
+    def _source_key(request: IngestRequest) -> Optional[str]:
+        """Stable identity of a source across ingestions, or None when it has none."""
+        if request.source_id:
+            return f"id:{request.source_id}"
         if request.source_type.value == "database":
-            if not isinstance(ingester, DatabaseIngester):
-                raise ValueError("Database ingester type mismatch")
-            ingester.set_ingestion_params(
-                table_name=request.table_name,
-                query=request.query,
-            )
-            documents = ingester.ingest(metadata=request.metadata)
-        else:
-            documents = ingester.ingest(
-                source_path=request.source_path,
-                content=request.content,
-                metadata=request.metadata,
-            )
-
-        logger.info(f"Loaded {len(documents)} documents, starting chunking...")
-        chunked_documents = self.chunking_service.chunk_documents(documents)
-        if not chunked_documents:
-            logger.warning("No chunks created from documents")
-            return 0
-
-        logger.info(f"Created {len(chunked_documents)} chunks, generating embeddings...")
-        texts = [doc.content for doc in chunked_documents]
-        embeddings = self.embedding_service.encode(texts)
-        embedding_list = [emb.tolist() for emb in embeddings]
-
-        logger.info(f"Storing {len(chunked_documents)} chunks in vector database...")
-        self.vector_store.store_documents(chunked_documents, embedding_list)
-        logger.info(f"Successfully ingested {len(chunked_documents)} document chunks")
-
-        return len(chunked_documents)
+            database_url = request.database_url or settings.database_url
+            location = make_url(database_url).render_as_string(hide_password=True)
+            return f"database:{location}:{request.table_name or request.query}"
+        if request.source_path:
+            return f"file:{request.source_path}"
+        # Uploads have no stable identity of their own: two unrelated files can share a
+        # name, so only an explicit source_id makes re-uploading one incremental.
+        return None
+
+    def _chunk_batches(
+        self, documents: Iterator[Document], run: _IngestionRun
+    ) -> Iterator[List[Document]]:
+        pending: List[Document] = []
+        document_batches = batched(documents, self.batch_size)
+        while True:
+            started = time.perf_counter()
+            document_batch = next(document_batches, None)
+            run.progress.add_stage_time("parse", time.perf_counter() - started)
+            if document_batch is None:
+                break
+            run.progress.raise_if_cancelled()
+            started = time.perf_counter()
+            chunks = self.chunking_service.chunk_documents(document_batch)
+            run.progress.add_stage_time("chunk", time.perf_counter() - started)
+            run.progress.add(documents_parsed=len(document_batch), chunks_created=len(chunks))
+            pending.extend(chunks)
+            while len(pending) >= self.batch_size:
+                yield pending[:self.batch_size]
+                pending = pending[self.batch_size:]
+        if pending:
+            yield pending
+
+    def _embed_batches(
+        self, chunk_batches: Iterator[List[Document]], run: _IngestionRun
+    ) -> Iterator[Tuple[List[Document], List[str], np.ndarray]]:
+        for chunks in chunk_batches:
+            run.progress.raise_if_cancelled()
+            changed: List[Document] = []
+            changed_ids: List[str] = []
+            unchanged: List[Document] = []
+            unchanged_ids: List[str] = []
+            for chunk in chunks:
+                point_id = point_id_for(chunk, run.source_key)
+                run.seen_ids.add(point_id)
+                if point_id not in run.previous_ids:
+                    changed.append(chunk)
+                    changed_ids.append(point_id)
+                else:
+                    unchanged.append(chunk)
+                    unchanged_ids.append(point_id)
+            run.progress.add(chunks_skipped=len(unchanged))
+            if self.lexical_index is not None and unchanged:
+                # Unchanged chunks already have vectors; this covers chunks ingested before
+                # the lexical index existed. Changed ones are indexed once written.
+                self.lexical_index.add_documents(unchanged, unchanged_ids)
+            if changed:
+                started = time.perf_counter()
+                embeddings = self._embed([chunk.content for chunk in changed])
+                run.progress.add_stage_time("embed", time.perf_counter() - started)
+                run.progress.add(chunks_embedded=len(changed))
+                yield changed, changed_ids, embeddings
+
+    def _wait_written(
+        self, future: Future, chunks: Optional[List[Document]], point_ids: Optional[List[str]]
+    ) -> None:
+        future.result()
+        if chunks is not None and self.lexical_index is not None:
+            self.lexical_index.add_documents(chunks, point_ids)
+
+    @staticmethod
+    def _count_written(progress: IngestionProgress) -> Callable[[Future], None]:
+        def callback(future: Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                progress.add(points_written=future.result())
+        return callback
 
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.embedding_cache is None:
+            return self.embedding_service.encode(texts)
+        return self.embedding_cache.get_or_encode(texts, self.embedding_service.encode)
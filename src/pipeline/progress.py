@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional
+import threading
+import time
+
+
+class IngestionCancelled(Exception):
+    pass
+
+
+class IngestionProgress:
+    """Live counters for one ingestion run, shared between the pipeline stages and observers.
+
+    Also carries the cancellation flag: stages call ``raise_if_cancelled`` between
+    batches, so a cancelled run stops at the next batch boundary.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.started_at: Optional[float] = None
+        self.total_documents: Optional[int] = None
+        self.documents_parsed = 0
+        self.chunks_created = 0
+        self.chunks_embedded = 0
+        self.chunks_skipped = 0
+        self.points_written = 0
+        self.files_parsed = 0
+        # Busy seconds per pipeline stage; stages overlap, so these can sum past elapsed.
+        self.stage_seconds: Dict[str, float] = {}
+
+    def start(self, total_documents: Optional[int] = None) -> None:
+        self.started_at = time.monotonic()
+        self.total_documents = total_documents
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise IngestionCancelled("Ingestion was cancelled")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            throughput = self.points_written / elapsed if elapsed > 0 else 0.0
+            eta = None
+            if self.total_documents and self.documents_parsed and elapsed > 0:
+                remaining = max(self.total_documents - self.documents_parsed, 0)
+                eta = remaining / (self.documents_parsed / elapsed)
+            return {
+                "documents_parsed": self.documents_parsed,
+                "total_documents": self.total_documents,
+                "chunks_created": self.chunks_created,
+                "chunks_embedded": self.chunks_embedded,
+                "chunks_skipped": self.chunks_skipped,
+                "points_written": self.points_written,
+                "files_parsed": self.files_parsed,
+                "stage_seconds": dict(self.stage_seconds),
+                "elapsed_seconds": elapsed,
+                "points_per_second": throughput,
+                "eta_seconds": eta,
+            }
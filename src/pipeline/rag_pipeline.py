@@ -1,36 +1,299 @@
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import time
+from src.config import settings
 from src.services.embedding_service import EmbeddingService
-from src.services.vector_store import VectorStore
+from src.services.base_vector_store import BaseVectorStore, point_id_for
+from src.services.filters import parse_filters, payload_matches
+from src.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
 from src.services.llm_service import LLMService
-from src.models import QueryRequest, QueryResponse, SourceChunk
+from src.services.reranker import RerankerService
+from src.services.semantic_cache import SemanticAnswerCache
+from src.models import Document, QueryRequest, QueryResponse, SourceChunk
+from src.metrics import Histogram
+
+_LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
 
 
 class RAGPipeline:
     def __init__(
         self,
         embedding_service: EmbeddingService,
-        vector_store: VectorStore,
+        vector_store: BaseVectorStore,
         llm_service: LLMService,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        lexical_index: Optional[LexicalIndex] = None,
+        reranker: Optional[RerankerService] = None,
     ) -> None:
         self.embedding_service = embedding_service
         self.vector_store = vector_store
         self.llm_service = llm_service
+        self.answer_cache = answer_cache
+        self.lexical_index = lexical_index
+        self.reranker = reranker
+        self.time_to_first_byte_ms = Histogram(buckets=_LATENCY_BUCKETS_MS)
+        self.time_to_first_token_ms = Histogram(buckets=_LATENCY_BUCKETS_MS)
 
     def query(self, request: QueryRequest) -> QueryResponse:
-        top_k = request.top_k or 5
+        cache_version = self._cache_version()
         query_embedding = self.embedding_service.encode_single(request.question)
+        cached = self._cached_answer(request, query_embedding)
+        if cached is not None:
+            return cached
+
+        source_chunks = self.retrieve(request, query_embedding)
+        answer = self.llm_service.generate_response(request.question, source_chunks)
 
-        source_chunks = self.vector_store.search(
-            query_embedding=query_embedding,
-            top_k=top_k,
-            filters=request.filters,
+        response = QueryResponse(
+            answer=answer,
+            sources=source_chunks,
+            query=request.question,
         )
+        self._cache_answer(request, query_embedding, response, cache_version)
+        return response
 
-        answer = self.llm_service.generate_response(request.question, source_chunks)
+    async def aquery(self, request: QueryRequest) -> QueryResponse:
+        cache_version = self._cache_version()
+        query_embedding = await self.embedding_service.aencode_single(request.question)
+        cached = self._cached_answer(request, query_embedding)
+        if cached is not None:
+            return cached
+
+        source_chunks = await self.aretrieve(request, query_embedding)
+        answer = await self.llm_service.agenerate_response(request.question, source_chunks)
 
-        return QueryResponse(
+        response = QueryResponse(
             answer=answer,
             sources=source_chunks,
             query=request.question,
         )
+        self._cache_answer(request, query_embedding, response, cache_version)
+        return response
+
+    def retrieve(self, request: QueryRequest, query_embedding: List[float]) -> List[SourceChunk]:
+        top_k = request.top_k or 5
+        rerank = self._rerank_enabled(request)
+        limit = max(top_k, self._rerank_candidates(request)) if rerank else top_k
+        chunks = self._search(request, query_embedding, limit)
+        if not rerank:
+            return chunks
+        return self.reranker.rerank(
+            request.question, chunks, top_k, self._rerank_budget_ms(request)
+        )
+
+    async def aretrieve(
+        self, request: QueryRequest, query_embedding: Optional[List[float]] = None
+    ) -> List[SourceChunk]:
+        top_k = request.top_k or 5
+        if query_embedding is None:
+            query_embedding = await self.embedding_service.aencode_single(request.question)
+
+        rerank = self._rerank_enabled(request)
+        limit = max(top_k, self._rerank_candidates(request)) if rerank else top_k
+        chunks = await self._asearch(request, query_embedding, limit)
+        if not rerank:
+            return chunks
+        return await self.reranker.arerank(
+            request.question, chunks, top_k, self._rerank_budget_ms(request)
+        )
+
+    async def astream_query(
+        self, request: QueryRequest, started: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a ``sources`` event once retrieval finishes, then ``token`` events, then ``done``.
+
+        ``started`` is the ``time.perf_counter()`` at which the request arrived, so the
+        recorded time-to-first-byte/token includes any time spent before this call.
+        """
+        started = started if started is not None else time.perf_counter()
+        cache_version = self._cache_version()
+        query_embedding = await self.embedding_service.aencode_single(request.question)
+        cached = self._cached_answer(request, query_embedding)
+
+        source_chunks = cached.sources if cached else await self.aretrieve(request, query_embedding)
+        self.time_to_first_byte_ms.observe((time.perf_counter() - started) * 1000.0)
+        yield {"event": "sources", "data": [chunk.model_dump() for chunk in source_chunks]}
+
+        first_token_ms = None
+        tokens: List[str] = []
+        answer_stream = (
+            _single(cached.answer) if cached
+            else self.llm_service.astream_response(request.question, source_chunks)
+        )
+        async for token in answer_stream:
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000.0
+                self.time_to_first_token_ms.observe(first_token_ms)
+            tokens.append(token)
+            yield {"event": "token", "data": token}
+
+        if cached is None:
+            response = QueryResponse(
+                answer="".join(tokens).strip(), sources=source_chunks, query=request.question
+            )
+            self._cache_answer(request, query_embedding, response, cache_version)
+
+        yield {
+            "event": "done",
+            "data": {
+                "cached": cached is not None,
+                "time_to_first_token_ms": first_token_ms,
+                "total_ms": (time.perf_counter() - started) * 1000.0,
+            },
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stream_time_to_first_byte_ms": self.time_to_first_byte_ms.snapshot(),
+            "stream_time_to_first_token_ms": self.time_to_first_token_ms.snapshot(),
+            "answer_cache": self.answer_cache.stats() if self.answer_cache else None,
+            "lexical_index": self.lexical_index.stats() if self.lexical_index else None,
+            "reranker": self.reranker.stats() if self.reranker else None,
+        }
+
+    def _fusion_weights(self, request: QueryRequest) -> Tuple[float, float]:
+        dense_weight = (
+            request.dense_weight if request.dense_weight is not None
+            else settings.hybrid_dense_weight
+        )
+        if self.lexical_index is None:
+            return dense_weight, 0.0
+        lexical_weight = (
+            request.lexical_weight if request.lexical_weight is not None
+            else settings.hybrid_lexical_weight
+        )
+        return dense_weight, lexical_weight
+
+    def _search(
+        self, request: QueryRequest, query_embedding: List[float], limit: int
+    ) -> List[SourceChunk]:
+        dense_weight, lexical_weight = self._fusion_weights(request)
+        if not lexical_weight:
+            return self.vector_store.search(
+                query_embedding=query_embedding,
+                top_k=limit,
+                filters=request.filters,
+            )
+
+        candidates = limit * settings.hybrid_candidates
+        dense = (
+            self.vector_store.search(query_embedding, candidates, request.filters)
+            if dense_weight else []
+        )
+        lexical = self._lexical_search(request, candidates)
+        return self._fuse(dense, lexical, dense_weight, lexical_weight, limit)
+
+    async def _asearch(
+        self, request: QueryRequest, query_embedding: List[float], limit: int
+    ) -> List[SourceChunk]:
+        dense_weight, lexical_weight = self._fusion_weights(request)
+        if not lexical_weight:
+            return await self.vector_store.asearch(
+                query_embedding=query_embedding,
+                top_k=limit,
+                filters=request.filters,
+            )
+
+        # Dense search awaits the vector store while BM25 scoring runs in a thread.
+        candidates = limit * settings.hybrid_candidates
+        lexical_task = asyncio.create_task(
+            asyncio.to_thread(self._lexical_search, request, candidates)
+        )
+        dense = (
+            await self.vector_store.asearch(query_embedding, candidates, request.filters)
+            if dense_weight else []
+        )
+        lexical = await lexical_task
+        return self._fuse(dense, lexical, dense_weight, lexical_weight, limit)
+
+    def _rerank_enabled(self, request: QueryRequest) -> bool:
+        return self.reranker is not None and request.rerank is not False
+
+    @staticmethod
+    def _rerank_candidates(request: QueryRequest) -> int:
+        return request.rerank_candidates or settings.reranker_candidates
+
+    @staticmethod
+    def _rerank_budget_ms(request: QueryRequest) -> float:
+        return request.rerank_budget_ms or settings.reranker_budget_ms
+
+    def _lexical_search(self, request: QueryRequest, limit: int) -> List[SourceChunk]:
+        conditions = parse_filters(request.filters)
+        # Filters are applied to payloads after BM25 ranking, so over-fetch when filtering.
+        hits = self.lexical_index.search(request.question, limit * 4 if conditions else limit)
+        chunks = self.vector_store.retrieve([point_id for point_id, _ in hits])
+
+        results = []
+        for point_id, score in hits:
+            chunk = chunks.get(point_id)
+            if chunk is None:
+                continue
+            payload = {"content": chunk.content, "source": chunk.source, **chunk.metadata}
+            if payload_matches(payload, conditions):
+                results.append(chunk.model_copy(update={"score": score}))
+                if len(results) == limit:
+                    break
+        return results
+
+    @staticmethod
+    def _fuse(
+        dense: List[SourceChunk],
+        lexical: List[SourceChunk],
+        dense_weight: float,
+        lexical_weight: float,
+        top_k: int,
+    ) -> List[SourceChunk]:
+        """Reciprocal rank fusion of both result lists; scores become the fused RRF scores."""
+        chunks: Dict[str, SourceChunk] = {}
+        rankings = []
+        for results, weight in ((dense, dense_weight), (lexical, lexical_weight)):
+            ids = []
+            for chunk in results:
+                point_id = point_id_for(
+                    Document(content=chunk.content, source=chunk.source, metadata=chunk.metadata)
+                )
+                chunks.setdefault(point_id, chunk)
+                ids.append(point_id)
+            rankings.append((ids, weight))
+
+        fused = reciprocal_rank_fusion(rankings, k=settings.hybrid_rrf_k)[:top_k]
+        return [chunks[point_id].model_copy(update={"score": score}) for point_id, score in fused]
+
+    def _cache_scope(self, request: QueryRequest) -> str:
+        dense_weight, lexical_weight = self._fusion_weights(request)
+        rerank = self._rerank_enabled(request)
+        return SemanticAnswerCache.scope(
+            request.filters,
+            request.top_k or 5,
+            dense_weight=dense_weight,
+            lexical_weight=lexical_weight,
+            rerank_candidates=self._rerank_candidates(request) if rerank else None,
+        )
+
+    def _cache_version(self) -> int:
+        return self.answer_cache.current_version() if self.answer_cache else 0
+
+    def _cached_answer(
+        self, request: QueryRequest, query_embedding: List[float]
+    ) -> Optional[QueryResponse]:
+        if self.answer_cache is None:
+            return None
+        scope = self._cache_scope(request)
+        cached = self.answer_cache.get(query_embedding, scope)
+        return cached.model_copy(update={"query": request.question}) if cached else None
+
+    def _cache_answer(
+        self,
+        request: QueryRequest,
+        query_embedding: List[float],
+        response: QueryResponse,
+        version: int,
+    ) -> None:
+        if self.answer_cache is None:
+            return
+        scope = self._cache_scope(request)
+        self.answer_cache.put(query_embedding, scope, response, version)
+
 
+async def _single(text: str) -> AsyncIterator[str]:
+    yield text
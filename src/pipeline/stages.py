@@ -0,0 +1,66 @@
+from typing import Iterable, Iterator, List, TypeVar
+import queue
+import threading
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _StageError:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def run_in_background(items: Iterable[T], maxsize: int = 4, name: str = "stage") -> Iterator[T]:
+    """Drain ``items`` on a background thread, handing results over through a bounded queue.
+
+    Chaining these lets parsing, embedding and writing overlap while the queue bound
+    applies backpressure: a stage blocks once ``maxsize`` results are waiting. Errors
+    raised by the producer are re-raised in the consumer, and closing the returned
+    iterator early stops the producer.
+    """
+    handoff: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stopped.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_StageError(e))
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,334 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+import numpy as np
+from src.config import settings
+from src.models import Document, SourceChunk
+from src.services.filters import PAYLOAD_INDEX_TYPES, Condition
+
+if TYPE_CHECKING:
+    from src.services.document_store import DocumentStore
+
+logger = logging.getLogger(__name__)
+
+Embeddings = Union[np.ndarray, List[List[float]]]
+
+# With a document store, metadata values whose JSON encoding reaches this size are left
+# out of the payload; smaller ones stay so they can still be filtered on.
+_SLIM_PAYLOAD_MAX_BYTES = 256
+
+POINT_ID_NAMESPACE = uuid.UUID("6f1d3c2a-8a4e-5b7f-9c10-2d3e4f5a6b7c")
+
+
+def point_id_for(document: Document, source_key: Optional[str] = None) -> str:
+    """Content-addressed point ID: the same chunk of the same source always maps to one point.
+
+    Ingestion runs pass their manifest key as ``source_key``, so sources that share a
+    name but not a key never share points.
+    """
+    content_hash = hashlib.sha256(document.content.encode("utf-8")).hexdigest()
+    chunk_index = document.metadata.get("chunk_index", 0)
+    identity = f"{document.source}\x1f{chunk_index}\x1f{content_hash}"
+    if source_key:
+        identity = f"{source_key}\x1f{identity}"
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, identity))
+
+
+class BaseVectorStore(ABC):
+    """Batched, concurrent upserts and the query interface shared by every backend.
+
+    Backends implement the collection lifecycle, ``_upsert_batch``, ``delete_points``,
+    ``retrieve``, ``search`` and ``_create_payload_index``. Scores are cosine
+    similarities and filters follow ``src.services.filters``. ``payload_indexes`` maps
+    payload fields to an index type (``keyword``, ``integer`` or ``datetime``); backends
+    create them in ``initialize_collection`` and use them to narrow filtered searches.
+
+    With a ``document_store``, payloads keep ``doc_id`` (the point ID), the indexed
+    fields and every small metadata value, so filters keep working; content and bulky
+    metadata live in the document store and are fetched in one batch per search.
+    Filtering on a field that was left out of some payloads logs a warning.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = settings.qdrant_collection_name,
+        upsert_batch_size: int = settings.upsert_batch_size,
+        upsert_workers: int = settings.upsert_workers,
+        upsert_wait: bool = settings.upsert_wait,
+        payload_indexes: Optional[Dict[str, str]] = None,
+        document_store: Optional["DocumentStore"] = None,
+    ) -> None:
+        payload_indexes = settings.payload_indexes if payload_indexes is None else payload_indexes
+        for field_name, schema in payload_indexes.items():
+            _check_index_type(field_name, schema)
+        self.collection_name = collection_name
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_workers = upsert_workers
+        self.upsert_wait = upsert_wait
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=upsert_workers, thread_name_prefix="upsert"
+        )
+        self._stats_lock = threading.Lock()
+        self.points_written = 0
+        self.last_upsert: Dict[str, Any] = {}
+        self.payload_indexes: Dict[str, str] = dict(payload_indexes)
+        self.document_store = document_store
+        self.filtered_searches = 0
+        self.unindexed_filters: Dict[str, int] = {}
+        self.slimmed_fields: Dict[str, bool] = {}
+
+    @abstractmethod
+    def initialize_collection(self, vector_size: int) -> None:
+        pass
+
+    @abstractmethod
+    def delete_points(self, point_ids: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = settings.retrieval_top_k,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SourceChunk]:
+        pass
+
+    @abstractmethod
+    def retrieve(self, point_ids: List[str]) -> Dict[str, SourceChunk]:
+        """Payloads of the given points, keyed by point ID; unknown IDs are left out."""
+
+    @abstractmethod
+    def delete_collection(self) -> None:
+        pass
+
+    @abstractmethod
+    def _create_payload_index(self, field_name: str, schema: str) -> None:
+        pass
+
+    @abstractmethod
+    def _upsert_batch(
+        self, documents: List[Document], embeddings: Embeddings, point_ids: List[str], wait: bool
+    ) -> int:
+        """Write one batch and return the number of points written."""
+
+    def store_documents(
+        self,
+        documents: List[Document],
+        embeddings: Embeddings,
+        wait: Optional[bool] = None,
+        point_ids: Optional[List[str]] = None,
+    ) -> int:
+        """Upsert documents in batches spread over the upload workers and wait for the requests.
+
+        With ``wait=False`` the backend may acknowledge a batch before applying it; call
+        ``flush()`` afterwards when the points must be searchable.
+        """
+        started = time.perf_counter()
+        for future in self.submit_documents(documents, embeddings, wait=wait, point_ids=point_ids):
+            future.result()
+        elapsed = time.perf_counter() - started
+
+        rate = len(documents) / elapsed if elapsed > 0 else 0.0
+        self.last_upsert = {"points": len(documents), "seconds": elapsed, "points_per_second": rate}
+        logger.info(f"Upserted {len(documents)} points in {elapsed:.2f}s ({rate:.0f} points/s)")
+        return len(documents)
+
+    def submit_documents(
+        self,
+        documents: List[Document],
+        embeddings: Embeddings,
+        wait: Optional[bool] = None,
+        point_ids: Optional[List[str]] = None,
+    ) -> List[Future]:
+        """Queue batched upserts on the upload workers without blocking.
+
+        Returns one future per batch, each resolving to the number of points it wrote.
+        ``point_ids`` defaults to ``point_id_for`` of each document.
+        """
+        if len(documents) != len(embeddings):
+            raise ValueError("Documents and embeddings must have the same length")
+        if point_ids is None:
+            point_ids = [point_id_for(document) for document in documents]
+        elif len(point_ids) != len(documents):
+            raise ValueError("Documents and point IDs must have the same length")
+
+        wait = self.upsert_wait if wait is None else wait
+        return [
+            self._upsert_executor.submit(
+                self._write_batch,
+                documents[start:start + self.upsert_batch_size],
+                embeddings[start:start + self.upsert_batch_size],
+                point_ids[start:start + self.upsert_batch_size],
+                wait,
+            )
+            for start in range(0, len(documents), self.upsert_batch_size)
+        ]
+
+    async def astore_documents(
+        self,
+        documents: List[Document],
+        embeddings: Embeddings,
+        wait: Optional[bool] = None,
+        point_ids: Optional[List[str]] = None,
+    ) -> int:
+        return await asyncio.to_thread(self.store_documents, documents, embeddings, wait, point_ids)
+
+    async def asearch(
+        self,
+        query_embedding: List[float],
+        top_k: int = settings.retrieval_top_k,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SourceChunk]:
+        """Async variant; backends without a native async client search in a thread."""
+        return await asyncio.to_thread(self.search, query_embedding, top_k, filters)
+
+    def flush(self) -> None:
+        """Barrier for ``wait=False`` writes; a no-op for backends that apply writes synchronously."""
+
+    def create_payload_index(self, field_name: str, schema: str) -> None:
+        """Index a payload field for filtering; a no-op when it is already indexed that way."""
+        _check_index_type(field_name, schema)
+        if self.payload_indexes.get(field_name) == schema:
+            return
+        self._create_payload_index(field_name, schema)
+        self.payload_indexes[field_name] = schema
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            unindexed_filters = dict(self.unindexed_filters)
+        return {
+            "backend": type(self).__name__,
+            "collection": self.collection_name,
+            "points_written": self.points_written,
+            "upsert_batch_size": self.upsert_batch_size,
+            "upsert_workers": self.upsert_workers,
+            "last_upsert": self.last_upsert,
+            "payload_indexes": dict(self.payload_indexes),
+            "filtered_searches": self.filtered_searches,
+            "unindexed_filters": unindexed_filters,
+            "document_store": self.document_store.stats() if self.document_store else None,
+        }
+
+    def _record_written(self, count: int) -> None:
+        with self._stats_lock:
+            self.points_written += count
+
+    def _record_filters(self, conditions: List[Condition]) -> None:
+        """Count filtered searches and, per payload field, those filtering without an index."""
+        if not conditions:
+            return
+        unindexed = {condition.key for condition in conditions} - self.payload_indexes.keys()
+        with self._stats_lock:
+            self.filtered_searches += 1
+            for field_name in unindexed:
+                if field_name not in self.unindexed_filters:
+                    logger.warning(
+                        f"Filtering {self.collection_name} on unindexed payload field {field_name!r}"
+                    )
+                self.unindexed_filters[field_name] = self.unindexed_filters.get(field_name, 0) + 1
+            for condition in conditions:
+                if self.slimmed_fields.get(condition.key) is False:
+                    self.slimmed_fields[condition.key] = True
+                    logger.warning(
+                        f"Filtering {self.collection_name} on {condition.key!r}, which was too "
+                        f"large to keep in some payloads; those points never match"
+                    )
+
+    def _build_payload(self, document: Document, point_id: str) -> Dict[str, Any]:
+        payload = {
+            "content": document.content,
+            "source": document.source,
+            **document.metadata,
+        }
+        if self.document_store is None:
+            return payload
+        slim = {"doc_id": point_id, "source": document.source}
+        for key, value in document.metadata.items():
+            if key in self.payload_indexes or len(json.dumps(value, default=str)) < _SLIM_PAYLOAD_MAX_BYTES:
+                slim[key] = value
+            elif key not in self.slimmed_fields:
+                # False until a filter on the field has been warned about.
+                with self._stats_lock:
+                    self.slimmed_fields.setdefault(key, False)
+        return slim
+
+    def _write_batch(
+        self, documents: List[Document], embeddings: Embeddings, point_ids: List[str], wait: bool
+    ) -> int:
+        # Text is stored only once its points are written, so a failed upsert leaves no
+        # orphaned documents behind.
+        written = self._upsert_batch(documents, embeddings, point_ids, wait)
+        self._store_contents(documents, point_ids)
+        return written
+
+    def _store_contents(self, documents: List[Document], point_ids: List[str]) -> None:
+        if self.document_store is not None:
+            self.document_store.put(documents, point_ids)
+
+    def _forget_contents(self, point_ids: List[str]) -> None:
+        if self.document_store is not None:
+            self.document_store.delete(point_ids)
+
+    def _hydrate(self, payloads: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Full payloads for slim ones, fetched from the document store in one batch.
+
+        Payloads written without a document store pass through unchanged; slim payloads
+        whose document is missing, including points whose text is still being stored,
+        come back as None.
+        """
+        doc_ids = [payload["doc_id"] for payload in payloads if "doc_id" in payload]
+        if not doc_ids or self.document_store is None:
+            return list(payloads)
+        stored = self.document_store.get(doc_ids)
+        hydrated: List[Optional[Dict[str, Any]]] = []
+        for payload in payloads:
+            if "doc_id" not in payload:
+                hydrated.append(payload)
+                continue
+            document = stored.get(payload["doc_id"])
+            if document is None:
+                logger.warning(f"Point {payload['doc_id']} has no stored document")
+                hydrated.append(None)
+                continue
+            content, source, metadata = document
+            hydrated.append({"content": content, "source": source, **metadata})
+        return hydrated
+
+    def _to_source_chunks(
+        self, hits: List[Tuple[Dict[str, Any], Optional[float]]]
+    ) -> List[SourceChunk]:
+        payloads = self._hydrate([payload for payload, _ in hits])
+        return [
+            self._to_source_chunk(payload, score)
+            for payload, (_, score) in zip(payloads, hits)
+            if payload is not None
+        ]
+
+    @staticmethod
+    def _to_source_chunk(payload: Dict[str, Any], score: Optional[float]) -> SourceChunk:
+        return SourceChunk(
+            content=payload.get("content", ""),
+            score=float(score) if score is not None else 0.0,
+            source=payload.get("source", "unknown"),
+            metadata={
+                k: v
+                for k, v in payload.items()
+                if k not in ["content", "source"]
+            },
+        )
+
+
+def _check_index_type(field_name: str, schema: str) -> None:
+    if schema not in PAYLOAD_INDEX_TYPES:
+        raise ValueError(
+            f"Unknown payload index type {schema!r} for {field_name!r}. "
+            f"Supported: {list(PAYLOAD_INDEX_TYPES)}"
+        )
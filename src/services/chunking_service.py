@@ -1,24 +1,187 @@
-from typing import List
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import bisect
+import heapq
 import logging
+import multiprocessing
+import re
+import time
+import numpy as np
 from src.models import Document
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+CHUNKING_MODES = ("characters", "tokens")
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a line break.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n\s*")
+# Long documents are tokenized as whitespace-delimited segments of about this many
+# characters, so the tokenizer's batch encoding spreads one document over its threads.
+_SEGMENT_CHARS = 16384
+# Shards per worker: a few more shards than workers evens out the tail.
+_SHARDS_PER_WORKER = 2
+
+# The worker process's own in-process ChunkingService, set by _init_worker.
+_worker_service: Optional["ChunkingService"] = None
+
 
 class ChunkingService:
+    """Splits documents into overlapping chunks.
+
+    ``characters`` mode cuts every ``chunk_size`` characters, backing up to the last
+    period or newline. ``tokens`` mode measures chunks in the embedding model's tokens:
+    documents are tokenized in one batched call of a fast tokenizer, whose offset
+    mapping turns sentence boundaries into token positions. Chunks are packed with
+    whole sentences up to ``max_tokens`` (falling back to word and then token
+    boundaries for overlong sentences), so every chunk fits the model's sequence
+    limit, and consecutive chunks overlap by up to ``chunk_overlap_tokens`` tokens.
+
+    Either mode first computes chunk boundaries as an integer array per document
+    (``start, end[, tokens]`` rows, None for a document kept whole). With ``workers``
+    above 1, batches of at least ``parallel_min_chars`` characters are split into
+    size-balanced shards and their boundaries computed in a process pool; only the
+    text goes out and only the arrays come back. ``Document`` objects are built in
+    input order in the calling process.
+    """
+
     def __init__(
-        self, chunk_size: int = settings.chunk_size, chunk_overlap: int = settings.chunk_overlap
+        self,
+        chunk_size: int = settings.chunk_size,
+        chunk_overlap: int = settings.chunk_overlap,
+        mode: str = settings.chunking_mode,
+        tokenizer: Optional[Any] = None,
+        max_tokens: Optional[int] = None,
+        chunk_overlap_tokens: int = settings.chunk_overlap_tokens,
+        workers: int = settings.chunking_workers,
+        parallel_min_chars: int = settings.chunking_parallel_min_chars,
     ) -> None:
+        if mode not in CHUNKING_MODES:
+            raise ValueError(f"Unknown chunking mode: {mode}. Supported: {list(CHUNKING_MODES)}")
+        if mode == "tokens":
+            if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+                raise ValueError("Token chunking needs a fast tokenizer with offset mapping")
+            if not max_tokens or max_tokens <= 0:
+                raise ValueError("Token chunking needs max_tokens")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.mode = mode
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.chunk_overlap_tokens = min(chunk_overlap_tokens, (max_tokens or 0) // 2)
+        self.workers = workers
+        self.parallel_min_chars = parallel_min_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.documents_chunked = 0
+        self.chunks_created = 0
+        self.characters_chunked = 0
+        self.seconds = 0.0
 
     def chunk_document(self, document: Document) -> List[Document]:
-        content = document.content
-        if len(content) <= self.chunk_size:
+        return self._build_chunks(document, self._spans([document.content])[0])
+
+    def chunk_documents(self, documents: List[Document]) -> List[Document]:
+        started = time.perf_counter()
+        contents = [document.content for document in documents]
+        characters = sum(len(content) for content in contents)
+        parallel = self.workers > 1 and len(documents) > 1 and characters >= self.parallel_min_chars
+        spans = self._parallel_spans(contents) if parallel else self._spans(contents)
+
+        all_chunks = []
+        for document, document_spans in zip(documents, spans):
+            all_chunks.extend(self._build_chunks(document, document_spans))
+
+        elapsed = time.perf_counter() - started
+        self.documents_chunked += len(documents)
+        self.chunks_created += len(all_chunks)
+        self.characters_chunked += characters
+        self.seconds += elapsed
+        logger.info(
+            f"Chunked {len(documents)} documents ({characters / 1e6:.1f}M chars) into "
+            f"{len(all_chunks)} chunks in {elapsed:.2f}s"
+            f"{f' on {self.workers} workers' if parallel else ''}; "
+            f"{self.documents_chunked} documents, {self.chunks_created} chunks so far"
+        )
+        return all_chunks
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "documents_chunked": self.documents_chunked,
+            "chunks_created": self.chunks_created,
+            "characters_per_second": self.characters_chunked / self.seconds if self.seconds else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _parallel_spans(self, contents: List[str]) -> List[Optional[np.ndarray]]:
+        if self._pool is None:
+            # spawn: forking a process that already runs threads (uvicorn, job workers,
+            # the tokenizer's own pool) can deadlock the child.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._worker_config(),),
+            )
+        shards = _balanced_shards([len(content) for content in contents], self.workers * _SHARDS_PER_WORKER)
+        results = self._pool.map(_chunk_shard, [[contents[i] for i in shard] for shard in shards])
+
+        spans: List[Optional[np.ndarray]] = [None] * len(contents)
+        for shard, shard_spans in zip(shards, results):
+            for index, document_spans in zip(shard, shard_spans):
+                spans[index] = document_spans
+        return spans
+
+    def _worker_config(self) -> Dict[str, Any]:
+        return {
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "mode": self.mode,
+            "tokenizer": self.tokenizer,
+            "max_tokens": self.max_tokens,
+            "chunk_overlap_tokens": self.chunk_overlap_tokens,
+            "workers": 0,
+        }
+
+    def _spans(self, contents: List[str]) -> List[Optional[np.ndarray]]:
+        if self.mode == "tokens":
+            return self._token_spans(contents)
+        return [self._character_spans(content) for content in contents]
+
+    def _build_chunks(self, document: Document, spans: Optional[np.ndarray]) -> List[Document]:
+        if spans is None:
             return [document]
 
+        content = document.content
         chunks = []
+        for index, row in enumerate(spans.tolist()):
+            start, end = row[0], row[1]
+            chunk_metadata = document.metadata.copy()
+            chunk_metadata["chunk_index"] = index
+            chunk_metadata["chunk_start"] = start
+            chunk_metadata["chunk_end"] = end
+            if len(row) > 2:
+                chunk_metadata["chunk_tokens"] = row[2]
+            chunk_content = content[start:end]
+            chunks.append(
+                Document(
+                    content=chunk_content.strip() if self.mode == "characters" else chunk_content,
+                    metadata=chunk_metadata,
+                    source=document.source,
+                )
+            )
+        return chunks
+
+    def _character_spans(self, content: str) -> Optional[np.ndarray]:
+        if len(content) <= self.chunk_size:
+            return None
+
+        spans = []
         start = 0
         content_length = len(content)
 
@@ -32,20 +195,8 @@ class ChunkingService:
                 if last_period > start or last_newline > start:
                     end = max(last_period + 1, last_newline + 1)
 
-            chunk_content = content[start:end].strip()
-            if chunk_content:
-                chunk_metadata = document.metadata.copy()
-                chunk_metadata["chunk_index"] = len(chunks)
-                chunk_metadata["chunk_start"] = start
-                chunk_metadata["chunk_end"] = end
-
-                chunks.append(
-                    Document(
-                        content=chunk_content,
-                        metadata=chunk_metadata,
-                        source=document.source,
-                    )
-                )
+            if not content[start:end].isspace():
+                spans.append((start, end))
 
             new_start = end - self.chunk_overlap
             if new_start <= start:
@@ -55,15 +206,123 @@ class ChunkingService:
             if start >= content_length:
                 break
 
-        return chunks
+        return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+    def _token_spans(self, contents: List[str]) -> List[Optional[np.ndarray]]:
+        if not contents:
+            return []
+        segments = []
+        owners = []
+        for index, content in enumerate(contents):
+            for start, end in _segments(content):
+                segments.append(content[start:end])
+                owners.append((index, start))
+        encodings = self.tokenizer(
+            segments,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False,
+        )
+
+        parts: List[List[np.ndarray]] = [[] for _ in contents]
+        for (index, base), offsets in zip(owners, encodings["offset_mapping"]):
+            parts[index].append(np.asarray(offsets, dtype=np.int64).reshape(-1, 2) + base)
+        return [
+            self._split_tokens(content, np.concatenate(content_parts))
+            for content, content_parts in zip(contents, parts)
+        ]
+
+    def _split_tokens(self, content: str, offsets: np.ndarray) -> Optional[np.ndarray]:
+        count = len(offsets)
+        if count <= self.max_tokens:
+            return None
+
+        starts = offsets[:, 0]
+        # A token begins a word when whitespace separates it from the previous token.
+        word_starts = np.flatnonzero(np.r_[True, starts[1:] > offsets[:-1, 1]]).tolist()
+        breaks = [match.end() for match in _SENTENCE_BREAK.finditer(content)]
+        sentence_starts = np.unique(np.searchsorted(starts, breaks)).tolist()
+
+        token_spans = []
+        start = 0
+        while start < count:
+            end = count
+            if start + self.max_tokens < count:
+                limit = start + self.max_tokens
+                end = (
+                    _last_in(sentence_starts, start, limit)
+                    or _last_in(word_starts, start, limit)
+                    or limit
+                )
+            token_spans.append((start, end))
+            if end >= count:
+                break
+
+            # Start the next chunk on the earliest sentence (or word) inside the overlap.
+            overlap_start = max(end - self.chunk_overlap_tokens, start + 1)
+            start = (
+                _first_in(sentence_starts, overlap_start, end)
+                or _first_in(word_starts, overlap_start, end)
+                or end
+            )
+
+        token_spans = np.array(token_spans, dtype=np.int64)
+        return np.column_stack((
+            starts[token_spans[:, 0]],
+            offsets[token_spans[:, 1] - 1, 1],
+            token_spans[:, 1] - token_spans[:, 0],
+        ))
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    global _worker_service
+    _worker_service = ChunkingService(**config)
+
+
+def _chunk_shard(contents: List[str]) -> List[Optional[np.ndarray]]:
+    return _worker_service._spans(contents)
+
+
+def _balanced_shards(sizes: List[int], count: int) -> List[List[int]]:
+    """Split indices into ``count`` shards of similar total size, each in input order.
+
+    Largest first onto the lightest shard (LPT), so one big document does not end up
+    next to many others.
+    """
+    count = max(1, min(count, len(sizes)))
+    heap = [(0, shard) for shard in range(count)]
+    shards: List[List[int]] = [[] for _ in range(count)]
+    for index in sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True):
+        load, shard = heapq.heappop(heap)
+        shards[shard].append(index)
+        heapq.heappush(heap, (load + sizes[index], shard))
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _segments(content: str) -> List[tuple]:
+    """``(start, end)`` spans covering ``content``, cut at whitespace where possible."""
+    spans = []
+    start = 0
+    while len(content) - start > _SEGMENT_CHARS:
+        limit = start + _SEGMENT_CHARS
+        end = max(content.rfind(" ", start, limit), content.rfind("\n", start, limit))
+        if end <= start:
+            end = limit
+        spans.append((start, end))
+        start = end
+    spans.append((start, len(content)))
+    return spans
+
+
+def _last_in(positions: List[int], low: int, high: int) -> Optional[int]:
+    """The largest position in ``(low, high]``, if any."""
+    index = bisect.bisect_right(positions, high) - 1
+    return positions[index] if index >= 0 and positions[index] > low else None
 
-    def chunk_documents(self, documents: List[Document]) -> List[Document]:
-        logger.info(f"Chunking {len(documents)} documents (chunk_size={self.chunk_size}, overlap={self.chunk_overlap})")
-        all_chunks = []
-        for i, document in enumerate(documents, 1):
-            chunks = self.chunk_document(document)
-            all_chunks.extend(chunks)
-            logger.info(f"Document {i}/{len(documents)}: created {len(chunks)} chunks")
-        logger.info(f"Chunking complete: {len(all_chunks)} total chunks")
-        return all_chunks
 
+def _first_in(positions: List[int], low: int, high: int) -> Optional[int]:
+    """The smallest position in ``[low, high)``, if any."""
+    index = bisect.bisect_left(positions, low)
+    return positions[index] if index < len(positions) and positions[index] < high else None
@@ -0,0 +1,228 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter, OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from src.models import Document
+from src.services.base_vector_store import point_id_for
+
+_SQLITE_MAX_PARAMS = 500
+# Metadata values whose JSON encoding reaches this size (column lists, SQL queries,
+# per-source user metadata) are stored once per distinct combination when they repeat.
+_SHARED_MIN_BYTES = 32
+_SHARED_CACHE_SIZE = 4096
+
+
+class DocumentStore:
+    """Compressed chunk text and metadata keyed by vector-store point ID.
+
+    Lets vector payloads carry only what filters need. Each document row holds its
+    zlib-compressed content and per-chunk metadata; bulky metadata values that repeat
+    across a batch are split off into a ``shared`` row keyed by content hash, so a
+    column list or SQL query repeated on every row of a source is stored once, and
+    removed once no document refers to it after a replace or delete. Bulky values
+    unique to one chunk, such as a section path, stay inline.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                point_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                shared INTEGER,
+                data BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS shared (
+                id INTEGER PRIMARY KEY,
+                hash BLOB NOT NULL UNIQUE,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_shared ON documents (shared);
+            """
+        )
+        self._shared_ids: "OrderedDict[bytes, int]" = OrderedDict()
+        self._shared_values: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+    def put(self, documents: Iterable[Document], point_ids: Optional[Iterable[str]] = None) -> int:
+        """Store (or replace) documents; returns how many were written.
+
+        ``point_ids`` defaults to ``point_id_for`` of each document.
+        """
+        documents = list(documents)
+        if point_ids is None:
+            point_ids = [point_id_for(document) for document in documents]
+        bulky = [_bulky_values(document.metadata) for document in documents]
+        repeats = Counter(item for values in bulky for item in values.items())
+        rows = []
+        shared_blobs: Dict[bytes, bytes] = {}
+        for document, point_id, values in zip(documents, point_ids, bulky):
+            shared_keys = {key for key, encoded in values.items() if repeats[key, encoded] > 1}
+            own = {k: v for k, v in document.metadata.items() if k not in shared_keys}
+            shared = {k: v for k, v in document.metadata.items() if k in shared_keys}
+            shared_hash = None
+            if shared:
+                encoded = json.dumps(shared, sort_keys=True, default=str).encode("utf-8")
+                shared_hash = hashlib.blake2b(encoded, digest_size=16).digest()
+                shared_blobs.setdefault(shared_hash, encoded)
+            data = json.dumps({"content": document.content, "metadata": own}, default=str)
+            rows.append((
+                point_id,
+                document.source,
+                shared_hash,
+                self._compress(data.encode("utf-8")),
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                replaced = self._shared_ids_of([row[0] for row in rows])
+                shared_ids = {
+                    shared_hash: self._shared_id(shared_hash, encoded)
+                    for shared_hash, encoded in shared_blobs.items()
+                }
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO documents (point_id, source, shared, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (point_id, source, shared_ids.get(shared_hash), data)
+                        for point_id, source, shared_hash, data in rows
+                    ],
+                )
+                removed = self._drop_unreferenced(replaced - set(shared_ids.values()))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                self._shared_ids.clear()
+                raise
+            if removed:
+                self._shared_ids.clear()
+                self._shared_values.clear()
+        return len(rows)
+
+    def get(self, point_ids: List[str]) -> Dict[str, Tuple[str, str, Dict[str, Any]]]:
+        """``(content, source, metadata)`` per known point ID."""
+        results: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+        unique_ids = list(dict.fromkeys(point_ids))
+        with self._lock:
+            for start in range(0, len(unique_ids), _SQLITE_MAX_PARAMS):
+                batch = unique_ids[start:start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                for point_id, source, shared_id, data in self._db.execute(
+                    f"SELECT point_id, source, shared, data FROM documents "
+                    f"WHERE point_id IN ({placeholders})",
+                    batch,
+                ):
+                    document = json.loads(zlib.decompress(data))
+                    metadata = dict(self._shared(shared_id)) if shared_id is not None else {}
+                    metadata.update(document["metadata"])
+                    results[point_id] = (document["content"], source, metadata)
+        return results
+
+    def delete(self, point_ids: List[str]) -> None:
+        """Drop documents; shared metadata no longer referenced is removed with them."""
+        if not point_ids:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                shared_ids = self._shared_ids_of(point_ids)
+                for start in range(0, len(point_ids), _SQLITE_MAX_PARAMS):
+                    batch = point_ids[start:start + _SQLITE_MAX_PARAMS]
+                    placeholders = ",".join("?" * len(batch))
+                    self._db.execute(f"DELETE FROM documents WHERE point_id IN ({placeholders})", batch)
+                self._drop_unreferenced(shared_ids)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._shared_ids.clear()
+            self._shared_values.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            documents = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            shared = self._db.execute("SELECT COUNT(*) FROM shared").fetchone()[0]
+            page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "documents": documents,
+            "shared_metadata_entries": shared,
+            "database_bytes": page_count * page_size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _shared_ids_of(self, point_ids: List[str]) -> Set[int]:
+        shared_ids: Set[int] = set()
+        for start in range(0, len(point_ids), _SQLITE_MAX_PARAMS):
+            batch = point_ids[start:start + _SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            shared_ids.update(
+                shared_id for (shared_id,) in self._db.execute(
+                    f"SELECT DISTINCT shared FROM documents "
+                    f"WHERE point_id IN ({placeholders}) AND shared IS NOT NULL",
+                    batch,
+                )
+            )
+        return shared_ids
+
+    def _drop_unreferenced(self, shared_ids: Set[int]) -> int:
+        """Delete the given shared rows that no document refers to any more."""
+        removed = 0
+        for shared_id in shared_ids:
+            removed += self._db.execute(
+                "DELETE FROM shared WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM documents WHERE shared = ?)",
+                (shared_id, shared_id),
+            ).rowcount
+        return removed
+
+    def _compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.compression_level)
+
+    def _shared_id(self, shared_hash: bytes, encoded: bytes) -> int:
+        shared_id = self._shared_ids.get(shared_hash)
+        if shared_id is None:
+            self._db.execute(
+                "INSERT OR IGNORE INTO shared (hash, data) VALUES (?, ?)",
+                (shared_hash, self._compress(encoded)),
+            )
+            shared_id = self._db.execute(
+                "SELECT id FROM shared WHERE hash = ?", (shared_hash,)
+            ).fetchone()[0]
+            self._shared_ids[shared_hash] = shared_id
+            if len(self._shared_ids) > _SHARED_CACHE_SIZE:
+                self._shared_ids.popitem(last=False)
+        return shared_id
+
+    def _shared(self, shared_id: int) -> Dict[str, Any]:
+        value = self._shared_values.get(shared_id)
+        if value is None:
+            row = self._db.execute("SELECT data FROM shared WHERE id = ?", (shared_id,)).fetchone()
+            value = json.loads(zlib.decompress(row[0])) if row else {}
+            self._shared_values[shared_id] = value
+            if len(self._shared_values) > _SHARED_CACHE_SIZE:
+                self._shared_values.popitem(last=False)
+        return value
+
+
+def _bulky_values(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """JSON encodings of the metadata values large enough to be worth sharing."""
+    encoded = {
+        key: json.dumps(value, sort_keys=True, default=str) for key, value in metadata.items()
+    }
+    return {key: text for key, text in encoded.items() if len(text) >= _SHARED_MIN_BYTES}
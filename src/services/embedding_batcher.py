@@ -0,0 +1,107 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+import numpy as np
+from src.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+_PendingItem = Tuple[str, asyncio.Future, float]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text encode calls into batched model calls.
+
+    Texts that arrive within ``max_wait_ms`` of the first queued text (or until
+    ``max_batch_size`` is reached) are encoded together and each caller receives its
+    own row. While ``max_concurrent_batches`` batches are in flight, new arrivals keep
+    queueing, so batches grow under load instead of piling up model calls.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], Awaitable[np.ndarray]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 1,
+    ) -> None:
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_batches = max_concurrent_batches
+
+        self.batch_sizes = Histogram(buckets=[1, 2, 4, 8, 16, 32, 64, 128])
+        self.queue_wait_ms = Histogram(buckets=[0.5, 1, 2, 5, 10, 20, 50, 100, 250])
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+
+    async def encode(self, text: str) -> np.ndarray:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._inflight = asyncio.Semaphore(self.max_concurrent_batches)
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._inflight.acquire()
+            # Requests that arrived while we waited for a free slot ride along too.
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[_PendingItem]) -> None:
+        try:
+            dispatched_at = time.perf_counter()
+            live = [item for item in batch if not item[1].cancelled()]
+            if not live:
+                return
+            self.batch_sizes.observe(len(live))
+            for _, _, enqueued_at in live:
+                self.queue_wait_ms.observe((dispatched_at - enqueued_at) * 1000.0)
+
+            try:
+                embeddings = await self.encode_batch([text for text, _, _ in live])
+            except Exception as e:
+                logger.error(f"Batched embedding of {len(live)} texts failed: {e}")
+                for _, future, _ in live:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future, _), embedding in zip(live, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        finally:
+            self._inflight.release()
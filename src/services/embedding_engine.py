@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, for models without a fast tokenizer to measure with.
+_CHARS_PER_TOKEN = 4
+
+# The worker process's own model copy, loaded by _init_worker.
+_worker_model: Optional[Any] = None
+
+
+class EmbeddingEngine:
+    """Encodes large text lists across a pool of processes, each with its own model copy.
+
+    Texts are measured in tokens, sorted by length and cut into buckets whose padded
+    size (texts x longest text) stays within ``max_batch_tokens``, so short texts are
+    not padded to the length of long ones and batch size adapts to a memory budget:
+    many short texts or a few long ones per forward pass. Buckets are dealt to the
+    workers longest first and the vectors put back in input order.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.embedding_model_name,
+        workers: int = settings.embedding_workers,
+        max_batch_tokens: int = settings.embedding_max_batch_tokens,
+        max_batch_size: int = settings.embedding_engine_max_batch_size,
+        tokenizer: Optional[Any] = None,
+        max_seq_length: Optional[int] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.workers = workers
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.tokenizer = tokenizer if getattr(tokenizer, "is_fast", False) else None
+        self.max_seq_length = max_seq_length
+        # Split the cores between workers instead of every worker using all of them.
+        threads = max(1, (os.cpu_count() or 1) // max(workers, 1))
+        # spawn: forking a process that already runs threads can deadlock the child.
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads),
+        )
+        self._lock = threading.Lock()
+        self.vectors = 0
+        self.batches = 0
+        self.tokens = 0
+        self.padded_tokens = 0
+        self.seconds = 0.0
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        started = time.perf_counter()
+        lengths = self.token_lengths(texts)
+        buckets = self.buckets(lengths)
+        # Longest buckets first, so the last ones to finish are the cheap ones.
+        buckets.sort(key=lambda bucket: len(bucket) * lengths[bucket[-1]], reverse=True)
+        futures = [
+            self._pool.submit(_encode_bucket, [texts[i] for i in bucket]) for bucket in buckets
+        ]
+
+        embeddings: Optional[np.ndarray] = None
+        for bucket, future in zip(buckets, futures):
+            vectors = future.result()
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), dtype=vectors.dtype)
+            embeddings[bucket] = vectors
+        if embeddings is None:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.vectors += len(texts)
+            self.batches += len(buckets)
+            self.tokens += int(lengths.sum())
+            self.padded_tokens += sum(len(bucket) * int(lengths[bucket[-1]]) for bucket in buckets)
+            self.seconds += elapsed
+        return embeddings
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        if self.tokenizer is None:
+            lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+            lengths = lengths // _CHARS_PER_TOKEN + 1
+        else:
+            truncation = {"truncation": True, "max_length": self.max_seq_length} if self.max_seq_length else {}
+            encoded = self.tokenizer(
+                texts,
+                **truncation,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+                verbose=False,
+            )
+            lengths = np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts))
+        if self.max_seq_length:
+            # The model truncates at its sequence limit.
+            lengths = np.minimum(lengths, self.max_seq_length)
+        return lengths
+
+    def buckets(self, lengths: np.ndarray) -> List[np.ndarray]:
+        """Input indices grouped shortest first, each group within the padded-token budget."""
+        order = np.argsort(lengths, kind="stable")
+        buckets = []
+        start = 0
+        for end in range(1, len(order) + 1):
+            # Sorted ascending, so the newest text is the longest of the bucket.
+            size = end - start
+            if end < len(order):
+                next_padded = (size + 1) * int(lengths[order[end]])
+                if size < self.max_batch_size and next_padded <= self.max_batch_tokens:
+                    continue
+            buckets.append(order[start:end])
+            start = end
+        return buckets
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "vectors": self.vectors,
+                "batches": self.batches,
+                "vectors_per_second": self.vectors / self.seconds if self.seconds else 0.0,
+                "padding_efficiency": self.tokens / self.padded_tokens if self.padded_tokens else None,
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_bucket(texts: List[str]) -> np.ndarray:
+    return _worker_model.encode(
+        texts, batch_size=len(texts), show_progress_bar=False, convert_to_numpy=True
+    )
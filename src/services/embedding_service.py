@@ -1,27 +1,111 @@
-from typing import List
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
+import asyncio
 import numpy as np
 import logging
 from src.config import settings
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_engine import EmbeddingEngine
+from src.services.query_embedding_cache import QueryEmbeddingCache
 
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingService:
-    def __init__(self, model_name: str = settings.embedding_model_name) -> None:
+    def __init__(
+        self,
+        model_name: str = settings.embedding_model_name,
+        max_workers: int = settings.embedding_max_workers,
+        batching_enabled: bool = settings.embedding_batching_enabled,
+        query_cache_enabled: bool = settings.query_embedding_cache_enabled,
+        workers: int = settings.embedding_workers,
+    ) -> None:
         logger.info(f"Initializing embedding model: {model_name}")
         logger.info("First run will download model (~500MB) - this may take 5-10 minutes")
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name)
         self.dimension = self.model.get_sentence_embedding_dimension()
+        # Inference releases the GIL, so a small thread pool keeps CPU-bound encoding
+        # off the event loop while bounding how many forward passes run at once.
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
+        self.batcher = (
+            EmbeddingBatcher(
+                self.aencode,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_wait_ms,
+                max_concurrent_batches=max_workers,
+            )
+            if batching_enabled
+            else None
+        )
+        self.query_cache = (
+            QueryEmbeddingCache(
+                max_entries=settings.query_embedding_cache_max_entries,
+                ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+            )
+            if query_cache_enabled
+            else None
+        )
+        # Large ingestion batches go to a multi-process, length-bucketed engine; queries
+        # and small batches stay in this process.
+        self.engine: Optional[EmbeddingEngine] = (
+            EmbeddingEngine(
+                model_name=model_name,
+                workers=workers,
+                tokenizer=getattr(self.model, "tokenizer", None),
+                max_seq_length=getattr(self.model, "max_seq_length", None),
+            )
+            if workers > 0
+            else None
+        )
         logger.info(f"Embedding model loaded successfully (dimension: {self.dimension})")
 
     def encode(self, texts: List[str]) -> np.ndarray:
+        if self.engine is not None and len(texts) >= settings.embedding_engine_min_texts:
+            return self.engine.encode(texts)
         return self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
 
     def encode_single(self, text: str) -> List[float]:
+        if self.query_cache is not None:
+            cached = self.query_cache.get(text)
+            if cached is not None:
+                return cached.tolist()
+
         embedding = self.model.encode(text, convert_to_numpy=True)
+        if self.query_cache is not None:
+            self.query_cache.put(text, embedding)
+        return embedding.tolist()
+
+    async def aencode(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.encode, texts)
+
+    async def aencode_single(self, text: str) -> List[float]:
+        if self.query_cache is not None:
+            cached = self.query_cache.get(text)
+            if cached is not None:
+                return cached.tolist()
+
+        if self.batcher is not None:
+            embedding = await self.batcher.encode(text)
+        else:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(
+                self.executor, lambda: self.model.encode(text, convert_to_numpy=True)
+            )
+
+        if self.query_cache is not None:
+            self.query_cache.put(text, embedding)
         return embedding.tolist()
 
     def get_dimension(self) -> int:
         return self.dimension
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "batcher": self.batcher.stats() if self.batcher is not None else None,
+            "query_cache": self.query_cache.stats() if self.query_cache is not None else None,
+            "engine": self.engine.stats() if self.engine is not None else None,
+        }
@@ -0,0 +1,108 @@
+"""Metadata filter semantics shared by the vector-store backends.
+
+A request filter maps a payload key to either an expected value or an operator object,
+e.g. ``{"source": {"$in": ["a.csv", "b.csv"]}, "row_index": {"$gte": 100}}``. A point
+matches when every condition matches. A list-valued payload field matches a positive
+condition when any element does, as in Qdrant, and a negated one (``$ne``, ``$nin``)
+when no element does; negations also match points without the field. Range bounds
+compare numbers, or ISO 8601 datetimes when the bound is a string.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+from datetime import datetime, timezone
+
+OPERATORS = ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte")
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+NEGATED_OPERATORS = ("$ne", "$nin")
+PAYLOAD_INDEX_TYPES = ("keyword", "integer", "datetime")
+
+
+class Condition(NamedTuple):
+    key: str
+    op: str
+    value: Any
+
+
+def parse_filters(filters: Optional[Dict[str, Any]]) -> List[Condition]:
+    if not filters:
+        return []
+    conditions = []
+    for key, value in filters.items():
+        if isinstance(value, dict) and value and all(str(op).startswith("$") for op in value):
+            for op, operand in value.items():
+                conditions.append(_condition(key, op, operand))
+        else:
+            conditions.append(Condition(key, "$eq", value))
+    return conditions
+
+
+def payload_matches(payload: Dict[str, Any], conditions: List[Condition]) -> bool:
+    for condition in conditions:
+        if not condition_matches(payload.get(condition.key), condition):
+            return False
+    return True
+
+
+def condition_matches(actual: Any, condition: Condition) -> bool:
+    op, expected = condition.op, condition.value
+    if op == "$eq":
+        return _value_matches(actual, expected)
+    if op == "$ne":
+        return not _value_matches(actual, expected)
+    if op == "$in":
+        return any(_value_matches(actual, item) for item in expected)
+    if op == "$nin":
+        return not any(_value_matches(actual, item) for item in expected)
+    return _in_range(actual, op, expected)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """An aware datetime for ISO 8601 strings (naive ones are taken as UTC), else None."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _condition(key: str, op: str, operand: Any) -> Condition:
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown filter operator {op!r} for {key!r}. Supported: {list(OPERATORS)}")
+    if op in ("$in", "$nin") and not isinstance(operand, list):
+        raise ValueError(f"Filter operator {op} for {key!r} expects a list")
+    if op in RANGE_OPERATORS and not is_number(operand) and parse_datetime(operand) is None:
+        raise ValueError(f"Filter operator {op} for {key!r} expects a number or an ISO 8601 datetime")
+    return Condition(key, op, operand)
+
+
+def _value_matches(actual: Any, expected: Any) -> bool:
+    if isinstance(actual, list):
+        return any(_value_matches(item, expected) for item in actual)
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        # Keep True distinct from 1, as Qdrant's typed payload index does.
+        return type(actual) is type(expected) and actual == expected
+    return actual == expected
+
+
+def _in_range(actual: Any, op: str, bound: Any) -> bool:
+    if isinstance(actual, list):
+        return any(_in_range(item, op, bound) for item in actual)
+    if is_number(bound):
+        if not is_number(actual):
+            return False
+    else:
+        actual, bound = parse_datetime(actual), parse_datetime(bound)
+        if actual is None:
+            return False
+    if op == "$gt":
+        return actual > bound
+    if op == "$gte":
+        return actual >= bound
+    if op == "$lt":
+        return actual < bound
+    return actual <= bound
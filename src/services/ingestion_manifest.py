@@ -0,0 +1,80 @@
+from typing import Iterable, List, Set
+from pathlib import Path
+import sqlite3
+import threading
+
+
+class IngestionManifest:
+    """Records which point IDs each ingested source produced, per collection.
+
+    ``IngestionPipeline`` diffs a source's new point IDs against this record to skip
+    unchanged chunks and to delete the ones that disappeared. It also keeps a version
+    per collection that every ingestion bumps, so answer caches in other processes
+    can tell when the collection changed.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS manifest (
+                collection TEXT NOT NULL,
+                source_key TEXT NOT NULL,
+                point_id TEXT NOT NULL,
+                PRIMARY KEY (collection, source_key, point_id)
+            ) WITHOUT ROWID
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS versions (
+                collection TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get_point_ids(self, collection: str, source_key: str) -> Set[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT point_id FROM manifest WHERE collection = ? AND source_key = ?",
+                (collection, source_key),
+            )
+            return {row[0] for row in rows}
+
+    def replace(self, collection: str, source_key: str, point_ids: Iterable[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM manifest WHERE collection = ? AND source_key = ?",
+                (collection, source_key),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO manifest (collection, source_key, point_id) VALUES (?, ?, ?)",
+                ((collection, source_key, point_id) for point_id in point_ids),
+            )
+
+    def version(self, collection: str) -> int:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version FROM versions WHERE collection = ?", (collection,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def bump_version(self, collection: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO versions (collection, version) VALUES (?, 1) "
+                "ON CONFLICT (collection) DO UPDATE SET version = version + 1",
+                (collection,),
+            )
+
+    def sources(self, collection: str) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT source_key FROM manifest WHERE collection = ?", (collection,)
+            )
+            return [row[0] for row in rows]
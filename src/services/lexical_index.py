@@ -0,0 +1,354 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import Counter
+from pathlib import Path
+import fcntl
+import logging
+import math
+import re
+import sqlite3
+import threading
+import numpy as np
+from src.models import Document
+from src.services.base_vector_store import point_id_for
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+(?:[-./:@]\w+)*")
+_PART_SEPARATORS = re.compile(r"[-_./:@]+")
+_MAX_SEGMENTS = 32
+_MAX_DEAD_RATIO = 0.25
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded word tokens; compound tokens such as SKUs and paths also yield their parts."""
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text.casefold()):
+        token = match.group()
+        tokens.append(token)
+        parts = _PART_SEPARATORS.split(token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Tuple[Sequence[str], float]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists, each with a weight, by ``sum(weight / (k + rank))``."""
+    scores: Dict[str, float] = {}
+    for ids, weight in rankings:
+        for rank, item in enumerate(ids, 1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+
+
+class _Postings:
+    __slots__ = ("docs", "tfs", "size", "committed")
+
+    def __init__(self, docs: Optional[np.ndarray] = None, tfs: Optional[np.ndarray] = None) -> None:
+        self.docs = docs if docs is not None else np.empty(4, dtype=np.uint32)
+        self.tfs = tfs if tfs is not None else np.empty(4, dtype=np.uint16)
+        self.size = len(docs) if docs is not None else 0
+        self.committed = self.size
+
+    def append(self, doc: int, tf: int) -> None:
+        if self.size == len(self.docs):
+            capacity = max(4, self.size * 2)
+            self.docs = np.resize(self.docs, capacity)
+            self.tfs = np.resize(self.tfs, capacity)
+        self.docs[self.size] = doc
+        self.tfs[self.size] = min(tf, 65535)
+        self.size += 1
+
+
+class LexicalIndex:
+    """BM25 inverted index over chunk text, keyed by vector-store point ID.
+
+    Postings are parallel uint32 doc-number / uint16 term-frequency arrays per term,
+    appended in place as documents arrive. ``commit`` persists the postings added
+    since the previous commit as one segment in SQLite and records deletions; deleted
+    documents are skipped at query time and dropped when segments or dead documents
+    pile up and the index is compacted. Doc numbers only ever grow, so a new document
+    never inherits the postings of a deleted one.
+
+    The postings and doc numbering live in this process's memory, so one process owns
+    the index file at a time; opening it elsewhere raises until the owner closes it.
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._lock_file = open(f"{path}.lock", "a+")
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise RuntimeError(f"Lexical index at {path} is in use by another process")
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                doc INTEGER PRIMARY KEY,
+                point_id TEXT NOT NULL UNIQUE,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                segment INTEGER NOT NULL,
+                term TEXT NOT NULL,
+                docs BLOB NOT NULL,
+                tfs BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_nums: Dict[str, int] = {}
+        self._lengths = np.zeros(0, dtype=np.uint32)
+        self._live = np.zeros(0, dtype=bool)
+        self._postings: Dict[str, _Postings] = {}
+        self._total_length = 0
+        self._dead_docs = 0
+        self._committed_docs = 0
+        self._deleted: List[int] = []
+        self._load()
+
+    def add_documents(
+        self, documents: Iterable[Document], point_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """Index documents not already present; returns how many were added.
+
+        ``point_ids`` defaults to ``point_id_for`` of each document.
+        """
+        documents = list(documents)
+        if point_ids is None:
+            point_ids = [point_id_for(document) for document in documents]
+        added = 0
+        with self._lock:
+            for document, point_id in zip(documents, point_ids):
+                if point_id in self._doc_nums:
+                    continue
+                counts = Counter(tokenize(document.content))
+                doc = self._new_doc(point_id, sum(counts.values()))
+                for term, tf in counts.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = _Postings()
+                    postings.append(doc, tf)
+                added += 1
+        return added
+
+    def delete(self, point_ids: Iterable[str]) -> None:
+        with self._lock:
+            for point_id in point_ids:
+                doc = self._doc_nums.pop(point_id, None)
+                if doc is None:
+                    continue
+                self._live[doc] = False
+                self._doc_ids[doc] = None
+                self._total_length -= int(self._lengths[doc])
+                self._dead_docs += 1
+                self._deleted.append(doc)
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        """Top ``limit`` point IDs by BM25 score for ``query``."""
+        terms = set(tokenize(query))
+        with self._lock:
+            live_count = len(self._doc_nums)
+            if not terms or live_count == 0 or limit <= 0:
+                return []
+            average_length = max(self._total_length / live_count, 1.0)
+
+            doc_parts = []
+            weight_parts = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs = postings.docs[:postings.size]
+                alive = self._live[docs]
+                docs = docs[alive]
+                if len(docs) == 0:
+                    continue
+                tfs = postings.tfs[:postings.size][alive].astype(np.float32)
+                idf = math.log(1.0 + (live_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norms = self.k1 * (1.0 - self.b + self.b * self._lengths[docs] / average_length)
+                doc_parts.append(docs)
+                weight_parts.append(idf * tfs * (self.k1 + 1.0) / (tfs + norms))
+            if not doc_parts:
+                return []
+
+            docs = np.concatenate(doc_parts)
+            scores = np.bincount(docs, weights=np.concatenate(weight_parts))
+            candidates = np.unique(docs)
+            k = min(limit, len(candidates))
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._doc_ids[doc], float(scores[doc])) for doc in top]
+
+    def commit(self) -> None:
+        """Persist documents, postings and deletions since the last commit."""
+        with self._lock:
+            new_docs = range(self._committed_docs, len(self._doc_ids))
+            if not new_docs and not self._deleted:
+                return
+
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "DELETE FROM docs WHERE doc = ?", [(doc,) for doc in self._deleted]
+                )
+                self._db.executemany(
+                    "INSERT INTO docs (doc, point_id, length) VALUES (?, ?, ?)",
+                    [
+                        (doc, self._doc_ids[doc], int(self._lengths[doc]))
+                        for doc in new_docs
+                        if self._doc_ids[doc] is not None
+                    ],
+                )
+                segment = self._db.execute(
+                    "SELECT COALESCE(MAX(segment), -1) + 1 FROM postings"
+                ).fetchone()[0]
+                rows = []
+                for term, postings in self._postings.items():
+                    if postings.committed < postings.size:
+                        rows.append((
+                            segment,
+                            term,
+                            postings.docs[postings.committed:postings.size].tobytes(),
+                            postings.tfs[postings.committed:postings.size].tobytes(),
+                        ))
+                self._db.executemany(
+                    "INSERT INTO postings (segment, term, docs, tfs) VALUES (?, ?, ?, ?)", rows
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_doc', ?)",
+                    (len(self._doc_ids),),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+            for postings in self._postings.values():
+                postings.committed = postings.size
+            self._committed_docs = len(self._doc_ids)
+            self._deleted = []
+            if segment + 1 > _MAX_SEGMENTS or self._dead_ratio() > _MAX_DEAD_RATIO:
+                self._compact()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live_count = len(self._doc_nums)
+            return {
+                "documents": live_count,
+                "terms": len(self._postings),
+                "postings": sum(postings.size for postings in self._postings.values()),
+                "average_length": self._total_length / live_count if live_count else 0.0,
+                "dead_ratio": self._dead_ratio(),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+            self._db.close()
+            self._lock_file.close()
+
+    def _new_doc(self, point_id: str, length: int) -> int:
+        doc = len(self._doc_ids)
+        if doc == len(self._lengths):
+            capacity = max(1024, doc * 2)
+            self._lengths = np.resize(self._lengths, capacity)
+            live = np.zeros(capacity, dtype=bool)
+            live[:doc] = self._live[:doc]
+            self._live = live
+        self._doc_ids.append(point_id)
+        self._doc_nums[point_id] = doc
+        self._lengths[doc] = length
+        self._live[doc] = True
+        self._total_length += length
+        return doc
+
+    def _dead_ratio(self) -> float:
+        """Share of documents in the postings that have since been deleted."""
+        indexed = len(self._doc_nums) + self._dead_docs
+        return self._dead_docs / indexed if indexed else 0.0
+
+    def _compact(self) -> None:
+        """Drop deleted documents from the postings and rewrite them as a single segment."""
+        compacted: Dict[str, _Postings] = {}
+        for term, postings in self._postings.items():
+            docs = postings.docs[:postings.size]
+            alive = self._live[docs]
+            if alive.any():
+                compacted[term] = _Postings(docs[alive].copy(), postings.tfs[:postings.size][alive].copy())
+
+        self._db.execute("BEGIN")
+        try:
+            self._db.execute("DELETE FROM postings")
+            self._db.executemany(
+                "INSERT INTO postings (segment, term, docs, tfs) VALUES (0, ?, ?, ?)",
+                [
+                    (term, postings.docs.tobytes(), postings.tfs.tobytes())
+                    for term, postings in compacted.items()
+                ],
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._postings = compacted
+        self._dead_docs = 0
+        logger.info(f"Compacted lexical index to {len(compacted)} terms")
+
+    def _load(self) -> None:
+        rows = self._db.execute("SELECT doc, point_id, length FROM docs").fetchall()
+        parts: Dict[str, Tuple[List[bytes], List[bytes]]] = {}
+        segments = set()
+        for segment, term, docs, tfs in self._db.execute(
+            "SELECT segment, term, docs, tfs FROM postings ORDER BY segment"
+        ):
+            segments.add(segment)
+            doc_blobs, tf_blobs = parts.setdefault(term, ([], []))
+            doc_blobs.append(docs)
+            tf_blobs.append(tfs)
+        self._postings = {
+            term: _Postings(
+                np.frombuffer(b"".join(doc_blobs), dtype=np.uint32).copy(),
+                np.frombuffer(b"".join(tf_blobs), dtype=np.uint16).copy(),
+            )
+            for term, (doc_blobs, tf_blobs) in parts.items()
+        }
+        referenced = [postings.docs for postings in self._postings.values()]
+        referenced_docs = np.unique(np.concatenate(referenced)) if referenced else np.zeros(0, dtype=np.uint32)
+
+        # Deleted documents keep their postings until compaction: numbering resumes past
+        # every doc number still referenced, not just past the live ones.
+        next_doc = self._db.execute("SELECT value FROM meta WHERE key = 'next_doc'").fetchone()
+        size = max(
+            next_doc[0] if next_doc else 0,
+            max((doc for doc, _, _ in rows), default=-1) + 1,
+            int(referenced_docs[-1]) + 1 if len(referenced_docs) else 0,
+        )
+        self._doc_ids = [None] * size
+        self._lengths = np.zeros(max(size, 1024), dtype=np.uint32)
+        self._live = np.zeros(max(size, 1024), dtype=bool)
+        for doc, point_id, length in rows:
+            self._doc_ids[doc] = point_id
+            self._doc_nums[point_id] = doc
+            self._lengths[doc] = length
+            self._live[doc] = True
+            self._total_length += length
+        self._committed_docs = size
+        self._dead_docs = int((~self._live[referenced_docs]).sum())
+
+        if rows:
+            logger.info(f"Loaded lexical index with {len(rows)} documents, {len(self._postings)} terms")
+        if len(segments) > _MAX_SEGMENTS or self._dead_ratio() > _MAX_DEAD_RATIO:
+            self._compact()
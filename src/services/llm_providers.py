@@ -1,13 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Dict
+import asyncio
 from src.models import SourceChunk
 
 
+NO_CONTEXT_ANSWER = "No relevant context found in the knowledge base."
+
+
 class BaseLLMProvider(ABC):
     @abstractmethod
     def generate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
         pass
 
+    async def agenerate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
+        """Async variant; providers without a native async client run the sync call in a thread."""
+        return await asyncio.to_thread(self.generate_response, question, context_chunks)
+
+    async def astream_response(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> AsyncIterator[str]:
+        """Yield the answer incrementally; providers without streaming yield it in one piece."""
+        yield await self.agenerate_response(question, context_chunks)
+
     def _build_context(self, context_chunks: List[SourceChunk]) -> str:
         if not context_chunks:
             return ""
@@ -37,10 +51,37 @@ class OllamaProvider(BaseLLMProvider):
 
     def generate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
         if not context_chunks:
-            return "No relevant context found in the knowledge base."
+            return NO_CONTEXT_ANSWER
+
+        prompt = self._build_prompt(question, context_chunks)
+        response = self.llm.invoke(prompt) if hasattr(self.llm, 'invoke') else self.llm(prompt)
+        return str(response).strip()
+
+    async def agenerate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
+        if not context_chunks:
+            return NO_CONTEXT_ANSWER
+
+        prompt = self._build_prompt(question, context_chunks)
+        response = await self.llm.ainvoke(prompt)
+        return str(response).strip()
+
+    async def astream_response(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> AsyncIterator[str]:
+        if not context_chunks:
+            yield NO_CONTEXT_ANSWER
+            return
 
+        prompt = self._build_prompt(question, context_chunks)
+        async for chunk in self.llm.astream(prompt):
+            # Completion models stream strings, chat models stream message chunks.
+            text = getattr(chunk, "content", chunk)
+            if text:
+                yield str(text)
+
+    def _build_prompt(self, question: str, context_chunks: List[SourceChunk]) -> str:
         context = self._build_context(context_chunks)
-        prompt = f"""Answer based exclusively on the context below.
+        return f"""Answer based exclusively on the context below.
 
 Context:
 {context}
@@ -49,57 +90,120 @@ Question: {question}
 
 Answer:"""
 
-        response = self.llm.invoke(prompt) if hasattr(self.llm, 'invoke') else self.llm(prompt)
-        return str(response).strip()
-
 
 class OpenAIProvider(BaseLLMProvider):
     def __init__(self, model_name: str = "gpt-4o-mini", api_key: str = None, temperature: float = 0.0):
-        from openai import OpenAI
+        from openai import OpenAI, AsyncOpenAI
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
         self.model = model_name
         self.temperature = temperature
 
     def generate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
         if not context_chunks:
-            return "No relevant context found in the knowledge base."
-
-        context = self._build_context(context_chunks)
+            return NO_CONTEXT_ANSWER
 
         response = self.client.chat.completions.create(
             model=self.model,
             temperature=self.temperature,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that answers questions based exclusively on the provided context. Cite sources in your answer."},
-                {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"}
-            ]
+            messages=self._build_messages(question, context_chunks),
         )
         return response.choices[0].message.content.strip()
 
+    async def agenerate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
+        if not context_chunks:
+            return NO_CONTEXT_ANSWER
+
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=self._build_messages(question, context_chunks),
+        )
+        return response.choices[0].message.content.strip()
+
+    async def astream_response(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> AsyncIterator[str]:
+        if not context_chunks:
+            yield NO_CONTEXT_ANSWER
+            return
+
+        stream = await self.async_client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=self._build_messages(question, context_chunks),
+            stream=True,
+        )
+        async for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+
+    def _build_messages(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> List[Dict[str, str]]:
+        context = self._build_context(context_chunks)
+        return [
+            {"role": "system", "content": "You are a helpful assistant that answers questions based exclusively on the provided context. Cite sources in your answer."},
+            {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"}
+        ]
+
 
 class AnthropicProvider(BaseLLMProvider):
     def __init__(self, model_name: str = "claude-3-5-sonnet-20241022", api_key: str = None, temperature: float = 0.0):
-        from anthropic import Anthropic
+        from anthropic import Anthropic, AsyncAnthropic
         self.client = Anthropic(api_key=api_key)
+        self.async_client = AsyncAnthropic(api_key=api_key)
         self.model = model_name
         self.temperature = temperature
 
     def generate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
         if not context_chunks:
-            return "No relevant context found in the knowledge base."
-
-        context = self._build_context(context_chunks)
+            return NO_CONTEXT_ANSWER
 
         response = self.client.messages.create(
             model=self.model,
             max_tokens=2048,
             temperature=self.temperature,
-            messages=[
-                {"role": "user", "content": f"Answer based exclusively on this context. Cite sources.\n\nContext:\n{context}\n\nQuestion: {question}"}
-            ]
+            messages=self._build_messages(question, context_chunks),
         )
         return response.content[0].text.strip()
 
+    async def agenerate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
+        if not context_chunks:
+            return NO_CONTEXT_ANSWER
+
+        response = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=2048,
+            temperature=self.temperature,
+            messages=self._build_messages(question, context_chunks),
+        )
+        return response.content[0].text.strip()
+
+    async def astream_response(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> AsyncIterator[str]:
+        if not context_chunks:
+            yield NO_CONTEXT_ANSWER
+            return
+
+        async with self.async_client.messages.stream(
+            model=self.model,
+            max_tokens=2048,
+            temperature=self.temperature,
+            messages=self._build_messages(question, context_chunks),
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    def _build_messages(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> List[Dict[str, str]]:
+        context = self._build_context(context_chunks)
+        return [
+            {"role": "user", "content": f"Answer based exclusively on this context. Cite sources.\n\nContext:\n{context}\n\nQuestion: {question}"}
+        ]
+
 
 def get_llm_provider(provider_type: str, **kwargs) -> BaseLLMProvider:
     providers = {
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List
 from src.config import settings
 from src.models import SourceChunk
 from src.services.llm_providers import get_llm_provider
@@ -34,3 +34,12 @@ class LLMService:
 
     def generate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
         return self.provider.generate_response(question, context_chunks)
+
+    async def agenerate_response(self, question: str, context_chunks: List[SourceChunk]) -> str:
+        return await self.provider.agenerate_response(question, context_chunks)
+
+    async def astream_response(
+        self, question: str, context_chunks: List[SourceChunk]
+    ) -> AsyncIterator[str]:
+        async for token in self.provider.astream_response(question, context_chunks):
+            yield token
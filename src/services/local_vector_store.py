@@ -0,0 +1,688 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import fcntl
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+import numpy as np
+from src.config import settings
+from src.models import Document, SourceChunk
+from src.services.base_vector_store import BaseVectorStore, Embeddings
+from src.services.document_store import DocumentStore
+from src.services.filters import RANGE_OPERATORS, Condition, is_number, parse_datetime, parse_filters, payload_matches
+from src.services.quantization import Quantizer
+
+if TYPE_CHECKING:
+    import hnswlib
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+_SQLITE_MAX_PARAMS = 500
+_HNSW_BUILD_BATCH = 10000
+# The int8 scale is refitted, and every row re-encoded, each time the collection doubles
+# until it was fitted on this many rows.
+_INT8_FIT_ROWS = 65536
+# Rows scored per step; small enough that a dequantized block stays in CPU cache.
+_SCAN_BLOCK = 2048
+_ENCODE_BLOCK = 65536
+# Filtered ANN searches fetch this many candidates per requested result before
+# falling back to an exact scan.
+_HNSW_FILTER_OVERSAMPLING = 10
+# Filters on indexed fields matching at most this share of the collection are answered
+# by scoring only the matching rows.
+_PREFILTER_FRACTION = 0.1
+_RANGE_SQL = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+class LocalVectorStore(BaseVectorStore):
+    """Embedded vector store for deployments without a Qdrant server.
+
+    Unit-normalised vectors live in a memory-mapped float32 matrix (``vectors.f32``,
+    one row per point) and point IDs and payloads in SQLite (``points.sqlite3``).
+    Search is an exact matrix-vector product over the live rows. Once a collection
+    holds ``hnsw_min_points`` points and hnswlib is installed, an HNSW graph built from
+    the matrix on first search answers queries instead; filtered queries post-filter
+    its candidates and fall back to the exact scan when too few match.
+
+    With ``quantization`` set, the exact scan reads a compact copy of the matrix
+    (``codes.<mode>``, see ``Quantizer``) instead of the float32 rows, takes
+    ``oversampling`` times as many candidates as requested and, with ``rescore``,
+    re-ranks them against the float32 originals. The int8 scale is refitted on a sample
+    spread over the collection each time it doubles, up to ``_INT8_FIT_ROWS`` rows, so
+    it is not stuck with the range of the first batch.
+
+    Indexed payload fields are kept in a ``payload_values`` table (one row per field
+    value, list elements exploded, datetimes as epoch seconds). A search whose indexed
+    conditions select few enough points scores only those rows; other filtered searches
+    filter the best-scoring candidates.
+
+    A collection directory is owned by one process at a time.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.local_vector_store_path,
+        collection_name: str = settings.qdrant_collection_name,
+        hnsw_enabled: bool = settings.local_vector_store_hnsw,
+        hnsw_min_points: int = settings.local_vector_store_hnsw_min_points,
+        hnsw_m: int = settings.local_vector_store_hnsw_m,
+        hnsw_ef_construction: int = settings.local_vector_store_hnsw_ef_construction,
+        hnsw_ef_search: int = settings.local_vector_store_hnsw_ef_search,
+        quantization: Optional[str] = settings.vector_quantization,
+        oversampling: float = settings.quantization_oversampling,
+        rescore: bool = settings.quantization_rescore,
+        upsert_batch_size: int = settings.upsert_batch_size,
+        upsert_workers: int = settings.upsert_workers,
+        upsert_wait: bool = settings.upsert_wait,
+        payload_indexes: Optional[Dict[str, str]] = None,
+        document_store: Optional[DocumentStore] = None,
+    ) -> None:
+        super().__init__(
+            collection_name,
+            upsert_batch_size,
+            upsert_workers,
+            upsert_wait,
+            payload_indexes,
+            document_store,
+        )
+        self.directory = Path(path) / collection_name
+        self.hnsw_enabled = hnsw_enabled
+        self.hnsw_min_points = hnsw_min_points
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.rescore = rescore
+        self.dimension: Optional[int] = None
+        self.quantizer: Optional[Quantizer] = None
+        self._int8_fit_rows = 0
+
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._vectors: Optional[np.memmap] = None
+        self._codes: Optional[np.memmap] = None
+        self._capacity = 0
+        self._live = np.zeros(0, dtype=bool)
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._next_row = 0
+        self._hnsw: Optional["hnswlib.Index"] = None
+
+    def initialize_collection(self, vector_size: int) -> None:
+        with self._lock:
+            if self._db is not None:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(self.directory / "store.lock", "a+")
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                self._lock_file = None
+                raise RuntimeError(f"Vector store at {self.directory} is in use by another process")
+
+            self._db = sqlite3.connect(
+                self.directory / "points.sqlite3", check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS points (
+                    id TEXT PRIMARY KEY,
+                    row INTEGER NOT NULL UNIQUE,
+                    payload TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value NOT NULL);
+                CREATE TABLE IF NOT EXISTS payload_indexes (
+                    field TEXT PRIMARY KEY,
+                    schema TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS payload_values (
+                    field TEXT NOT NULL,
+                    value NOT NULL,
+                    row INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS payload_values_lookup ON payload_values (field, value);
+                CREATE INDEX IF NOT EXISTS payload_values_row ON payload_values (row);
+                """
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES ('dimension', ?)", (vector_size,)
+            )
+            self.dimension = self._db.execute(
+                "SELECT value FROM meta WHERE name = 'dimension'"
+            ).fetchone()[0]
+            if self.dimension != vector_size:
+                raise ValueError(
+                    f"Collection {self.collection_name} has dimension {self.dimension}, "
+                    f"not {vector_size}"
+                )
+
+            self._rows = dict(self._db.execute("SELECT id, row FROM points"))
+            self._next_row = max(self._rows.values(), default=-1) + 1
+            self._free_rows = sorted(set(range(self._next_row)) - set(self._rows.values()))
+
+            vectors_path = self.directory / "vectors.f32"
+            file_rows = vectors_path.stat().st_size // (self.dimension * 4) if vectors_path.exists() else 0
+            self._open_vectors(max(file_rows, self._next_row, _INITIAL_CAPACITY))
+            self._live = np.zeros(self._capacity, dtype=bool)
+            self._live[list(self._rows.values())] = True
+            if self.quantization:
+                self._open_codes()
+
+            existing = dict(self._db.execute("SELECT field, schema FROM payload_indexes"))
+            for field_name, schema in self.payload_indexes.items():
+                if existing.get(field_name) != schema:
+                    self._create_payload_index(field_name, schema)
+            for field_name, schema in existing.items():
+                self.payload_indexes.setdefault(field_name, schema)
+            logger.info(f"Opened local vector store {self.directory} with {len(self._rows)} points")
+
+    def delete_points(self, point_ids: List[str]) -> None:
+        with self._lock:
+            rows = [self._rows.pop(point_id) for point_id in point_ids if point_id in self._rows]
+            if not rows:
+                return
+            self._live[rows] = False
+            self._free_rows.extend(rows)
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows])
+            self._db.executemany("DELETE FROM payload_values WHERE row = ?", [(row,) for row in rows])
+            self._db.execute("COMMIT")
+            if self._hnsw is not None:
+                for row in rows:
+                    self._hnsw.mark_deleted(row)
+        self._forget_contents(point_ids)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_matrices()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update(
+            directory=str(self.directory),
+            points=len(self._rows),
+            capacity=self._capacity,
+            index="hnsw" if self._hnsw is not None else "exact",
+            quantization=self.quantization,
+            scan_bytes_per_vector=(
+                self.quantizer.bytes_per_vector if self.quantizer else (self.dimension or 0) * 4
+            ),
+        )
+        return stats
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = settings.retrieval_top_k,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SourceChunk]:
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        conditions = parse_filters(filters)
+        self._record_filters(conditions)
+        count = len(self._rows)
+        if count == 0 or top_k <= 0:
+            return []
+
+        hits = None
+        rows = self._indexed_rows(conditions) if conditions else None
+        if rows is not None and len(rows) <= max(top_k, count * _PREFILTER_FRACTION):
+            hits = self._prefiltered_search(query, top_k, conditions, rows)
+        elif self._ann_index(count) is not None:
+            hits = self._ann_search(query, top_k, conditions, count)
+        if hits is None:
+            hits = self._exact_search(query, top_k, conditions)
+        return self._to_source_chunks(hits)
+
+    def retrieve(self, point_ids: List[str]) -> Dict[str, SourceChunk]:
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(point_ids), _SQLITE_MAX_PARAMS):
+                batch = point_ids[start:start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                for point_id, payload in self._db.execute(
+                    f"SELECT id, payload FROM points WHERE id IN ({placeholders})", batch
+                ):
+                    found[point_id] = json.loads(payload)
+        payloads = self._hydrate(list(found.values()))
+        return {
+            point_id: self._to_source_chunk(payload, None)
+            for point_id, payload in zip(found, payloads)
+            if payload is not None
+        }
+
+    def delete_collection(self) -> None:
+        with self._lock:
+            self.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_matrices()
+            if self._db is not None:
+                self._db.close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+            self._db = None
+            self._lock_file = None
+            self._vectors = None
+            self._codes = None
+            self.quantizer = None
+            self._hnsw = None
+            self._rows = {}
+            self._free_rows = []
+            self._next_row = 0
+            self._capacity = 0
+            self._live = np.zeros(0, dtype=bool)
+
+    def _upsert_batch(
+        self, documents: List[Document], embeddings: Embeddings, point_ids: List[str], wait: bool
+    ) -> int:
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        # A point repeated within the batch is written once, as its last occurrence.
+        last = {point_id: i for i, point_id in enumerate(point_ids)}
+        if len(last) < len(point_ids):
+            keep = sorted(last.values())
+            documents = [documents[i] for i in keep]
+            point_ids = [point_ids[i] for i in keep]
+            vectors = vectors[keep]
+        payloads = [
+            self._build_payload(doc, point_id) for doc, point_id in zip(documents, point_ids)
+        ]
+
+        with self._lock:
+            allocated = []
+            rows = []
+            for point_id in point_ids:
+                row = self._rows.get(point_id)
+                if row is None:
+                    row = self._allocate_row()
+                    self._rows[point_id] = row
+                    allocated.append(row)
+                rows.append(row)
+
+            self._vectors[rows] = vectors
+            self._live[rows] = True
+            if self.quantizer is not None:
+                if self._int8_refit_due():
+                    self._fit_int8_scale()
+                else:
+                    self._codes[rows] = self.quantizer.encode(vectors)
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO points (id, row, payload) VALUES (?, ?, ?)",
+                [
+                    (point_id, row, json.dumps(payload, default=str))
+                    for point_id, row, payload in zip(point_ids, rows, payloads)
+                ],
+            )
+            if self.payload_indexes:
+                fresh = set(allocated)
+                self._db.executemany(
+                    "DELETE FROM payload_values WHERE row = ?",
+                    [(row,) for row in rows if row not in fresh],
+                )
+                self._db.executemany(
+                    "INSERT INTO payload_values (field, value, row) VALUES (?, ?, ?)",
+                    self._index_entries(zip(rows, payloads)),
+                )
+            self._db.execute("COMMIT")
+            if wait:
+                self._flush_matrices()
+            if self._hnsw is not None:
+                self._hnsw_add(vectors, rows, allocated)
+
+        self._record_written(len(documents))
+        return len(documents)
+
+    def _create_payload_index(self, field_name: str, schema: str) -> None:
+        with self._lock:
+            if self._db is None:
+                # Built by initialize_collection from self.payload_indexes.
+                return
+            logger.info(f"Building {schema} payload index on {field_name!r}")
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM payload_values WHERE field = ?", (field_name,))
+                cursor = self._db.execute("SELECT row, payload FROM points")
+                while True:
+                    batch = cursor.fetchmany(_ENCODE_BLOCK)
+                    if not batch:
+                        break
+                    self._db.executemany(
+                        "INSERT INTO payload_values (field, value, row) VALUES (?, ?, ?)",
+                        [
+                            (field_name, value, row)
+                            for row, payload in batch
+                            for value in _index_values(schema, json.loads(payload).get(field_name))
+                        ],
+                    )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO payload_indexes (field, schema) VALUES (?, ?)",
+                    (field_name, schema),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _index_entries(
+        self, rows_and_payloads: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[str, Any, int]]:
+        return [
+            (field_name, value, row)
+            for row, payload in rows_and_payloads
+            for field_name, schema in self.payload_indexes.items()
+            for value in _index_values(schema, payload.get(field_name))
+        ]
+
+    def _indexed_rows(self, conditions: List[Condition]) -> Optional[np.ndarray]:
+        """Rows satisfying the positive conditions on indexed fields, or None if there are none."""
+        selected: Optional[np.ndarray] = None
+        for condition in conditions:
+            schema = self.payload_indexes.get(condition.key)
+            if schema is None:
+                continue
+            if condition.op in ("$eq", "$in"):
+                operands = [condition.value] if condition.op == "$eq" else condition.value
+                values = [value for operand in operands for value in _index_values(schema, operand)]
+                placeholders = ",".join("?" * len(values))
+                sql = f"value IN ({placeholders})"
+            elif condition.op in RANGE_OPERATORS and schema != "keyword":
+                bound = _range_bound(schema, condition.value)
+                if bound is None:
+                    continue
+                values = [bound]
+                sql = f"value {_RANGE_SQL[condition.op]} ?"
+            else:
+                continue
+
+            if not values:
+                return np.zeros(0, dtype=np.int64)
+            with self._lock:
+                rows = np.fromiter(
+                    (row for (row,) in self._db.execute(
+                        f"SELECT DISTINCT row FROM payload_values WHERE field = ? AND {sql}",
+                        [condition.key, *values],
+                    )),
+                    dtype=np.int64,
+                )
+            rows.sort()
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        return selected
+
+    def _prefiltered_search(
+        self, query: np.ndarray, top_k: int, conditions: List[Condition], rows: np.ndarray
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            vectors = self._vectors
+            rows = rows[self._live[rows]]
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SCAN_BLOCK):
+            block = rows[start:start + _SCAN_BLOCK]
+            scores[start:start + len(block)] = np.asarray(vectors[block]) @ query
+        order = np.argsort(-scores, kind="stable")
+        by_row = dict(zip(rows[order].tolist(), scores[order].tolist()))
+        candidates = self._collect(rows[order], top_k, conditions)
+        return [(payload, by_row[row]) for row, payload in candidates]
+
+    def _exact_search(
+        self, query: np.ndarray, top_k: int, conditions: List[Condition]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            size = self._next_row
+            vectors = self._vectors
+            codes = self._codes
+            live = self._live[:size].copy()
+        live_count = int(live.sum())
+
+        scores = self._scan(query, vectors, codes, size)
+        scores[~live] = -np.inf
+        want = top_k
+        if self.quantizer is not None:
+            want = max(top_k, int(np.ceil(top_k * self.oversampling)))
+
+        # Filtered searches first look among the best few thousand rows and only sort
+        # the whole collection when the filter is too selective for that.
+        k = min(live_count, want if not conditions else max(want * 64, 1024))
+        order = np.argpartition(-scores, k - 1)[:k]
+        order = order[np.argsort(-scores[order], kind="stable")]
+        candidates = self._collect(order, want, conditions)
+        if len(candidates) < want and k < live_count:
+            order = np.argsort(-scores, kind="stable")[:live_count]
+            candidates = self._collect(order, want, conditions)
+        if not candidates:
+            return []
+
+        rows = [row for row, _ in candidates]
+        if self.quantizer is not None and self.rescore:
+            final = np.asarray(vectors[rows]) @ query
+        else:
+            final = scores[rows]
+        ranked = np.argsort(-final, kind="stable")[:top_k]
+        return [(candidates[i][1], float(final[i])) for i in ranked]
+
+    def _scan(
+        self, query: np.ndarray, vectors: np.ndarray, codes: Optional[np.ndarray], size: int
+    ) -> np.ndarray:
+        """Scores for rows ``[0, size)``, from the codes when quantized, in bounded blocks."""
+        scores = np.empty(size, dtype=np.float32)
+        prepared = self.quantizer.prepare(query) if codes is not None else query
+        for start in range(0, size, _SCAN_BLOCK):
+            end = min(start + _SCAN_BLOCK, size)
+            if codes is None:
+                scores[start:end] = vectors[start:end] @ query
+            else:
+                scores[start:end] = self.quantizer.scores(codes[start:end], prepared)
+        return scores
+
+    def _ann_search(
+        self, query: np.ndarray, top_k: int, conditions: List[Condition], count: int
+    ) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        k = min(top_k * (_HNSW_FILTER_OVERSAMPLING if conditions else 1), count)
+        with self._lock:
+            self._hnsw.set_ef(max(self.hnsw_ef_search, k))
+            try:
+                labels, distances = self._hnsw.knn_query(query, k=k)
+            except RuntimeError:
+                # Too few reachable points for k; the exact scan handles small remainders.
+                return None
+
+        rows = labels[0].astype(np.int64)
+        # Inner-product space reports 1 - <q, v>.
+        scores = dict(zip(rows.tolist(), (1.0 - distances[0]).tolist()))
+        candidates = self._collect(rows, top_k, conditions)
+        if conditions and len(candidates) < top_k and k < count:
+            return None
+        return [(payload, scores[row]) for row, payload in candidates]
+
+    def _collect(
+        self, rows: np.ndarray, limit: int, conditions: List[Condition]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Walk rows best-first, fetching payloads in blocks until ``limit`` match."""
+        matches: List[Tuple[int, Dict[str, Any]]] = []
+        block_size = limit if not conditions else max(limit * 4, 256)
+        for start in range(0, len(rows), block_size):
+            block = rows[start:start + block_size].tolist()
+            payloads = self._payloads(block)
+            for row in block:
+                payload = payloads.get(row)
+                # A missing payload means the point was deleted after scoring.
+                if payload is None or not payload_matches(payload, conditions):
+                    continue
+                matches.append((row, payload))
+                if len(matches) == limit:
+                    return matches
+        return matches
+
+    def _payloads(self, rows: List[int]) -> Dict[int, Dict[str, Any]]:
+        payloads: Dict[int, Dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(rows), _SQLITE_MAX_PARAMS):
+                batch = rows[start:start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                for row, payload in self._db.execute(
+                    f"SELECT row, payload FROM points WHERE row IN ({placeholders})", batch
+                ):
+                    payloads[row] = json.loads(payload)
+        return payloads
+
+    def _ann_index(self, count: int) -> Optional["hnswlib.Index"]:
+        if not self.hnsw_enabled or count < self.hnsw_min_points:
+            return None
+        if self._hnsw is not None:
+            return self._hnsw
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib is not installed; local vector store will use exact search")
+            self.hnsw_enabled = False
+            return None
+
+        with self._lock:
+            if self._hnsw is None:
+                logger.info(f"Building HNSW index over {count} points")
+                index = hnswlib.Index(space="ip", dim=self.dimension)
+                index.init_index(
+                    max_elements=self._capacity,
+                    ef_construction=self.hnsw_ef_construction,
+                    M=self.hnsw_m,
+                )
+                live_rows = np.flatnonzero(self._live[:self._next_row])
+                for start in range(0, len(live_rows), _HNSW_BUILD_BATCH):
+                    block = live_rows[start:start + _HNSW_BUILD_BATCH]
+                    index.add_items(np.asarray(self._vectors[block]), block)
+                self._hnsw = index
+        return self._hnsw
+
+    def _hnsw_add(self, vectors: np.ndarray, rows: List[int], allocated: List[int]) -> None:
+        # Rows taken from the free list still carry a deleted marker from their old point.
+        for row in allocated:
+            try:
+                self._hnsw.unmark_deleted(row)
+            except RuntimeError:
+                pass
+        self._hnsw.add_items(vectors, rows)
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._next_row >= self._capacity:
+            self._open_vectors(self._capacity * 2)
+            if self.quantizer is not None:
+                self._codes = self._map_matrix(
+                    f"codes.{self.quantizer.mode}", self.quantizer.dtype, self.quantizer.width
+                )
+            live = np.zeros(self._capacity, dtype=bool)
+            live[:len(self._live)] = self._live
+            self._live = live
+            if self._hnsw is not None:
+                self._hnsw.resize_index(self._capacity)
+        row = self._next_row
+        self._next_row += 1
+        return row
+
+    def _open_vectors(self, capacity: int) -> None:
+        self._flush_matrices()
+        self._capacity = capacity
+        self._vectors = self._map_matrix("vectors.f32", np.float32, self.dimension)
+
+    def _open_codes(self) -> None:
+        """Map the quantized codes, re-encoding every row when the mode changed."""
+        stored = dict(self._db.execute("SELECT name, value FROM meta"))
+        scale = stored.get("int8_scale")
+        self.quantizer = Quantizer(self.quantization, self.dimension, scale)
+        path = self.directory / f"codes.{self.quantization}"
+        fresh = stored.get("quantization") != self.quantization or not path.exists()
+        self._codes = self._map_matrix(path.name, self.quantizer.dtype, self.quantizer.width)
+        self._int8_fit_rows = int(stored.get("int8_scale_rows", 0))
+        if not fresh:
+            return
+
+        for stale in self.directory.glob("codes.*"):
+            if stale != path:
+                stale.unlink()
+        if self.quantization == "int8":
+            self._fit_int8_scale()
+        else:
+            self._encode_live_rows()
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('quantization', ?)",
+            (self.quantization,),
+        )
+
+    def _int8_refit_due(self) -> bool:
+        if self.quantizer.mode != "int8":
+            return False
+        if self.quantizer.scale is None:
+            return True
+        return self._int8_fit_rows < _INT8_FIT_ROWS and len(self._rows) >= 2 * self._int8_fit_rows
+
+    def _fit_int8_scale(self) -> None:
+        """Fit the int8 scale on rows spread over the whole collection and re-encode it."""
+        live_rows = np.flatnonzero(self._live[:self._next_row])
+        if not len(live_rows):
+            return
+        sample = live_rows[np.linspace(0, len(live_rows) - 1, min(len(live_rows), _INT8_FIT_ROWS)).astype(np.int64)]
+        self.quantizer.scale = Quantizer.fit_scale(np.asarray(self._vectors[np.unique(sample)]))
+        self._int8_fit_rows = len(live_rows)
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            [("int8_scale", self.quantizer.scale), ("int8_scale_rows", self._int8_fit_rows)],
+        )
+        self._encode_live_rows()
+
+    def _encode_live_rows(self) -> None:
+        live_rows = np.flatnonzero(self._live[:self._next_row])
+        logger.info(f"Encoding {len(live_rows)} vectors as {self.quantization}")
+        for start in range(0, len(live_rows), _ENCODE_BLOCK):
+            block = live_rows[start:start + _ENCODE_BLOCK]
+            self._codes[block] = self.quantizer.encode(np.asarray(self._vectors[block]))
+        self._codes.flush()
+
+    def _map_matrix(self, name: str, dtype: Any, width: int) -> np.memmap:
+        path = self.directory / name
+        size = self._capacity * width * np.dtype(dtype).itemsize
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                # Sparse on most filesystems: disk is only used as rows get written.
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=(self._capacity, width))
+
+    def _flush_matrices(self) -> None:
+        for matrix in (self._vectors, self._codes):
+            if matrix is not None:
+                matrix.flush()
+
+
+def _index_values(schema: str, value: Any) -> List[Any]:
+    """The SQL values a payload value contributes to an index of the given type."""
+    if isinstance(value, list):
+        return [item for element in value for item in _index_values(schema, element)]
+    if schema == "keyword":
+        return [value] if isinstance(value, str) else []
+    if schema == "integer":
+        if is_number(value) and float(value).is_integer():
+            return [int(value)]
+        return []
+    parsed = parse_datetime(value)
+    return [parsed.timestamp()] if parsed is not None else []
+
+
+def _range_bound(schema: str, bound: Any) -> Optional[float]:
+    if schema == "integer":
+        return bound if is_number(bound) else None
+    parsed = parse_datetime(bound)
+    return parsed.timestamp() if parsed is not None else None
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
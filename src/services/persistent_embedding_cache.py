@@ -0,0 +1,244 @@
+from typing import Any, Callable, Dict, Iterator, List
+from contextlib import contextmanager
+from pathlib import Path
+import fcntl
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SQLITE_MAX_PARAMS = 500
+
+
+class PersistentEmbeddingCache:
+    """On-disk embedding cache keyed by (model name, SHA-256 of the chunk text).
+
+    Each model gets its own directory holding a preallocated, memory-mapped float32
+    matrix (``vectors.f32``, one row per slot) and a SQLite index mapping text hashes
+    to slots with a last-used timestamp. When every slot is taken, the least recently
+    used entries are evicted in bulk and their slots reused.
+
+    Several worker processes may share one directory: readers take a shared ``flock``
+    on ``cache.lock`` and writers an exclusive one, so a slot is never read while
+    another process is overwriting it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        dimension: int,
+        max_entries: int = 1_000_000,
+    ) -> None:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = Path(cache_dir) / f"{slug}-{dimension}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.hits = 0
+        self.misses = 0
+
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(self.directory / "cache.lock", "a+")
+        self._db = sqlite3.connect(
+            self.directory / "index.sqlite3", timeout=30.0, check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+
+        with self._locked(fcntl.LOCK_EX):
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key BLOB PRIMARY KEY,
+                    slot INTEGER NOT NULL UNIQUE,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used);
+                CREATE TABLE IF NOT EXISTS free_slots (slot INTEGER PRIMARY KEY);
+                CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+                """
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES ('capacity', ?), ('next_slot', 0)",
+                (max_entries,),
+            )
+            self.capacity = self._meta("capacity")
+            if self.capacity != max_entries:
+                logger.warning(
+                    f"Embedding cache at {self.directory} was created with capacity "
+                    f"{self.capacity}; ignoring configured max_entries={max_entries}"
+                )
+
+            vectors_path = self.directory / "vectors.f32"
+            expected_size = self.capacity * dimension * 4
+            with open(vectors_path, "ab") as f:
+                if f.tell() < expected_size:
+                    # Sparse on most filesystems: disk is only used as slots get written.
+                    f.truncate(expected_size)
+
+        self._vectors = np.memmap(
+            vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, dimension)
+        )
+
+    def get_or_encode(
+        self, texts: List[str], encode: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """Return embeddings for ``texts``, calling ``encode`` only for uncached ones."""
+        keys = [self._key(text) for text in texts]
+        found = self.get_many(keys)
+
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+
+        if missing:
+            encoded = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            self.put_many(list(missing.keys()), encoded)
+            found.update(zip(missing.keys(), encoded))
+
+        result = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for i, key in enumerate(keys):
+            result[i] = found[key]
+        return result
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        slots: Dict[bytes, int] = {}
+        with self._locked(fcntl.LOCK_SH):
+            for batch in _batched(list(set(keys)), _SQLITE_MAX_PARAMS):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                slots.update(rows)
+            if not slots:
+                return {}
+            vectors = np.array(self._vectors[list(slots.values())])
+
+        self._touch(list(slots.keys()))
+        return dict(zip(slots.keys(), vectors))
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        with self._locked(fcntl.LOCK_EX):
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = set()
+                for batch in _batched(keys, _SQLITE_MAX_PARAMS):
+                    placeholders = ",".join("?" * len(batch))
+                    existing.update(
+                        row[0]
+                        for row in self._db.execute(
+                            f"SELECT key FROM entries WHERE key IN ({placeholders})", batch
+                        )
+                    )
+                new = [(key, i) for i, key in enumerate(keys) if key not in existing]
+                new = new[: self.capacity]
+                if not new:
+                    self._db.execute("COMMIT")
+                    return
+
+                slots = self._allocate_slots(len(new))
+                for (_, row), slot in zip(new, slots):
+                    self._vectors[slot] = vectors[row]
+                self._vectors.flush()
+
+                now = time.time()
+                self._db.executemany(
+                    "INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                    [(key, slot, now) for (key, _), slot in zip(new, slots)],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._thread_lock:
+            size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "directory": str(self.directory),
+            "size": size,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        self._db.close()
+        self._lock_file.close()
+
+    def _allocate_slots(self, count: int) -> List[int]:
+        next_slot = self._meta("next_slot")
+        slots = list(range(next_slot, min(next_slot + count, self.capacity)))
+        self._db.execute(
+            "UPDATE meta SET value = ? WHERE name = 'next_slot'", (next_slot + len(slots),)
+        )
+
+        if len(slots) < count:
+            free = [
+                row[0]
+                for row in self._db.execute(
+                    "SELECT slot FROM free_slots LIMIT ?", (count - len(slots),)
+                )
+            ]
+            self._db.executemany("DELETE FROM free_slots WHERE slot = ?", [(s,) for s in free])
+            slots.extend(free)
+
+        needed = count - len(slots)
+        if needed > 0:
+            # Evict a little more than needed so a full cache doesn't pay for eviction on
+            # every write; the surplus slots go to the free list.
+            evict = min(self.capacity, max(needed, self.capacity // 100))
+            victims = self._db.execute(
+                "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (evict,)
+            ).fetchall()
+            self._db.executemany(
+                "DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims]
+            )
+            self._db.executemany(
+                "INSERT INTO free_slots (slot) VALUES (?)", [(slot,) for _, slot in victims[needed:]]
+            )
+            slots.extend(slot for _, slot in victims[:needed])
+            logger.info(f"Embedding cache full, evicted {len(victims)} least recently used entries")
+
+        return slots
+
+    def _touch(self, keys: List[bytes]) -> None:
+        now = time.time()
+        with self._thread_lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in keys]
+            )
+            self._db.execute("COMMIT")
+
+    def _meta(self, name: str) -> int:
+        return self._db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()[0]
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    @contextmanager
+    def _locked(self, mode: int) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._lock_file.fileno(), mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _batched(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
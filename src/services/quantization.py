@@ -0,0 +1,61 @@
+from typing import Optional
+import numpy as np
+
+QUANTIZATION_MODES = ("float16", "int8", "binary")
+
+
+class Quantizer:
+    """Compact codes for unit-normalised vectors and approximate cosine scores over them.
+
+    ``float16`` halves the storage, ``int8`` quarters it with a symmetric scale fitted on
+    the 0.99 quantile of absolute component values, and ``binary`` keeps one sign bit per
+    dimension (32x smaller). Binary scores are estimated from the Hamming distance as
+    ``cos(pi * hamming / dimension)``.
+    """
+
+    def __init__(self, mode: str, dimension: int, scale: Optional[float] = None) -> None:
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {mode}. Supported: {list(QUANTIZATION_MODES)}")
+        self.mode = mode
+        self.dimension = dimension
+        self.scale = scale
+        self.dtype = {"float16": np.float16, "int8": np.int8, "binary": np.uint8}[mode]
+        self.width = (dimension + 7) // 8 if mode == "binary" else dimension
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.width * np.dtype(self.dtype).itemsize
+
+    @staticmethod
+    def fit_scale(vectors: np.ndarray) -> float:
+        return 127.0 / max(float(np.quantile(np.abs(vectors), 0.99)), 1e-6)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.mode == "float16":
+            return vectors.astype(np.float16)
+        if self.mode == "int8":
+            return np.clip(np.rint(vectors * self.scale), -127, 127).astype(np.int8)
+        return np.packbits(vectors > 0, axis=1)
+
+    def prepare(self, query: np.ndarray) -> np.ndarray:
+        """Convert a unit query vector into the form ``scores`` compares codes against."""
+        if self.mode == "int8":
+            return (query / self.scale).astype(np.float32)
+        if self.mode == "binary":
+            return np.packbits(query > 0)
+        return query
+
+    def scores(self, codes: np.ndarray, prepared: np.ndarray) -> np.ndarray:
+        if self.mode == "binary":
+            distances = _popcount(np.bitwise_xor(codes, prepared)).sum(axis=1, dtype=np.int32)
+            return np.cos(np.pi * distances / self.dimension).astype(np.float32)
+        return codes.astype(np.float32) @ prepared
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(values: np.ndarray) -> np.ndarray:
+        return _POPCOUNT_TABLE[values]
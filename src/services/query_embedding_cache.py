@@ -0,0 +1,71 @@
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+import numpy as np
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache of query embeddings with an optional per-entry TTL.
+
+    Keys are question texts with case and whitespace folded, so "What is X?" and
+    "what  is x?" share one entry. Vectors are kept as read-only float32 arrays.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split()).casefold()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self.normalize(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None:
+                if time.monotonic() - entry[1] > self.ttl_seconds:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, text: str, embedding: Any) -> np.ndarray:
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        key = self.normalize(text)
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
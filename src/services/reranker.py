@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from sentence_transformers import CrossEncoder
+import asyncio
+import logging
+import threading
+import time
+import numpy as np
+from src.config import settings
+from src.metrics import Histogram
+from src.models import SourceChunk
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+_COST_SMOOTHING = 0.2
+
+
+class RerankerService:
+    """Re-orders retrieved chunks with a cross-encoder scoring (question, chunk) pairs.
+
+    All pairs of a request are scored in one batched ``predict`` call on a dedicated
+    thread. A running estimate of the cost per pair caps how many candidates fit in a
+    request's latency budget; when scoring still overruns the budget, the caller gets
+    the candidates in their original retrieval order and a pass that has not started
+    is cancelled. Requests with a budget skip reranking while ``max_pending`` passes are
+    already queued or running, so a backlog of abandoned passes cannot build up.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.reranker_model_name,
+        batch_size: int = settings.reranker_batch_size,
+        max_pending: int = settings.reranker_max_pending,
+    ) -> None:
+        logger.info(f"Initializing reranker model: {model_name}")
+        self.model_name = model_name
+        self.model = CrossEncoder(model_name)
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # One forward pass at a time: concurrent passes would only split the same cores.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        self.latency_ms = Histogram(buckets=_LATENCY_BUCKETS_MS)
+        self.candidates = Histogram(buckets=[5, 10, 20, 50, 100, 200])
+        self.ms_per_pair: Optional[float] = None
+        self.timeouts = 0
+        self.skipped = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def rerank(
+        self, question: str, chunks: List[SourceChunk], top_k: int, budget_ms: Optional[float] = None
+    ) -> List[SourceChunk]:
+        scored = self._candidate_count(len(chunks), top_k, budget_ms)
+        future = self._submit(question, chunks[:scored], budget_ms)
+        if future is None:
+            return chunks[:top_k]
+        try:
+            scores = future.result(timeout=budget_ms / 1000.0 if budget_ms else None)
+        except FutureTimeoutError:
+            future.cancel()
+            return self._fallback(chunks, top_k, budget_ms)
+        return self._reorder(chunks, scores, top_k)
+
+    async def arerank(
+        self, question: str, chunks: List[SourceChunk], top_k: int, budget_ms: Optional[float] = None
+    ) -> List[SourceChunk]:
+        scored = self._candidate_count(len(chunks), top_k, budget_ms)
+        future = self._submit(question, chunks[:scored], budget_ms)
+        if future is None:
+            return chunks[:top_k]
+        try:
+            # shield: a timed-out pass that already started still finishes and updates
+            # the cost estimate; one still queued is cancelled below.
+            scores = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=budget_ms / 1000.0 if budget_ms else None,
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            return self._fallback(chunks, top_k, budget_ms)
+        return self._reorder(chunks, scores, top_k)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "ms_per_pair": self.ms_per_pair,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "pending": self._pending,
+            "latency_ms": self.latency_ms.snapshot(),
+            "candidates": self.candidates.snapshot(),
+        }
+
+    def _candidate_count(self, available: int, top_k: int, budget_ms: Optional[float]) -> int:
+        if not budget_ms or self.ms_per_pair is None:
+            return available
+        # Leave headroom for queueing and the estimate being optimistic.
+        affordable = int(0.8 * budget_ms / self.ms_per_pair)
+        return min(available, max(top_k, affordable))
+
+    def _submit(
+        self, question: str, chunks: List[SourceChunk], budget_ms: Optional[float]
+    ) -> Optional[Future]:
+        """Queue a scoring pass, or None when a budgeted request would only wait behind others."""
+        with self._lock:
+            if budget_ms and self._pending >= self.max_pending:
+                self.skipped += 1
+                return None
+            self._pending += 1
+        pairs = [(question, chunk.content) for chunk in chunks]
+        future = self.executor.submit(self._predict, pairs)
+        # Runs for cancelled passes too.
+        future.add_done_callback(self._pass_done)
+        return future
+
+    def _pass_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _predict(self, pairs: List[tuple]) -> np.ndarray:
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        started = time.perf_counter()
+        scores = np.asarray(
+            self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            cost = elapsed_ms / len(pairs)
+            self.ms_per_pair = cost if self.ms_per_pair is None else (
+                (1 - _COST_SMOOTHING) * self.ms_per_pair + _COST_SMOOTHING * cost
+            )
+        self.latency_ms.observe(elapsed_ms)
+        self.candidates.observe(len(pairs))
+        return scores
+
+    def _fallback(
+        self, chunks: List[SourceChunk], top_k: int, budget_ms: Optional[float]
+    ) -> List[SourceChunk]:
+        with self._lock:
+            self.timeouts += 1
+        logger.warning(f"Reranking exceeded its {budget_ms:.0f}ms budget; using retrieval order")
+        return chunks[:top_k]
+
+    @staticmethod
+    def _reorder(chunks: List[SourceChunk], scores: np.ndarray, top_k: int) -> List[SourceChunk]:
+        """Scored candidates by cross-encoder score, then any unscored ones in retrieval order."""
+        order = np.argsort(-scores, kind="stable")
+        reranked = [chunks[i].model_copy(update={"score": float(scores[i])}) for i in order]
+        reranked.extend(chunks[len(scores):])
+        return reranked[:top_k]
@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional
+import json
+import threading
+import numpy as np
+from src.models import QueryResponse
+from src.services.ingestion_manifest import IngestionManifest
+
+
+class SemanticAnswerCache:
+    """Caches answers by question embedding so paraphrased questions skip generation.
+
+    Entries live in a preallocated float32 matrix of unit vectors and are matched by
+    a single matrix-vector product. A hit requires the same scope (filters and
+    ``top_k``) and a cosine similarity of at least ``threshold``. When full, the least
+    recently used entry is replaced.
+
+    ``invalidate()`` clears the cache and bumps ``version``. Callers pass the
+    ``current_version()`` they read before retrieval to ``put``, so an answer built
+    from pre-ingestion context is never stored after an invalidation. With a
+    ``manifest``, ingestions in other processes are picked up too: every lookup
+    compares the collection's version in the manifest with the one last seen.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        threshold: float = 0.95,
+        manifest: Optional[IngestionManifest] = None,
+        collection: Optional[str] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.manifest = manifest
+        self.collection = collection
+        self.version = 0
+        self._ingestion_version = self._read_ingestion_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._scopes = np.full(max_entries, -1, dtype=np.int64)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._responses: List[Optional[QueryResponse]] = [None] * max_entries
+        self._scope_ids: Dict[str, int] = {}
+        self._size = 0
+        self._clock = 0
+
+    @staticmethod
+    def scope(filters: Optional[Dict[str, Any]], top_k: int, **options: Any) -> str:
+        """Key for everything besides the question that shapes an answer."""
+        return json.dumps(
+            {"filters": filters or {}, "top_k": top_k, **options}, sort_keys=True, default=str
+        )
+
+    def get(self, embedding: List[float], scope: str) -> Optional[QueryResponse]:
+        query = _unit(embedding)
+        with self._lock:
+            self._sync()
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None or self._vectors is None or self._size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[:self._size] @ query
+            similarities[self._scopes[:self._size] != scope_id] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._responses[best]
+
+    def put(self, embedding: List[float], scope: str, response: QueryResponse, version: int) -> None:
+        vector = _unit(embedding)
+        with self._lock:
+            self._sync()
+            if version != self.version:
+                return
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._scopes[slot] = self._scope_ids.setdefault(scope, len(self._scope_ids))
+            self._last_used[slot] = self._clock
+            self._responses[slot] = response
+
+    def current_version(self) -> int:
+        with self._lock:
+            self._sync()
+            return self.version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._ingestion_version = self._read_ingestion_version()
+            self._clear()
+
+    def _sync(self) -> None:
+        """Clear the cache if another process ingested into the collection since the last check."""
+        ingestion_version = self._read_ingestion_version()
+        if ingestion_version != self._ingestion_version:
+            self._ingestion_version = ingestion_version
+            self._clear()
+
+    def _read_ingestion_version(self) -> int:
+        if self.manifest is None or self.collection is None:
+            return 0
+        return self.manifest.version(self.collection)
+
+    def _clear(self) -> None:
+        self.version += 1
+        self._size = 0
+        self._scopes[:] = -1
+        self._last_used[:] = 0
+        self._responses = [None] * self.max_entries
+        self._scope_ids.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _unit(embedding: List[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -1,60 +1,180 @@
 from typing import List, Optional, Dict, Any
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import (
+    Batch,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Datatype,
+    Disabled,
     Distance,
     VectorParams,
-    PointStruct,
+    DatetimeRange,
     Filter,
     FieldCondition,
+    MatchAny,
     MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
 )
-import uuid
+import asyncio
+import logging
+import numpy as np
 from src.config import settings
 from src.models import Document, SourceChunk
+from src.services.base_vector_store import BaseVectorStore, Embeddings, point_id_for
+from src.services.document_store import DocumentStore
+from src.services.filters import NEGATED_OPERATORS, Condition, is_number, parse_filters
+from src.services.quantization import QUANTIZATION_MODES
 
+logger = logging.getLogger(__name__)
+
+
+class VectorStore(BaseVectorStore):
+    """Qdrant-backed store.
+
+    ``quantization="int8"`` or ``"binary"`` keeps quantized vectors in RAM and the
+    float32 originals on disk; searches oversample the quantized index and rescore the
+    candidates against the originals. ``"float16"`` stores the vectors themselves as
+    float16, which Qdrant scores directly.
+    """
 
-class VectorStore:
     def __init__(
         self,
         host: str = settings.qdrant_host,
         port: int = settings.qdrant_port,
         collection_name: str = settings.qdrant_collection_name,
+        upsert_batch_size: int = settings.upsert_batch_size,
+        upsert_workers: int = settings.upsert_workers,
+        upsert_wait: bool = settings.upsert_wait,
+        quantization: Optional[str] = settings.vector_quantization,
+        oversampling: float = settings.quantization_oversampling,
+        rescore: bool = settings.quantization_rescore,
+        payload_indexes: Optional[Dict[str, str]] = None,
+        document_store: Optional[DocumentStore] = None,
     ) -> None:
+        if quantization and quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {quantization}. Supported: {list(QUANTIZATION_MODES)}")
+        super().__init__(
+            collection_name,
+            upsert_batch_size,
+            upsert_workers,
+            upsert_wait,
+            payload_indexes,
+            document_store,
+        )
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.rescore = rescore
         self.client = QdrantClient(url=f"http://{host}:{port}")
-        self.collection_name = collection_name
+        self.async_client = AsyncQdrantClient(url=f"http://{host}:{port}")
 
     def initialize_collection(self, vector_size: int) -> None:
+        quantization_config = self._quantization_config()
         try:
-            self.client.get_collection(self.collection_name)
+            info = self.client.get_collection(self.collection_name)
         except Exception:
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(
                     size=vector_size,
                     distance=Distance.COSINE,
+                    on_disk=True if quantization_config else None,
+                    datatype=Datatype.FLOAT16 if self.quantization == "float16" else None,
                 ),
+                quantization_config=quantization_config,
             )
+            self._ensure_payload_indexes({})
+            return
 
-    def store_documents(
-        self, documents: List[Document], embeddings: List[List[float]]
-    ) -> None:
+        if quantization_config and info.config.quantization_config != quantization_config:
+            # Qdrant builds the quantized index in the background; searches keep working.
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                quantization_config=quantization_config,
+            )
+        elif quantization_config is None and info.config.quantization_config is not None:
+            logger.info(f"Removing quantization from collection {self.collection_name}")
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                quantization_config=Disabled.DISABLED,
+            )
+        # The vector datatype is fixed when a collection is created.
+        stored_datatype = getattr(info.config.params.vectors, "datatype", None) or Datatype.FLOAT32
+        wanted_datatype = Datatype.FLOAT16 if self.quantization == "float16" else Datatype.FLOAT32
+        if stored_datatype != wanted_datatype:
+            logger.warning(
+                f"Collection {self.collection_name} stores {stored_datatype.value} vectors, not "
+                f"{wanted_datatype.value} as configured; recreate it to change the datatype"
+            )
+        self._ensure_payload_indexes({
+            field_name: str(schema.data_type.value)
+            for field_name, schema in (info.payload_schema or {}).items()
+        })
+
+    async def astore_documents(
+        self,
+        documents: List[Document],
+        embeddings: Embeddings,
+        wait: Optional[bool] = None,
+        point_ids: Optional[List[str]] = None,
+    ) -> int:
         if len(documents) != len(embeddings):
             raise ValueError("Documents and embeddings must have the same length")
+        if point_ids is None:
+            point_ids = [point_id_for(document) for document in documents]
+        elif len(point_ids) != len(documents):
+            raise ValueError("Documents and point IDs must have the same length")
+
+        wait = self.upsert_wait if wait is None else wait
+        semaphore = asyncio.Semaphore(self.upsert_workers)
+
+        async def upsert(start: int) -> None:
+            end = start + self.upsert_batch_size
+            async with semaphore:
+                await self.async_client.upsert(
+                    collection_name=self.collection_name,
+                    points=self._build_batch(
+                        documents[start:end], embeddings[start:end], point_ids[start:end]
+                    ),
+                    wait=wait,
+                )
+            await asyncio.to_thread(
+                self._store_contents, documents[start:end], point_ids[start:end]
+            )
 
-        points = [
-            PointStruct(
-                id=str(uuid.uuid4()),
-                vector=embedding,
-                payload={
-                    "content": doc.content,
-                    "source": doc.source,
-                    **doc.metadata,
-                },
+        await asyncio.gather(
+            *(upsert(start) for start in range(0, len(documents), self.upsert_batch_size))
+        )
+        self._record_written(len(documents))
+        return len(documents)
+
+    def delete_points(self, point_ids: List[str]) -> None:
+        for start in range(0, len(point_ids), self.upsert_batch_size):
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=point_ids[start:start + self.upsert_batch_size]),
+                wait=True,
             )
-            for doc, embedding in zip(documents, embeddings)
-        ]
+        self._forget_contents(point_ids)
+
+    def flush(self) -> None:
+        """Barrier for ``wait=False`` writes.
 
-        self.client.upsert(collection_name=self.collection_name, points=points)
+        Qdrant applies a shard's updates in order, so a no-op update issued with
+        ``wait=True`` returns only once everything queued before it has been applied.
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=[]),
+            wait=True,
+        )
 
     def search(
         self,
@@ -62,44 +182,53 @@ class VectorStore:
         top_k: int = settings.retrieval_top_k,
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[SourceChunk]:
-        query_filter = None
-        if filters:
-            conditions = [
-                FieldCondition(
-                    key=key, match=MatchValue(value=value)
-                )
-                for key, value in filters.items()
-            ]
-            if conditions:
-                query_filter = Filter(must=conditions)
-
+        self._record_filters(parse_filters(filters))
         response = self.client.query_points(
             collection_name=self.collection_name,
             query=query_embedding,
             limit=top_k,
-            query_filter=query_filter,
+            query_filter=self._build_filter(filters),
+            search_params=self._search_params(),
             with_payload=True,
             with_vectors=False,
         )
+        return self._to_source_chunks(
+            [(point.payload or {}, point.score) for point in response.points]
+        )
 
-        chunks = []
-        for point in response.points:
-            payload = point.payload or {}
-            score = point.score if hasattr(point, 'score') else 0.0
-            chunks.append(
-                SourceChunk(
-                    content=payload.get("content", ""),
-                    score=float(score) if score is not None else 0.0,
-                    source=payload.get("source", "unknown"),
-                    metadata={
-                        k: v
-                        for k, v in payload.items()
-                        if k not in ["content", "source"]
-                    },
-                )
-            )
+    async def asearch(
+        self,
+        query_embedding: List[float],
+        top_k: int = settings.retrieval_top_k,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SourceChunk]:
+        self._record_filters(parse_filters(filters))
+        response = await self.async_client.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding,
+            limit=top_k,
+            query_filter=self._build_filter(filters),
+            search_params=self._search_params(),
+            with_payload=True,
+            with_vectors=False,
+        )
+        return self._to_source_chunks(
+            [(point.payload or {}, point.score) for point in response.points]
+        )
 
-        return chunks
+    def retrieve(self, point_ids: List[str]) -> Dict[str, SourceChunk]:
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=point_ids,
+            with_payload=True,
+            with_vectors=False,
+        )
+        payloads = self._hydrate([record.payload or {} for record in records])
+        return {
+            str(record.id): self._to_source_chunk(payload, None)
+            for record, payload in zip(records, payloads)
+            if payload is not None
+        }
 
     def delete_collection(self) -> None:
         try:
@@ -107,3 +236,96 @@ class VectorStore:
         except Exception:
             pass
 
+    def _ensure_payload_indexes(self, existing: Dict[str, str]) -> None:
+        """Create the declared indexes the collection lacks and adopt any others it has."""
+        for field_name, schema in self.payload_indexes.items():
+            if existing.get(field_name) != schema:
+                self._create_payload_index(field_name, schema)
+        for field_name, schema in existing.items():
+            self.payload_indexes.setdefault(field_name, schema)
+
+    def _create_payload_index(self, field_name: str, schema: str) -> None:
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=field_name,
+            field_schema=PayloadSchemaType(schema),
+            wait=True,
+        )
+
+    def _upsert_batch(
+        self, documents: List[Document], embeddings: Embeddings, point_ids: List[str], wait: bool
+    ) -> int:
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=self._build_batch(documents, embeddings, point_ids),
+            wait=wait,
+        )
+        self._record_written(len(documents))
+        return len(documents)
+
+    def _build_batch(
+        self, documents: List[Document], embeddings: Embeddings, point_ids: List[str]
+    ) -> Batch:
+        # One conversion per batch for the request body instead of one list per vector.
+        vectors = embeddings.tolist() if isinstance(embeddings, np.ndarray) else list(embeddings)
+        return Batch(
+            ids=list(point_ids),
+            vectors=vectors,
+            payloads=[
+                self._build_payload(doc, point_id) for doc, point_id in zip(documents, point_ids)
+            ],
+        )
+
+    def _quantization_config(self) -> Optional[QuantizationConfig]:
+        if self.quantization == "int8":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _search_params(self) -> Optional[SearchParams]:
+        if self.quantization not in ("int8", "binary"):
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        )
+
+    def _build_filter(self, filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        must = []
+        must_not = []
+        for condition in parse_filters(filters):
+            target = must_not if condition.op in NEGATED_OPERATORS else must
+            target.append(self._field_condition(condition))
+        if not must and not must_not:
+            return None
+        return Filter(must=must or None, must_not=must_not or None)
+
+    @staticmethod
+    def _field_condition(condition: Condition) -> FieldCondition:
+        if condition.op in ("$eq", "$ne"):
+            return FieldCondition(key=condition.key, match=MatchValue(value=condition.value))
+        if condition.op in ("$in", "$nin"):
+            return FieldCondition(key=condition.key, match=MatchAny(any=condition.value))
+        bound = {condition.op[1:]: condition.value}
+        if is_number(condition.value):
+            return FieldCondition(key=condition.key, range=Range(**bound))
+        return FieldCondition(key=condition.key, range=DatetimeRange(**bound))
+
+
+def create_vector_store(backend: str, **kwargs: Any) -> BaseVectorStore:
+    from src.services.local_vector_store import LocalVectorStore
+
+    backends = {
+        'qdrant': VectorStore,
+        'local': LocalVectorStore,
+    }
+
+    backend_class = backends.get(backend.lower())
+    if not backend_class:
+        raise ValueError(f"Unknown vector store backend: {backend}. Supported: {list(backends.keys())}")
+
+    return backend_class(**kwargs)
@@ -9,6 +9,8 @@ def detect_file_type(filename: str) -> DataSourceType:
         'text': DataSourceType.TEXT,
         'csv': DataSourceType.CSV,
         'json': DataSourceType.JSON,
+        'jsonl': DataSourceType.JSON,
+        'ndjson': DataSourceType.JSON,
         'html': DataSourceType.HTML,
         'htm': DataSourceType.HTML,
     }
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import MetaData, Table, text
+
+from src.ingestion.database_ingester import DatabaseIngester, get_engine
+
+_ROWS = 2500
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'source.db'}"
+    with get_engine(url).begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, score REAL)"))
+        conn.execute(text("CREATE TABLE notes (body TEXT)"))
+        # Gaps in the key, so partitions cover uneven row counts.
+        conn.execute(
+            text("INSERT INTO items (id, name, score) VALUES (:id, :name, :score)"),
+            [{"id": i * 3 + i % 3, "name": f"item {i}", "score": i / 2} for i in range(_ROWS)],
+        )
+        conn.execute(
+            text("INSERT INTO notes (body) VALUES (:body)"),
+            [{"body": f"note {i}"} for i in range(10)],
+        )
+    return url
+
+
+def _table_documents(ingester: DatabaseIngester, table_name: str = "items"):
+    ingester.set_ingestion_params(table_name=table_name)
+    return [(doc.metadata["row_index"], doc.content) for doc in ingester.iter_documents()]
+
+
+def test_table_read_paths_match(database_url):
+    # A query streams through one cursor; a table is keyset-paged on SQLite, which
+    # has no server-side cursors, and split into key ranges above the row threshold.
+    serial = DatabaseIngester(database_url, fetch_size=100)
+    serial.set_ingestion_params(query="SELECT * FROM items ORDER BY id")
+    expected = [
+        (doc.metadata["query_index"], doc.content) for doc in serial.iter_documents()
+    ]
+    assert len(expected) == _ROWS
+    assert expected[0][1] == "id: 0\nname: item 0\nscore: 0.0"
+
+    keyset = DatabaseIngester(database_url, fetch_size=100, read_partitions=1)
+    assert _table_documents(keyset) == expected
+
+    partitioned = DatabaseIngester(
+        database_url, fetch_size=100, read_partitions=4, partition_min_rows=1
+    )
+    table = Table("items", MetaData(), autoload_with=partitioned.engine)
+    assert len(partitioned._partition_ranges(table, partitioned._key_column(table))) == 4
+    assert sorted(_table_documents(partitioned)) == expected
+
+
+def test_table_without_key(database_url):
+    ingester = DatabaseIngester(database_url, fetch_size=3, read_partitions=4, partition_min_rows=1)
+    documents = _table_documents(ingester, "notes")
+    assert documents == [(i, f"body: note {i}") for i in range(10)]
+
+
+def test_query(database_url):
+    ingester = DatabaseIngester(database_url, fetch_size=50)
+    ingester.set_ingestion_params(query="SELECT name FROM items WHERE score < 10 ORDER BY id")
+    documents = list(ingester.iter_documents(metadata={"origin": "test"}))
+    assert [doc.content for doc in documents] == [f"name: item {i}" for i in range(20)]
+    assert [doc.metadata["query_index"] for doc in documents] == list(range(20))
+    assert documents[0].metadata["origin"] == "test"
+
+
+@pytest.mark.parametrize("read_partitions", [1, 4])
+def test_early_close_releases_connections(database_url, read_partitions):
+    ingester = DatabaseIngester(
+        database_url, fetch_size=10, read_partitions=read_partitions, partition_min_rows=1
+    )
+    ingester.set_ingestion_params(table_name="items")
+    documents = ingester.iter_documents()
+    next(documents)
+    assert ingester.engine.pool.checkedout() > 0
+    documents.close()
+    assert ingester.engine.pool.checkedout() == 0
+
+
+def test_count(database_url):
+    ingester = DatabaseIngester(database_url)
+    ingester.set_ingestion_params(table_name="items")
+    assert ingester.count_documents() == _ROWS
+
+    ingester.set_ingestion_params(query="SELECT * FROM items WHERE score < 10")
+    assert ingester.count_documents() is None
+    counting = DatabaseIngester(database_url, count_queries=True)
+    counting.set_ingestion_params(query="SELECT * FROM items WHERE score < 10")
+    assert counting.count_documents() == 20 == len(list(counting.iter_documents()))
+
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from src.jobs.job_manager import IngestionJobManager
+from src.jobs.job_store import JobStore
+from src.models import DataSourceType, IngestRequest, JobStatus
+from src.pipeline.progress import IngestionProgress
+
+
+class _BlockingPipeline:
+    """Stands in for IngestionPipeline: runs until the job is cancelled and released."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def ingest(self, request: IngestRequest, progress: IngestionProgress) -> int:
+        progress.start()
+        progress.add(documents_parsed=1)
+        self.started.set()
+        while not (progress.cancelled and self.release.is_set()):
+            time.sleep(0.01)
+        progress.raise_if_cancelled()
+        return 0
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_get_and_cancel_running_job(tmp_path):
+    pipeline = _BlockingPipeline()
+    manager = IngestionJobManager(
+        JobStore(str(tmp_path / "jobs.db")), lambda: pipeline, workers=1
+    )
+    manager.start()
+    try:
+        job = manager.submit(IngestRequest(source_type=DataSourceType.TEXT, content="hello"))
+        assert pipeline.started.wait(5.0)
+
+        running = manager.get(job.job_id)
+        assert running.status == JobStatus.RUNNING
+        assert running.cancel_requested is False
+        assert running.progress.documents_parsed == 1
+        assert [listed.job_id for listed in manager.list()] == [job.job_id]
+
+        assert manager.cancel(job.job_id)
+        cancelling = manager.get(job.job_id)
+        assert cancelling.status == JobStatus.RUNNING
+        assert cancelling.cancel_requested is True
+
+        pipeline.release.set()
+        _wait_for(lambda: manager.get(job.job_id).status == JobStatus.CANCELLED)
+        assert manager.get(job.job_id).cancel_requested is False
+    finally:
+        pipeline.release.set()
+        manager.stop(timeout=5.0)